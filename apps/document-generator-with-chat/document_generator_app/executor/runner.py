@@ -12,7 +12,7 @@ from typing import Dict, List, Optional, Tuple
 from recipe_executor.config import load_configuration
 from recipe_executor.context import Context
 from recipe_executor.executor import Executor
-from recipe_executor.logger import init_logger
+from recipe_executor.logger import close_run, init_logger
 
 from ..config import settings
 from ..models.outline import Outline, Resource
@@ -184,6 +184,9 @@ async def generate_document(
         logger.error(f"Error generating document: {str(e)}")
         logger.error(f"Full traceback: {traceback.format_exc()}")
         return f"Error generating document: {str(e)}\n\nFull traceback:\n{traceback.format_exc()}"
+    finally:
+        # Release the recipe run's log files; the process serves many requests
+        close_run(tmpdir)
 
 
 async def generate_docpack_from_prompt(
@@ -355,3 +358,5 @@ async def generate_docpack_from_prompt(
         logger.error(f"Error generating docpack: {str(e)}")
         logger.error(f"Full traceback: {traceback.format_exc()}")
         raise
+    finally:
+        close_run(tmpdir)
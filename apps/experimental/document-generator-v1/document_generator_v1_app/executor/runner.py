@@ -9,7 +9,7 @@ from pathlib import Path
 
 from recipe_executor.context import Context
 from recipe_executor.executor import Executor
-from recipe_executor.logger import init_logger
+from recipe_executor.logger import close_run, init_logger
 from recipe_executor.config import load_configuration
 
 from ..models.outline import Outline
@@ -134,3 +134,6 @@ async def generate_document(outline: Optional[Outline], session_id: Optional[str
         logger.error(f"Error generating document: {str(e)}")
         logger.error(f"Full traceback: {traceback.format_exc()}")
         return f"Error generating document: {str(e)}\n\nFull traceback:\n{traceback.format_exc()}"
+    finally:
+        # Release the recipe run's log files; the process serves many requests
+        close_run(tmpdir)
@@ -0,0 +1,254 @@
+# This file was generated by Codebase-Generator, do not edit directly
+"""
+Artifact store: how contexts hold their artifact values.
+
+Every value stored in a `Context` passes through the process-wide artifact store,
+which accounts for the bytes contexts keep in memory: in total, with the peak of the
+run, and per key. Text is counted by its length; a value shared by cloned contexts is
+counted once, by the context that stored it.
+
+With spilling enabled (`configure_artifact_store(threshold=...)`, the CLI's
+`--spill-threshold`), strings at least `threshold` characters long are moved to a
+content-addressed blob directory and replaced by `BlobText` handles, which read the
+blob (mmap) whenever a step uses them as text. Templates, write_files, read_files and
+set_context merges and JSON serialization accept them like strings. Strings nested in
+dicts, lists and tuples are spilled too, in a shallow copy of the containers on their
+path. TextRopes are not spilled: set_context builds them by appending, and each
+append would rewrite the blob.
+
+A different policy can be installed with `set_artifact_store`.
+"""
+
+import atexit
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from recipe_executor.utils.text import BlobText, TextRope
+
+__all__ = [
+    "DEFAULT_SPILL_THRESHOLD",
+    "ArtifactStore",
+    "SpillingArtifactStore",
+    "artifact_store_stats",
+    "configure_artifact_store",
+    "get_artifact_store",
+    "set_artifact_store",
+    "value_bytes",
+]
+
+# Threshold used when spilling is enabled without one (characters)
+DEFAULT_SPILL_THRESHOLD = 256 * 1024
+
+# Number of keys listed in the stats
+_LARGEST_KEYS = 10
+
+
+def value_bytes(value: Any) -> int:
+    """
+    Estimate the memory a context value keeps resident: text by its length, bytes
+    by their size, containers by the sum of their items, blob handles as nothing.
+    """
+    # Exact types first: contexts store many small values and this runs on every store
+    cls = type(value)
+    if cls is str or cls is TextRope or cls is bytes:
+        return len(value)
+    if cls is dict:
+        total = 0
+        for k, v in value.items():
+            total += len(k) if type(k) is str else value_bytes(k)
+            total += len(v) if type(v) is str else value_bytes(v)
+        return total
+    if cls is list or cls is tuple:
+        total = 0
+        for item in value:
+            total += len(item) if type(item) is str else value_bytes(item)
+        return total
+    if isinstance(value, BlobText):
+        return 0
+    if isinstance(value, (str, bytes, bytearray)):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(value_bytes(k) + value_bytes(v) for k, v in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sum(value_bytes(item) for item in value)
+    return sys.getsizeof(value)
+
+
+class ArtifactStore:
+    """
+    Holds context values in memory and accounts for their size. Subclasses change
+    how values are held by overriding `admit`.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.resident_bytes: int = 0
+        self.peak_resident_bytes: int = 0
+        # Largest size stored under each key
+        self.key_bytes: Dict[str, int] = {}
+        self.spilled_values: int = 0
+        self.spilled_bytes: int = 0
+        self.spill_errors: int = 0
+
+    def admit(self, key: str, value: Any) -> Tuple[Any, int]:
+        """Return the value to hold under `key` and the bytes it keeps resident."""
+        return value, value_bytes(value)
+
+    def charge(self, key: str, size: int, previous: int = 0) -> None:
+        """Account for a value of `size` bytes replacing one of `previous` bytes."""
+        with self._lock:
+            self.resident_bytes += size - previous
+            if self.resident_bytes > self.peak_resident_bytes:
+                self.peak_resident_bytes = self.resident_bytes
+            if size > self.key_bytes.get(key, 0):
+                self.key_bytes[key] = size
+
+    def release(self, sizes: Dict[str, int]) -> None:
+        """Account for the values of a context that was discarded."""
+        with self._lock:
+            self.resident_bytes -= sum(sizes.values())
+
+    def reset_stats(self) -> None:
+        """Start a new run: the peak restarts from the current resident bytes."""
+        with self._lock:
+            self.peak_resident_bytes = self.resident_bytes
+            self.key_bytes.clear()
+            self.spilled_values = self.spilled_bytes = self.spill_errors = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return resident and peak bytes, spill counters and the largest keys."""
+        with self._lock:
+            largest = sorted(self.key_bytes.items(), key=lambda item: item[1], reverse=True)[:_LARGEST_KEYS]
+            return {
+                "resident_bytes": self.resident_bytes,
+                "peak_resident_bytes": self.peak_resident_bytes,
+                "spilled_values": self.spilled_values,
+                "spilled_bytes": self.spilled_bytes,
+                "spill_errors": self.spill_errors,
+                "largest_keys": dict(largest),
+            }
+
+
+class SpillingArtifactStore(ArtifactStore):
+    """
+    Artifact store moving large strings to a content-addressed blob directory.
+
+    Args:
+        threshold: Length (characters) from which a string is spilled.
+        directory: Blob directory; blobs written there are kept and reused by later
+            runs. Defaults to a temporary directory removed when the process exits.
+    """
+
+    def __init__(self, threshold: int = DEFAULT_SPILL_THRESHOLD, directory: Optional[str] = None) -> None:
+        super().__init__()
+        if threshold <= 0:
+            raise ValueError(f"Spill threshold must be positive, got {threshold}")
+        self.threshold: int = threshold
+        self._directory: Optional[str] = directory
+
+    @property
+    def directory(self) -> str:
+        if self._directory is None:
+            self._directory = tempfile.mkdtemp(prefix="recipe-blobs-")
+            atexit.register(shutil.rmtree, self._directory, True)
+        return self._directory
+
+    def admit(self, key: str, value: Any) -> Tuple[Any, int]:
+        value = self._spill(value)
+        return value, value_bytes(value)
+
+    def _spill(self, value: Any) -> Any:
+        if isinstance(value, str):
+            return self.write_blob(value) if len(value) >= self.threshold else value
+        if isinstance(value, dict):
+            copied: Optional[Dict[Any, Any]] = None
+            for k, v in value.items():
+                spilled = self._spill(v)
+                if spilled is not v:
+                    if copied is None:
+                        copied = dict(value)
+                    copied[k] = spilled
+            return value if copied is None else copied
+        if isinstance(value, (list, tuple)):
+            items = [self._spill(item) for item in value]
+            if all(new is old for new, old in zip(items, value)):
+                return value
+            return items if isinstance(value, list) else tuple(items)
+        return value
+
+    def write_blob(self, text: str) -> Any:
+        """Store `text` as a blob and return its handle (or `text` if it cannot be written)."""
+        data = text.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        path = os.path.join(self.directory, digest[:2], digest)
+        try:
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+                try:
+                    with os.fdopen(fd, "wb") as f:
+                        f.write(data)
+                    os.replace(tmp_path, path)
+                except BaseException:
+                    try:
+                        os.unlink(tmp_path)
+                    except OSError:
+                        pass
+                    raise
+        except OSError:
+            with self._lock:
+                self.spill_errors += 1
+            return text
+        with self._lock:
+            self.spilled_values += 1
+            self.spilled_bytes += len(data)
+        return BlobText(path, len(text), digest)
+
+    def stats(self) -> Dict[str, Any]:
+        stats = super().stats()
+        stats["threshold"] = self.threshold
+        stats["directory"] = self._directory
+        return stats
+
+
+_store: ArtifactStore = ArtifactStore()
+_store_lock = threading.Lock()
+
+
+def get_artifact_store() -> ArtifactStore:
+    """Return the artifact store new contexts use."""
+    return _store
+
+
+def set_artifact_store(store: ArtifactStore) -> None:
+    """Install the artifact store used by contexts created from now on."""
+    global _store
+    with _store_lock:
+        _store = store
+
+
+def configure_artifact_store(threshold: Optional[int] = None, directory: Optional[str] = None) -> None:
+    """
+    Enable or disable spilling for contexts created from now on.
+
+    Args:
+        threshold: Length (characters) from which strings are spilled; 0 disables
+            spilling. Defaults to DEFAULT_SPILL_THRESHOLD when only `directory` is given.
+        directory: Blob directory (a temporary directory by default).
+    """
+    if threshold is None and directory is not None:
+        threshold = DEFAULT_SPILL_THRESHOLD
+    if not threshold:
+        set_artifact_store(ArtifactStore())
+    else:
+        set_artifact_store(SpillingArtifactStore(threshold, directory))
+
+
+def artifact_store_stats() -> Dict[str, Any]:
+    """Return the byte accounting of the current artifact store."""
+    return _store.stats()
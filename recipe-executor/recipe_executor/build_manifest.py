@@ -0,0 +1,295 @@
+# This file was generated by Codebase-Generator, do not edit directly
+"""
+Make-style incremental builds.
+
+An `incremental` step runs its substeps as a named build *target* and records, in a
+JSON build manifest, everything the target consumed and produced:
+
+- the context values its substeps read (keys inferred by the planner),
+- the content hash of every file read by `read_files` and every recipe file executed,
+- the model and a hash of the rendered prompt of every LLM call,
+- the content hash of every file written by `write_files`.
+
+The steps, context values and input files are combined into the target's input
+hash. On the next run a target whose input hash matches and whose outputs still
+exist is skipped and its previous outputs are kept. Input files are hashed after
+the target finished, so a target that reads a file it also writes (existing code
+fed back to the model in edit mode) records the content it wrote and is not
+rebuilt just because it consumed its own output.
+
+`configure_builds` (CLI `--force` / `--only`) overrides the up-to-date check for
+the whole process.
+"""
+
+import contextvars
+import fnmatch
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+__all__ = [
+    "BuildManifest",
+    "BuildRecord",
+    "build_scope",
+    "build_stats",
+    "configure_builds",
+    "count_target",
+    "current_build",
+    "file_digest",
+    "get_build_manifest",
+    "input_hash",
+    "record_file_read",
+    "record_file_written",
+    "record_llm_call",
+    "target_override",
+    "value_digest",
+]
+
+# Bump when the manifest format changes so old manifests are rebuilt from scratch
+_FORMAT_VERSION = 1
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def value_digest(value: Any) -> str:
+    """Return the content hash of a context value (JSON-serialized, keys sorted)."""
+    encoded = json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+    return _sha256(encoded.encode("utf-8"))
+
+
+# Digests of files that have not changed since they were last hashed, by real path
+_digests: Dict[str, Tuple[Tuple[int, int], str]] = {}
+_digests_lock = threading.Lock()
+
+
+def file_digest(path: str) -> Optional[str]:
+    """
+    Return the SHA-256 of a file's content, or None if it does not exist. Files whose
+    modification time and size are unchanged are not hashed again.
+    """
+    key = os.path.realpath(path)
+    try:
+        stat = os.stat(key)
+    except OSError:
+        return None
+    version = (stat.st_mtime_ns, stat.st_size)
+    with _digests_lock:
+        cached = _digests.get(key)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    digest = hashlib.sha256()
+    try:
+        with open(key, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+    except OSError:
+        return None
+    result = digest.hexdigest()
+    with _digests_lock:
+        _digests[key] = (version, result)
+    return result
+
+
+def input_hash(steps: str, context: Dict[str, str], files: Dict[str, Optional[str]]) -> str:
+    """Combine the digests of a target's steps, context values and input files."""
+    payload = {"version": _FORMAT_VERSION, "steps": steps, "context": context, "files": files}
+    return value_digest(payload)
+
+
+class BuildRecord:
+    """
+    Inputs and outputs observed while a target runs. Paths are stored as given;
+    digests are computed once the target has finished.
+    """
+
+    def __init__(self) -> None:
+        self.files: List[str] = []
+        self.outputs: List[str] = []
+        self.llm_calls: List[Dict[str, str]] = []
+        self._lock = threading.Lock()
+
+    def add_file(self, path: str) -> None:
+        with self._lock:
+            if path not in self.files:
+                self.files.append(path)
+
+    def add_output(self, path: str) -> None:
+        with self._lock:
+            if path not in self.outputs:
+                self.outputs.append(path)
+
+    def add_llm_call(self, model: str, prompt: str) -> None:
+        with self._lock:
+            self.llm_calls.append({"model": model, "prompt": _sha256(prompt.encode("utf-8"))})
+
+    def merge_entry(self, entry: Dict[str, Any]) -> None:
+        """Add the inputs and outputs of a nested target (built or kept)."""
+        for path in entry.get("files") or {}:
+            self.add_file(path)
+        for path in entry.get("outputs") or {}:
+            self.add_output(path)
+        with self._lock:
+            self.llm_calls.extend(entry.get("llm_calls") or [])
+
+
+_current_build: contextvars.ContextVar[Optional[BuildRecord]] = contextvars.ContextVar("build", default=None)
+
+
+def current_build() -> Optional[BuildRecord]:
+    return _current_build.get()
+
+
+@contextmanager
+def build_scope(record: BuildRecord) -> Iterator[BuildRecord]:
+    """Record the inputs and outputs of the enclosed steps in `record`."""
+    token = _current_build.set(record)
+    try:
+        yield record
+    finally:
+        _current_build.reset(token)
+
+
+def record_file_read(path: str) -> None:
+    """Note that the current target read `path` (no-op outside of a target)."""
+    record = _current_build.get()
+    if record is not None:
+        record.add_file(path)
+
+
+def record_file_written(path: str) -> None:
+    """Note that the current target wrote `path` (no-op outside of a target)."""
+    record = _current_build.get()
+    if record is not None:
+        record.add_output(path)
+
+
+def record_llm_call(model: str, prompt: str) -> None:
+    """Note an LLM call made by the current target (no-op outside of a target)."""
+    record = _current_build.get()
+    if record is not None:
+        record.add_llm_call(model, prompt)
+
+
+class BuildManifest:
+    """
+    JSON file mapping target names to their last successful build. Concurrent
+    targets share one instance per manifest path (see `get_build_manifest`).
+
+    Args:
+        path: Location of the manifest file.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path: str = path
+        self._lock = threading.Lock()
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if self._entries is None:
+            entries: Dict[str, Dict[str, Any]] = {}
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    data = json.load(f)
+                if isinstance(data, dict) and data.get("version") == _FORMAT_VERSION:
+                    entries = dict(data.get("targets") or {})
+            except (OSError, ValueError):
+                pass
+            self._entries = entries
+        return self._entries
+
+    def get(self, target: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._load().get(target)
+
+    def put(self, target: str, entry: Optional[Dict[str, Any]]) -> None:
+        """
+        Store (or, with None, remove) the entry of a target and write the manifest.
+
+        Raises:
+            IOError: If the manifest cannot be written.
+        """
+        with self._lock:
+            entries = self._load()
+            if entry is None:
+                if entries.pop(target, None) is None:
+                    return
+            else:
+                entries[target] = entry
+            data = json.dumps({"version": _FORMAT_VERSION, "targets": entries}, indent=2, sort_keys=True)
+            directory = os.path.dirname(self.path) or "."
+            try:
+                os.makedirs(directory, exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".manifest-", suffix=".tmp")
+                try:
+                    with os.fdopen(fd, "w", encoding="utf-8") as f:
+                        f.write(data)
+                    os.replace(tmp_path, self.path)
+                except BaseException:
+                    os.unlink(tmp_path)
+                    raise
+            except OSError as err:
+                raise IOError(f"Error writing build manifest '{self.path}': {err}")
+
+
+_manifests: Dict[str, BuildManifest] = {}
+_manifests_lock = threading.Lock()
+
+
+def get_build_manifest(path: str) -> BuildManifest:
+    """Return the process-wide manifest instance for `path`."""
+    key = os.path.realpath(path)
+    with _manifests_lock:
+        manifest = _manifests.get(key)
+        if manifest is None:
+            manifest = BuildManifest(key)
+            _manifests[key] = manifest
+        return manifest
+
+
+_force: bool = False
+_only: List[str] = []
+
+_stats: Dict[str, int] = {"built": 0, "kept": 0, "excluded": 0}
+_stats_lock = threading.Lock()
+
+
+def configure_builds(force: bool = False, only: Optional[List[str]] = None) -> None:
+    """
+    Override the up-to-date check of every target in this process.
+
+    Args:
+        force: Rebuild every target.
+        only: Target names or glob patterns; matching targets are rebuilt and all
+            other targets are left untouched.
+    """
+    global _force, _only
+    _force = force
+    _only = list(only or [])
+
+
+def target_override(target: str) -> Optional[str]:
+    """
+    Return "force" if the target must be rebuilt, "exclude" if it must not run at
+    all, or None when the manifest decides.
+    """
+    if _only:
+        return "force" if any(fnmatch.fnmatchcase(target, pattern) for pattern in _only) else "exclude"
+    return "force" if _force else None
+
+
+def count_target(outcome: str) -> None:
+    """Count a target as "built", "kept" or "excluded"."""
+    with _stats_lock:
+        _stats[outcome] = _stats.get(outcome, 0) + 1
+
+
+def build_stats() -> Dict[str, int]:
+    """Return the number of targets built, kept up to date and excluded by `--only`."""
+    with _stats_lock:
+        return dict(_stats)
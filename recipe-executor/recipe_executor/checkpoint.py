@@ -0,0 +1,561 @@
+# This file was generated by Codebase-Generator, do not edit directly
+"""
+Checkpoint and resume support for the Recipe Executor.
+
+A Checkpointer records, in a run directory, which steps of a run have completed and
+a snapshot of the root context's artifacts after each of them. Steps are identified
+by their path: the step index at every nesting level plus markers for the sub-recipe
+(`recipe:<path>`), the conditional branch (`if_true`/`if_false`), the loop item
+(`item:<key>`) and the parallel substep (`substep:<index>`) they run in.
+
+Only work done on the root context is checkpointed step by step: top-level steps,
+sub-recipes executed by `execute_recipe` and conditional branches all share it.
+Loop items and parallel substeps run on cloned contexts, so they are tracked as
+whole units: a completed loop item's result is stored and reused on resume, while
+failed or unstarted items run again.
+
+Run directory layout:
+    run.json        - recipe path and checksum, creation time
+    cursor.json     - completed step paths, branches taken, completed loop items, status
+    checkpoint.pkl  - pickled root artifacts and the sizes of files written in append
+                      mode (never the config, which may hold credentials)
+    items.log       - append-only log of pickled loop item results
+
+The root artifacts are snapshotted only at step boundaries; a completed loop item
+appends one record with its result to the item log, so its cost does not depend on
+the size of the context or on the number of items before it. Files are written by a
+background thread, in the order they were requested, so the event loop does not wait
+for the disk; `finish` waits until everything is written.
+
+The active Checkpointer and the current step path are held in context variables so
+they follow nested executors and concurrent tasks without being passed explicitly.
+"""
+
+import contextvars
+import copy
+import hashlib
+import json
+import logging
+import os
+import pickle
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from recipe_executor.protocols import ContextProtocol
+from recipe_executor.utils.appends import appended_file_sizes, flush_appends, truncate_appended_files
+
+__all__ = [
+    "Checkpointer",
+    "activate_checkpointer",
+    "current_checkpointer",
+    "current_step_path",
+    "format_step_path",
+    "replay_scope",
+    "replaying",
+    "step_scope",
+]
+
+RUN_FILE = "run.json"
+CURSOR_FILE = "cursor.json"
+STATE_FILE = "checkpoint.pkl"
+ITEMS_FILE = "items.log"
+
+StepPath = Tuple[str, ...]
+
+_current_checkpointer: contextvars.ContextVar[Optional["Checkpointer"]] = contextvars.ContextVar(
+    "recipe_executor_checkpointer", default=None
+)
+_current_step_path: contextvars.ContextVar[StepPath] = contextvars.ContextVar("recipe_executor_step_path", default=())
+# False once a step of the current branch of execution has been re-executed: work
+# recorded by a previous attempt below it may be stale and is not reused.
+_replaying: contextvars.ContextVar[bool] = contextvars.ContextVar("recipe_executor_replaying", default=True)
+
+
+def format_step_path(path: StepPath) -> str:
+    """Return the display/storage form of a step path, e.g. '3/recipe:sub.json/1'."""
+    return "/".join(path)
+
+
+def current_checkpointer() -> Optional["Checkpointer"]:
+    """Return the Checkpointer active for the running task, if any."""
+    return _current_checkpointer.get()
+
+
+def current_step_path() -> StepPath:
+    """Return the path of the step currently executing in this task."""
+    return _current_step_path.get()
+
+
+def activate_checkpointer(checkpointer: Optional["Checkpointer"]) -> contextvars.Token:
+    """
+    Make a Checkpointer active for the current task and the tasks it creates.
+    Returns a token for `contextvars.ContextVar.reset`.
+    """
+    return _current_checkpointer.set(checkpointer)
+
+
+@contextmanager
+def step_scope(*segments: str) -> Iterator[StepPath]:
+    """
+    Extend the current step path with the given segments for the duration of the block.
+    """
+    path = _current_step_path.get() + segments
+    token = _current_step_path.set(path)
+    try:
+        yield path
+    finally:
+        _current_step_path.reset(token)
+
+
+def replaying() -> bool:
+    """True while completed work of a previous attempt may still be skipped."""
+    return _replaying.get()
+
+
+@contextmanager
+def replay_scope(enabled: bool) -> Iterator[None]:
+    """
+    Allow (or stop) reusing completed work of a previous attempt inside the block.
+    Replaying can only be narrowed: once disabled it stays disabled for nested blocks.
+    """
+    token = _replaying.set(_replaying.get() and enabled)
+    try:
+        yield
+    finally:
+        _replaying.reset(token)
+
+
+def _file_checksum(path: str) -> Optional[str]:
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def _atomic_write(path: str, data: bytes) -> None:
+    directory = os.path.dirname(path)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _append(path: str, data: bytes) -> None:
+    with open(path, "ab") as f:
+        f.write(data)
+
+
+class _Writer:
+    """
+    Background thread writing checkpoint files in the order they are submitted.
+    A pending replacement of a file is superseded by a newer one for the same file.
+    """
+
+    def __init__(self) -> None:
+        self._cond = threading.Condition()
+        # (append, path, data) operations not written yet
+        self._queue: List[Tuple[bool, str, bytes]] = []
+        self._busy: bool = False
+        self._error: Optional[OSError] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(self, append: bool, path: str, data: bytes) -> None:
+        """
+        Queue a write. An error of an earlier write is raised here.
+
+        Raises:
+            IOError: If an earlier checkpoint write failed.
+        """
+        with self._cond:
+            self._raise_error()
+            if not append:
+                self._queue = [op for op in self._queue if op[0] or op[1] != path]
+            self._queue.append((append, path, data))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="checkpoint-writer", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def drain(self) -> None:
+        """
+        Wait until every queued write is done.
+
+        Raises:
+            IOError: If a checkpoint write failed.
+        """
+        with self._cond:
+            while self._queue or self._busy:
+                self._cond.wait()
+            self._raise_error()
+
+    def _raise_error(self) -> None:
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise IOError(f"Failed to write checkpoint: {error}") from error
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._queue:
+                    self._cond.wait()
+                batch, self._queue = self._queue, []
+                self._busy = True
+            error: Optional[OSError] = None
+            for append, path, data in batch:
+                try:
+                    if append:
+                        _append(path, data)
+                    else:
+                        _atomic_write(path, data)
+                except OSError as e:
+                    error = e
+                    break
+            with self._cond:
+                self._busy = False
+                if error is not None and self._error is None:
+                    self._error = error
+                self._cond.notify_all()
+
+
+class Checkpointer:
+    """
+    Records completed steps of one run and the root context after each of them.
+
+    Args:
+        run_dir: Directory holding the checkpoint files (created if missing).
+        context: The root context of the run; only steps executed on this context
+            are checkpointed individually.
+        logger: Logger for checkpoint progress and problems.
+    """
+
+    def __init__(self, run_dir: str, context: ContextProtocol, logger: logging.Logger) -> None:
+        self.run_dir: str = run_dir
+        self.context: ContextProtocol = context
+        self.logger: logging.Logger = logger
+        self.completed: Set[str] = set()
+        self.branches: Dict[str, str] = {}
+        self.items: Dict[str, Dict[str, Any]] = {}
+        self.status: str = "running"
+        self.failed_step: Optional[str] = None
+        self.error: Optional[str] = None
+        self.resumed: bool = False
+        self._partial: Set[str] = set()
+        self._snapshot_failed: bool = False
+        # Orders snapshots and item records; resume uses the sizes of appended files
+        # recorded by the latest of them
+        self._seq: int = 0
+        self._writer: _Writer = _Writer()
+        os.makedirs(run_dir, exist_ok=True)
+
+    # ---- Run lifecycle -------------------------------------------------
+
+    def start(self, recipe_path: str) -> None:
+        """
+        Begin a fresh run: record the recipe and the initial context.
+        """
+        run_info = {
+            "recipe_path": os.path.abspath(recipe_path),
+            "recipe_sha256": _file_checksum(recipe_path),
+            "created": time.time(),
+        }
+        _atomic_write(os.path.join(self.run_dir, RUN_FILE), json.dumps(run_info, indent=2).encode("utf-8"))
+        _atomic_write(os.path.join(self.run_dir, ITEMS_FILE), b"")
+        self.save()
+
+    @staticmethod
+    def read_run_info(run_dir: str) -> Dict[str, Any]:
+        """
+        Return the run.json information of a run directory.
+
+        Raises:
+            ValueError: If the directory does not hold a checkpointed run.
+        """
+        path = os.path.join(run_dir, RUN_FILE)
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            raise ValueError(f"No checkpointed run found in '{run_dir}': {e}") from e
+
+    @staticmethod
+    def recipe_changed(run_info: Dict[str, Any], recipe_path: str) -> bool:
+        """True if the recipe file differs from the one the run was started with."""
+        recorded = run_info.get("recipe_sha256")
+        return recorded is not None and recorded != _file_checksum(recipe_path)
+
+    @staticmethod
+    def load_artifacts(run_dir: str) -> Dict[str, Any]:
+        """
+        Return the root artifacts of the last checkpoint of a run directory.
+
+        Raises:
+            ValueError: If the checkpoint cannot be read.
+        """
+        state = Checkpointer._read_state(run_dir)
+        return state.get("artifacts", {})
+
+    @staticmethod
+    def _read_state(run_dir: str) -> Dict[str, Any]:
+        path = os.path.join(run_dir, STATE_FILE)
+        try:
+            with open(path, "rb") as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError) as e:
+            raise ValueError(f"Failed to read checkpoint '{path}': {e}") from e
+
+    @staticmethod
+    def _read_item_log(run_dir: str) -> List[Tuple[Any, ...]]:
+        """
+        Return the records of the item log. A record torn by a crash ends the log.
+        """
+        records: List[Tuple[Any, ...]] = []
+        try:
+            with open(os.path.join(run_dir, ITEMS_FILE), "rb") as f:
+                while True:
+                    try:
+                        records.append(pickle.load(f))
+                    except (EOFError, pickle.UnpicklingError, ValueError):
+                        break
+        except FileNotFoundError:
+            pass
+        except (OSError, AttributeError, ImportError) as e:
+            raise ValueError(f"Failed to read checkpoint item log in '{run_dir}': {e}") from e
+        return records
+
+    def resume(self) -> None:
+        """
+        Load the cursor and loop item results of a previous run in the run directory.
+
+        Raises:
+            ValueError: If the checkpoint cannot be read.
+        """
+        cursor_path = os.path.join(self.run_dir, CURSOR_FILE)
+        try:
+            with open(cursor_path, encoding="utf-8") as f:
+                cursor = json.load(f)
+        except (OSError, ValueError) as e:
+            raise ValueError(f"Failed to read checkpoint cursor '{cursor_path}': {e}") from e
+        if not cursor.get("resumable", True):
+            raise ValueError(f"Run in '{self.run_dir}' cannot be resumed: its context could not be checkpointed")
+        state = self._read_state(self.run_dir)
+
+        self.completed = set(cursor.get("completed", []))
+        self.branches = dict(cursor.get("branches", {}))
+        self._seq = state.get("seq", 0)
+        appended_files: Dict[str, int] = state.get("appended_files", {})
+        # Checkpoints written before the item log kept the items in the snapshot
+        self.items = dict(state.get("items", {}))
+        for seq, path, item_id, result, sizes in self._read_item_log(self.run_dir):
+            if item_id is None:
+                self.items.pop(path, None)
+            else:
+                self.items.setdefault(path, {})[item_id] = result
+            if seq > self._seq:
+                self._seq = seq
+                if sizes is not None:
+                    appended_files = sizes
+        # Drop fragments appended after the checkpoint; the steps that wrote them run again
+        truncate_appended_files(appended_files)
+        self.status = "running"
+        self.failed_step = None
+        self.error = None
+        self.resumed = True
+        self.logger.info(
+            "Resuming run from '%s': %d completed steps, %d loop items",
+            self.run_dir,
+            len(self.completed),
+            sum(len(items) for items in self.items.values()),
+        )
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        """
+        Record the final status of the run.
+        """
+        if error is None:
+            self.status = "completed"
+        else:
+            self.status = "failed"
+            self.error = str(error)
+        self._write_cursor()
+        self._writer.drain()
+
+    # ---- Step tracking ---------------------------------------------------
+
+    def tracks(self, context: ContextProtocol) -> bool:
+        """True if steps executed on this context are checkpointed individually."""
+        return context is self.context
+
+    def is_complete(self, path: StepPath, context: ContextProtocol) -> bool:
+        """
+        True if the step at path completed on the root context in a previous attempt
+        and may be skipped.
+        """
+        return self.resumed and replaying() and self.tracks(context) and format_step_path(path) in self.completed
+
+    def mark_started(self, path: StepPath, context: ContextProtocol) -> None:
+        """
+        Forget previous completions of a step that is about to run, and of its substeps.
+        """
+        if not self.tracks(context):
+            return
+        key = format_step_path(path)
+        prefix = key + "/"
+        self.completed = {p for p in self.completed if p != key and not p.startswith(prefix)}
+
+    def mark_partial(self, path: StepPath, context: ContextProtocol) -> None:
+        """
+        Flag a step that finished with unfinished work (e.g. a loop with failed items)
+        so it is not recorded as completed and runs again on resume.
+        """
+        if self.tracks(context):
+            self._partial.add(format_step_path(path))
+
+    def mark_complete(self, path: StepPath, context: ContextProtocol) -> None:
+        """
+        Record a completed step and snapshot the root context.
+        """
+        if not self.tracks(context):
+            return
+        key = format_step_path(path)
+        if key in self._partial:
+            self._partial.discard(key)
+        else:
+            self.completed.add(key)
+        self.save()
+
+    def mark_failed(self, path: StepPath, context: ContextProtocol, error: BaseException) -> None:
+        """
+        Remember the innermost failing step on the root context for the cursor file.
+        """
+        if self.tracks(context) and self.failed_step is None:
+            self.failed_step = format_step_path(path)
+            self.error = str(error)
+
+    def record_branch(self, path: StepPath, context: ContextProtocol, branch: str) -> str:
+        """
+        Record the conditional branch taken at path and return the branch to execute:
+        on resume, the branch taken by the previous attempt wins, because conditions
+        such as `file_exists` may evaluate differently after partial work.
+        """
+        if not self.tracks(context):
+            return branch
+        key = format_step_path(path)
+        previous = self.branches.get(key)
+        if previous is not None and self.resumed and replaying():
+            return previous
+        self.branches[key] = branch
+        self._write_cursor()
+        return branch
+
+    def completed_items(self, path: StepPath, context: ContextProtocol) -> Dict[str, Any]:
+        """
+        Return the results of loop items (or parallel substeps) completed at path,
+        keyed by item id.
+        """
+        if not self.tracks(context):
+            return {}
+        key = format_step_path(path)
+        if not (self.resumed and replaying()):
+            # Results of a previous attempt may be stale
+            if self.items.pop(key, None) is not None:
+                self._log_item(key, None, None)
+            return {}
+        return copy.deepcopy(self.items.get(key, {}))
+
+    def mark_item_complete(self, path: StepPath, context: ContextProtocol, item_id: str, result: Any) -> None:
+        """
+        Record the result of a completed loop item (or parallel substep) of the step at path.
+        Only the item is appended to the item log; the root context is not snapshotted and
+        the cursor lists the item from the next step boundary on.
+        """
+        if not self.tracks(context):
+            return
+        key = format_step_path(path)
+        # Copy so later changes to the result by other steps do not leak into the checkpoint
+        self.items.setdefault(key, {})[item_id] = copy.deepcopy(result)
+        self._log_item(key, item_id, result)
+
+    def _log_item(self, key: str, item_id: Optional[str], result: Any) -> None:
+        """
+        Append an item record (or, without item_id, one forgetting the items of key) to
+        the item log, with the sizes of appended files so fragments of completed items
+        survive a resume.
+        """
+        if self._snapshot_failed:
+            return
+        # Fragments of the item must be on disk before their sizes are recorded
+        flush_appends(sync=False)
+        self._seq += 1
+        try:
+            data = pickle.dumps(
+                (self._seq, key, item_id, result, appended_file_sizes() if item_id is not None else None),
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        except (pickle.PicklingError, TypeError, AttributeError) as e:
+            self._snapshot_failed = True
+            self.logger.warning("Loop item cannot be checkpointed, resume disabled for this run: %s", e)
+            self._write_cursor()
+            return
+        self._writer.submit(True, os.path.join(self.run_dir, ITEMS_FILE), data)
+
+    # ---- Persistence -----------------------------------------------------
+
+    def _artifacts(self) -> Dict[str, Any]:
+        as_mapping = getattr(self.context, "as_mapping", None)
+        if callable(as_mapping):
+            return dict(as_mapping())
+        return self.context.dict()
+
+    def save(self) -> None:
+        """
+        Write the cursor and a snapshot of the root artifacts atomically. The snapshot
+        is taken now and written by the background writer.
+        """
+        # Appended files must be on disk before their sizes are recorded
+        flush_appends()
+        if not self._snapshot_failed:
+            self._seq += 1
+            try:
+                data = pickle.dumps(
+                    {"seq": self._seq, "artifacts": self._artifacts(), "appended_files": appended_file_sizes()},
+                    protocol=pickle.HIGHEST_PROTOCOL,
+                )
+                self._writer.submit(False, os.path.join(self.run_dir, STATE_FILE), data)
+            except (pickle.PicklingError, TypeError, AttributeError) as e:
+                # Keep the cursor up to date; resuming will not be possible from this point
+                self._snapshot_failed = True
+                self.logger.warning("Context cannot be checkpointed, resume disabled for this run: %s", e)
+        self._write_cursor()
+
+    def _write_cursor(self) -> None:
+        cursor: Dict[str, Any] = {
+            "status": self.status,
+            "updated": time.time(),
+            "resumable": not self._snapshot_failed,
+            "completed": sorted(self.completed, key=_path_sort_key),
+            "branches": self.branches,
+            "items": {path: sorted(items, key=_path_sort_key) for path, items in self.items.items()},
+        }
+        if self.failed_step is not None:
+            cursor["failed_step"] = self.failed_step
+        if self.error is not None:
+            cursor["error"] = self.error
+        self._writer.submit(
+            False, os.path.join(self.run_dir, CURSOR_FILE), json.dumps(cursor, indent=2).encode("utf-8")
+        )
+
+
+def _path_sort_key(path: str) -> List[Any]:
+    # Sort "10" after "9" while keeping non-numeric segments comparable
+    return [(0, int(part), "") if part.isdigit() else (1, 0, part) for part in path.split("/")]
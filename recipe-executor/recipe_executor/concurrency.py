@@ -0,0 +1,301 @@
+# This file was generated by Codebase-Generator, do not edit directly
+"""
+Adaptive concurrency for loop and parallel steps.
+
+A fixed `max_concurrency` is a guess: the best value depends on provider latency and
+throttling, which change while a recipe runs. An `adaptive_concurrency` block on a
+loop or parallel step replaces the guess with an AIMD controller. After every window
+of completions (at least the current limit) it:
+
+- halves the limit (`backoff`) when the window saw rate-limit (429) responses,
+  more failed items than `error_threshold`, or an average latency above
+  `latency_tolerance` times the baseline; work already in flight then finishes
+  without counting towards the next window, so one overload causes one decrease,
+- otherwise raises the limit by one if the window used every slot,
+
+always staying between `min_concurrency` and `max_concurrency`. The baseline is a
+moving average of window latencies: it follows a provider that gets slower (or
+faster) for good, while a sudden rise still counts as overload.
+
+LLM calls report 429 responses through `record_throttled`, which reaches the
+controller of the innermost adaptive step the call runs in. Every change of the
+limit is logged, and `adaptive_concurrency_stats` summarizes each controller.
+"""
+
+import asyncio
+import contextvars
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+__all__ = [
+    "AdaptiveConcurrency",
+    "AdaptiveConcurrencyConfig",
+    "adaptive_concurrency_stats",
+    "adaptive_scope",
+    "record_throttled",
+]
+
+# Weight of the latest window in the latency baseline (exponential moving average)
+_BASELINE_WEIGHT = 0.2
+
+# Smallest number of completions a decision is based on
+_MIN_WINDOW = 4
+
+
+class AdaptiveConcurrencyConfig(BaseModel):
+    """
+    Settings of an adaptive concurrency controller.
+
+    Attributes:
+        min_concurrency: Floor of the limit.
+        max_concurrency: Ceiling of the limit.
+        initial_concurrency: Starting limit (defaults to the floor).
+        latency_tolerance: Average latency, as a multiple of the baseline, above which
+            the limit is decreased.
+        error_threshold: Fraction of failed items in a window above which the limit
+            is decreased.
+        backoff: Factor applied to the limit on a decrease.
+    """
+
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
+    min_concurrency: int = Field(1, ge=1)
+    max_concurrency: int = Field(16, ge=1)
+    initial_concurrency: Optional[int] = Field(None, ge=1)
+    latency_tolerance: float = Field(2.0, gt=1)
+    error_threshold: float = Field(0.1, ge=0, le=1)
+    backoff: float = Field(0.5, gt=0, lt=1)
+
+    @model_validator(mode="after")
+    def _check_bounds(self) -> "AdaptiveConcurrencyConfig":
+        if self.max_concurrency < self.min_concurrency:
+            raise ValueError("max_concurrency must not be lower than min_concurrency")
+        return self
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD concurrency limit driven by the latency, failures and rate-limit responses of
+    the work it admits. Steps either wait for a slot with `acquire` or check `limit`
+    themselves and call `started`; every admitted unit of work ends with `finished`
+    (or `release` when it was skipped).
+
+    Args:
+        name: Label used in logs and stats (the step path).
+        settings: Controller settings.
+        logger: Logger for limit changes.
+    """
+
+    def __init__(self, name: str, settings: AdaptiveConcurrencyConfig, logger: logging.Logger) -> None:
+        self.name: str = name
+        self.settings: AdaptiveConcurrencyConfig = settings
+        self.logger: logging.Logger = logger
+        initial = settings.initial_concurrency or settings.min_concurrency
+        self.limit: int = max(settings.min_concurrency, min(settings.max_concurrency, initial))
+        self.in_flight: int = 0
+        self.baseline: Optional[float] = None
+        self._started_at: float = time.monotonic()
+        self._waiters: Deque[asyncio.Future] = deque()
+        # Current window
+        self._samples: int = 0
+        self._latency_sum: float = 0.0
+        self._latency_count: int = 0
+        self._errors: int = 0
+        self._throttled: int = 0
+        self._saturated: bool = False
+        # Completions of work started before the last decrease, not counted against the new limit
+        self._stale: int = 0
+        # Totals
+        self.completed: int = 0
+        self.errors: int = 0
+        self.throttled: int = 0
+        self.increases: int = 0
+        self.decreases: int = 0
+        self.history: List[Tuple[float, int]] = [(0.0, self.limit)]
+
+    async def acquire(self) -> None:
+        """Wait until fewer than `limit` units are in flight, then admit one."""
+        while self.in_flight >= self.limit:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                # Pass a slot this waiter was woken for on to the next one
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                self._wake()
+                raise
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+        self.started()
+
+    def started(self) -> None:
+        """Count a unit of work admitted by the caller."""
+        self.in_flight += 1
+        if self.in_flight >= self.limit:
+            self._saturated = True
+
+    def finished(self, latency: float, failed: bool = False) -> None:
+        """Record the outcome of an admitted unit of work and adjust the limit."""
+        self.in_flight = max(0, self.in_flight - 1)
+        self.completed += 1
+        if failed:
+            self.errors += 1
+        if self._stale:
+            self._stale -= 1
+            self._wake()
+            return
+        self._samples += 1
+        if failed:
+            self._errors += 1
+        else:
+            self._latency_sum += latency
+            self._latency_count += 1
+        if self._samples >= max(self.limit, _MIN_WINDOW):
+            self._adjust()
+        self._wake()
+
+    def release(self) -> None:
+        """Give back a slot without recording an outcome (the work was skipped)."""
+        self.in_flight = max(0, self.in_flight - 1)
+        self._wake()
+
+    def throttle(self) -> None:
+        """Record a rate-limit response seen by the work in flight."""
+        self._throttled += 1
+        self.throttled += 1
+
+    def _adjust(self) -> None:
+        settings = self.settings
+        latency = self._latency_sum / self._latency_count if self._latency_count else None
+        error_rate = self._errors / self._samples
+        if self._throttled:
+            reason: Optional[str] = f"{self._throttled} rate-limit responses"
+        elif error_rate > settings.error_threshold:
+            reason = f"error rate {error_rate:.0%}"
+        elif latency is not None and self.baseline is not None and latency > self.baseline * settings.latency_tolerance:
+            reason = f"latency {latency:.2f}s over baseline {self.baseline:.2f}s"
+        else:
+            reason = None
+
+        previous = self.limit
+        if reason is not None:
+            self.limit = max(settings.min_concurrency, int(self.limit * settings.backoff))
+            self._stale = self.in_flight
+        elif self._saturated:
+            self.limit = min(settings.max_concurrency, self.limit + 1)
+        if latency is not None:
+            if self.baseline is None:
+                self.baseline = latency
+            else:
+                self.baseline += _BASELINE_WEIGHT * (latency - self.baseline)
+
+        if self.limit != previous:
+            if self.limit < previous:
+                self.decreases += 1
+            else:
+                self.increases += 1
+            elapsed = time.monotonic() - self._started_at
+            self.history.append((round(elapsed, 3), self.limit))
+            self.logger.info(
+                "Adaptive concurrency %s: %d -> %d at %.1fs (%s; latency %s, errors %d/%d)",
+                self.name,
+                previous,
+                self.limit,
+                elapsed,
+                reason or "healthy",
+                f"{latency:.2f}s" if latency is not None else "n/a",
+                self._errors,
+                self._samples,
+            )
+
+        self._samples = 0
+        self._latency_sum = 0.0
+        self._latency_count = 0
+        self._errors = 0
+        self._throttled = 0
+        self._saturated = self.in_flight >= self.limit
+
+    def _wake(self) -> None:
+        free = self.limit - self.in_flight
+        for waiter in list(self._waiters)[: max(free, 0)]:
+            if not waiter.done():
+                waiter.set_result(None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the controller's metrics and the limit over time (seconds, limit)."""
+        return {
+            "name": self.name,
+            "limit": self.limit,
+            "completed": self.completed,
+            "errors": self.errors,
+            "throttled": self.throttled,
+            "increases": self.increases,
+            "decreases": self.decreases,
+            "baseline_latency_seconds": round(self.baseline, 3) if self.baseline is not None else None,
+            "history": list(self.history),
+        }
+
+    def close(self) -> None:
+        """Log the final summary and keep it for `adaptive_concurrency_stats`."""
+        stats = self.stats()
+        self.logger.info(
+            "Adaptive concurrency %s: final limit %d after %d items (%d increases, %d decreases, %d throttled); "
+            "limit over time: %s",
+            self.name,
+            self.limit,
+            self.completed,
+            self.increases,
+            self.decreases,
+            self.throttled,
+            ", ".join(f"{at:.1f}s={limit}" for at, limit in self.history),
+        )
+        with _stats_lock:
+            _finished.append(stats)
+
+
+_current: contextvars.ContextVar[Optional[AdaptiveConcurrency]] = contextvars.ContextVar(
+    "adaptive_concurrency", default=None
+)
+
+
+@contextmanager
+def adaptive_scope(controller: Optional[AdaptiveConcurrency]) -> Iterator[Optional[AdaptiveConcurrency]]:
+    """
+    Attribute rate-limit responses in the enclosed block (and tasks it creates) to
+    `controller`. With None, responses keep going to the enclosing controller.
+    """
+    if controller is None:
+        yield None
+        return
+    token = _current.set(controller)
+    try:
+        yield controller
+    finally:
+        _current.reset(token)
+
+
+def record_throttled() -> None:
+    """Note a rate-limit response (no-op outside of an adaptive step)."""
+    controller = _current.get()
+    if controller is not None:
+        controller.throttle()
+
+
+# Summaries of finished controllers, most recent last
+_finished: Deque[Dict[str, Any]] = deque(maxlen=100)
+_stats_lock = threading.Lock()
+
+
+def adaptive_concurrency_stats() -> List[Dict[str, Any]]:
+    """Return the summaries of the adaptive controllers finished in this process."""
+    with _stats_lock:
+        return list(_finished)
@@ -70,6 +70,88 @@ class RecipeExecutorConfig(BaseSettings):
         description="Base URL for Ollama API",
     )
 
+    # LLM Result Cache
+    llm_cache_dir: Optional[str] = Field(
+        default=None,
+        alias="LLM_CACHE_DIR",
+        description="Directory of the persistent LLM result cache (disabled when unset)",
+    )
+    llm_cache_max_bytes: Optional[int] = Field(
+        default=None,
+        alias="LLM_CACHE_MAX_BYTES",
+        description="Maximum size of the LLM result cache in bytes",
+    )
+
+    # LLM Client Connection Pools
+    llm_max_connections: Optional[int] = Field(
+        default=None,
+        alias="LLM_MAX_CONNECTIONS",
+        description="Maximum concurrent connections per shared LLM provider client (default 100)",
+    )
+    llm_max_keepalive_connections: Optional[int] = Field(
+        default=None,
+        alias="LLM_MAX_KEEPALIVE_CONNECTIONS",
+        description="Maximum idle keep-alive connections per shared LLM provider client (default 20)",
+    )
+    llm_keepalive_expiry: Optional[float] = Field(
+        default=None,
+        alias="LLM_KEEPALIVE_EXPIRY",
+        description="Seconds an idle LLM provider connection is kept open (default 30)",
+    )
+    llm_request_timeout: Optional[float] = Field(
+        default=None,
+        alias="LLM_REQUEST_TIMEOUT",
+        description="Timeout in seconds for LLM provider requests (default 600)",
+    )
+
+    # LLM Rate Limits (unlimited when unset)
+    llm_requests_per_minute: Optional[int] = Field(
+        default=None,
+        alias="LLM_REQUESTS_PER_MINUTE",
+        description="Default requests per minute per LLM provider/deployment",
+    )
+    llm_tokens_per_minute: Optional[int] = Field(
+        default=None,
+        alias="LLM_TOKENS_PER_MINUTE",
+        description="Default tokens per minute per LLM provider/deployment",
+    )
+    llm_max_concurrent_requests: Optional[int] = Field(
+        default=None,
+        alias="LLM_MAX_CONCURRENT_REQUESTS",
+        description="Default maximum in-flight requests per LLM provider/deployment",
+    )
+    llm_rate_limits: Optional[Dict[str, Dict[str, int]]] = Field(
+        default=None,
+        alias="LLM_RATE_LIMITS",
+        description=(
+            'JSON overrides per provider or provider/deployment, e.g. {"azure/gpt-4o": {"rpm": 300, "tpm": 90000}}'
+        ),
+    )
+
+    # Retries and Circuit Breaking
+    step_retry: Optional[Dict[str, Any]] = Field(
+        default=None,
+        alias="STEP_RETRY",
+        description='Default retry policy for leaf steps as JSON, e.g. {"max_attempts": 3, "backoff_base": 2}',
+    )
+    llm_circuit_breaker_threshold: Optional[int] = Field(
+        default=None,
+        alias="LLM_CIRCUIT_BREAKER_THRESHOLD",
+        description="Consecutive transient failures that open a provider's circuit (default 5, 0 disables)",
+    )
+    llm_circuit_breaker_cooldown: Optional[float] = Field(
+        default=None,
+        alias="LLM_CIRCUIT_BREAKER_COOLDOWN",
+        description="Seconds a provider's circuit stays open before a trial call (default 30)",
+    )
+
+    # Fake LLM provider (fake/<profile>, for offline benchmarks)
+    llm_fake_profiles: Optional[Dict[str, Dict[str, Any]]] = Field(
+        default=None,
+        alias="LLM_FAKE_PROFILES",
+        description='JSON profile overrides for fake models, e.g. {"slow": {"base": "realistic", "latency_mean": 5}}',
+    )
+
     model_config = SettingsConfigDict(
         env_prefix="RECIPE_EXECUTOR_",
         env_file=".env",
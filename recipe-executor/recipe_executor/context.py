@@ -1,11 +1,15 @@
 # This file was generated by Codebase-Generator, do not edit directly
-from typing import Any, Dict, Iterator, Optional
+from collections.abc import Mapping as MappingABC
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, Mapping, Optional, Set
 import copy
 import json
 
+from recipe_executor.artifact_store import ArtifactStore, get_artifact_store
 from recipe_executor.protocols import ContextProtocol
+from recipe_executor.utils.text import BlobText, TextRope, json_default
 
-__all__ = ["Context"]
+__all__ = ["Context", "peek"]
 
 
 class Context(ContextProtocol):
@@ -13,37 +17,105 @@ class Context(ContextProtocol):
     Context is a shared state container for the Recipe Executor system.
     It provides a dictionary-like interface for runtime artifacts and
     holds a separate configuration store.
+
+    Cloning is copy-on-write: a clone shares the parent's artifact values and
+    only deep-copies a value the first time either side hands it out or
+    replaces it, so clone cost does not grow with the size of the values.
+    Reading a shared value with `get` or `[]` copies it, because the caller may
+    mutate it; read-only callers use `peek` (or `as_mapping`) to avoid the copy.
+
+    Stored values pass through the artifact store (see `artifact_store`), which
+    accounts for their size and may replace large strings with blob handles.
+    Text handles (`TextRope`, `BlobText`) stay internal: values are handed out as
+    plain `str` by `get`, `[]`, `dict()` and `as_mapping`.
     """
 
     def __init__(
         self,
         artifacts: Optional[Dict[str, Any]] = None,
         config: Optional[Dict[str, Any]] = None,
+        store: Optional[ArtifactStore] = None,
     ) -> None:
-        # Deep copy initial data to avoid side effects from external modifications
-        self._artifacts: Dict[str, Any] = copy.deepcopy(artifacts) if artifacts is not None else {}
+        self._store: ArtifactStore = store if store is not None else get_artifact_store()
+        self._artifacts: Dict[str, Any] = {}
+        # Bytes accounted to this Context, for the keys whose value it stored
+        self._sizes: Dict[str, int] = {}
         self._config: Dict[str, Any] = copy.deepcopy(config) if config is not None else {}
+        # Keys whose values may be referenced by another Context (after clone()).
+        # They are deep-copied on first access so callers can mutate them safely.
+        self._shared: Set[str] = set()
+        # Keys whose values hold text handles below the top level (strings the artifact
+        # store spilled inside dicts, lists and tuples); they are handed out converted.
+        self._nested: Set[str] = set()
+        # Deep copy initial data to avoid side effects from external modifications
+        if artifacts:
+            for key, value in copy.deepcopy(artifacts).items():
+                self._store_value(key, value)
+
+    def __del__(self) -> None:
+        # Values of a discarded Context no longer count as resident
+        sizes = getattr(self, "_sizes", None)
+        if sizes:
+            self._store.release(sizes)
+
+    def _store_value(self, key: str, value: Any) -> None:
+        """
+        Store a value admitted by the artifact store and account for its size.
+        """
+        admitted, size = self._store.admit(key, value)
+        self._artifacts[key] = admitted
+        # A container replaced by the store holds spilled strings
+        if admitted is not value and type(admitted) in (dict, list, tuple):
+            self._nested.add(key)
+        else:
+            self._nested.discard(key)
+        self._store.charge(key, size, self._sizes.pop(key, 0))
+        self._sizes[key] = size
+
+    def _own(self, key: str) -> None:
+        """
+        Give this Context a private copy of a value still shared with a clone.
+        """
+        if key in self._shared:
+            self._shared.discard(key)
+            if key in self._artifacts:
+                self._artifacts[key] = copy.deepcopy(self._artifacts[key])
 
     def __getitem__(self, key: str) -> Any:
         """
         Retrieve an artifact by key. Raises KeyError if not found.
+        A value shared with a clone is deep-copied on this first read.
         """
-        try:
-            return self._artifacts[key]
-        except KeyError:
+        if key not in self._artifacts:
             raise KeyError(f"Key '{key}' not found in Context.")
+        return self._hand_out(key)
 
     def __setitem__(self, key: str, value: Any) -> None:
         """
         Store or overwrite an artifact value by key.
         """
-        self._artifacts[key] = value
+        self._shared.discard(key)
+        self._store_value(key, value)
+
+    def set_shared(self, key: str, value: Any) -> None:
+        """
+        Store an artifact whose value is also referenced elsewhere (e.g. a parsed file
+        in the read_files cache). Like values shared with a clone, it is deep-copied the
+        first time it is handed out, while template rendering reads it without copying.
+        Not part of ContextProtocol.
+        """
+        self._store_value(key, value)
+        # Containers the store copied to spill strings still reference parts of the value
+        self._shared.add(key)
 
     def __delitem__(self, key: str) -> None:
         """
         Remove an artifact by key. KeyError propagates if key is missing.
         """
         del self._artifacts[key]
+        self._shared.discard(key)
+        self._nested.discard(key)
+        self._store.charge(key, 0, self._sizes.pop(key, 0))
 
     def __contains__(self, key: object) -> bool:
         """
@@ -72,27 +144,79 @@ class Context(ContextProtocol):
     def get(self, key: str, default: Any = None) -> Any:
         """
         Get the value for key if present, otherwise return default.
+        A value shared with a clone is deep-copied on this first read.
+        """
+        if key not in self._artifacts:
+            return default
+        return self._hand_out(key)
+
+    def _hand_out(self, key: str) -> Any:
         """
-        return self._artifacts.get(key, default)
+        Return the value for a caller, with text handles converted to `str`. Values
+        holding nested handles are converted in a fresh copy, so they are not owned.
+        """
+        if key in self._nested:
+            return _plain_all(copy.deepcopy(self._artifacts[key]))
+        self._own(key)
+        return _plain(self._artifacts[key])
 
     def clone(self) -> ContextProtocol:
         """
-        Create a deep copy of this Context, including artifacts and config.
+        Create an independent copy of this Context, including artifacts and config.
+
+        Artifact values are shared copy-on-write between both contexts: each side
+        deep-copies a value only when it first reads or replaces it, so cloning
+        costs O(number of keys) instead of O(size of all values).
         """
-        # __init__ deep-copies provided dicts
-        return Context(artifacts=self._artifacts, config=self._config)
+        clone = Context(store=self._store)
+        clone._artifacts = dict(self._artifacts)
+        clone._shared = set(self._artifacts)
+        clone._nested = set(self._nested)
+        self._shared.update(self._artifacts)
+        # The config store is never mutated in place (get_config/set_config copy),
+        # so it can be shared outright.
+        clone._config = self._config
+        return clone
 
     def dict(self) -> Dict[str, Any]:  # noqa: A003
         """
-        Return a deep copy of the artifacts as a standard dict.
+        Return a deep copy of the artifacts as a standard dict, with text handles
+        (also nested ones) converted to `str`.
+        """
+        return _plain_all(copy.deepcopy(self._artifacts))
+
+    def artifact_sizes(self) -> Dict[str, int]:
+        """
+        Return the bytes accounted to this Context per key (values it stored itself;
+        values shared with the Context it was cloned from are not included).
+        Not part of ContextProtocol.
+        """
+        return dict(self._sizes)
+
+    def as_mapping(self) -> Mapping[str, Any]:
+        """
+        Return a read-only, zero-copy view of the artifacts.
+
+        Values are not copied, so callers must treat them as read-only. Used for
+        template rendering, where copying the whole context per render is wasteful.
         """
-        return copy.deepcopy(self._artifacts)
+        return _ArtifactView(self._artifacts, self._nested)
+
+    def raw_mapping(self) -> Mapping[str, Any]:
+        """
+        Return a read-only, zero-copy view of the artifacts as stored: text handles
+        (`TextRope`, `BlobText`) are not converted to `str`. Used by set_context merges,
+        which extend a rope instead of copying its text; callers must not let the
+        handles leave the context. Not part of ContextProtocol.
+        """
+        return MappingProxyType(self._artifacts)
 
     def json(self) -> str:
         """
         Return a JSON string representation of the artifacts.
         """
-        return json.dumps(self.dict())
+        # Serialization does not mutate values, so no defensive copy is needed
+        return json.dumps(self._artifacts, default=json_default)
 
     def get_config(self) -> Dict[str, Any]:
         """
@@ -105,3 +229,60 @@ class Context(ContextProtocol):
         Replace the configuration store with a deep copy of the provided dict.
         """
         self._config = copy.deepcopy(config)
+
+
+def _plain(value: Any) -> Any:
+    """Return text handles as `str`; other values unchanged."""
+    cls = type(value)
+    if cls is TextRope or cls is BlobText:
+        return str(value)
+    return value
+
+
+def _plain_all(value: Any) -> Any:
+    """Convert text handles nested in dicts, lists and tuples of a private copy in place."""
+    cls = type(value)
+    if cls is dict:
+        for k, v in value.items():
+            value[k] = _plain_all(v)
+    elif cls is list:
+        for i, v in enumerate(value):
+            value[i] = _plain_all(v)
+    elif cls is tuple:
+        return tuple(_plain_all(v) for v in value)
+    return _plain(value)
+
+
+class _ArtifactView(MappingABC):
+    """Read-only view of artifacts that hands out text handles as `str`."""
+
+    __slots__ = ("_artifacts", "_nested")
+
+    def __init__(self, artifacts: Dict[str, Any], nested: Set[str]) -> None:
+        self._artifacts = artifacts
+        self._nested = nested
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._nested:
+            return _plain_all(copy.deepcopy(self._artifacts[key]))
+        return _plain(self._artifacts[key])
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._artifacts
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._artifacts)
+
+    def __len__(self) -> int:
+        return len(self._artifacts)
+
+
+def peek(context: ContextProtocol, key: str, default: Any = None) -> Any:
+    """
+    Return the value for key without the copy `get` makes of values shared with a
+    clone. The value may be shared with other contexts: callers must not mutate it.
+    """
+    as_mapping = getattr(context, "as_mapping", None)
+    if callable(as_mapping):
+        return as_mapping().get(key, default)
+    return context.get(key, default)
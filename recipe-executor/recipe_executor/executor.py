@@ -1,14 +1,29 @@
 # This file was generated by Codebase-Generator, do not edit directly
 import os
 import json
+import asyncio
 import logging
 import inspect
+from contextlib import nullcontext
 from pathlib import Path
 from typing import Union, Dict, Any
 
+from recipe_executor.build_manifest import record_file_read
+from recipe_executor.checkpoint import (
+    current_checkpointer,
+    current_step_path,
+    format_step_path,
+    replay_scope,
+    replaying,
+    step_scope,
+)
 from recipe_executor.protocols import ExecutorProtocol, ContextProtocol
 from recipe_executor.models import Recipe
-from recipe_executor.steps.registry import STEP_REGISTRY
+from recipe_executor.planner import PlanNode, build_plan
+from recipe_executor.recipe_cache import CompiledRecipe, CompiledStep, compile_recipe, load_recipe_file
+from recipe_executor.retry import resolve_retry_policy, run_with_retry
+from recipe_executor.tracing import trace_span
+from recipe_executor.utils.appends import close_appends, flush_appends
 
 
 class Executor(ExecutorProtocol):
@@ -22,80 +37,201 @@ class Executor(ExecutorProtocol):
 
     async def execute(
         self,
-        recipe: Union[str, Path, Dict[str, Any], Recipe],
+        recipe: Union[str, Path, Dict[str, Any], Recipe, CompiledRecipe],
         context: ContextProtocol,
     ) -> None:
         """
-        Load a recipe (from file path, JSON string, dict, or Recipe model),
-        validate it, and execute its steps sequentially using the provided context.
+        Load a recipe (from file path, JSON string, dict, Recipe model or compiled
+        recipe), validate it, and execute its steps using the provided context.
+        Recipe files are parsed once and reused until they change on disk; the step
+        objects of a compiled recipe are reused by every execution.
+
+        Steps run sequentially unless the context config sets `execution_mode` to
+        "dag", in which case steps without conflicting context keys run concurrently.
         """
-        # Load or validate the recipe into a Recipe model
-        if isinstance(recipe, Recipe):
-            self.logger.debug("Using provided Recipe model instance.")
-            recipe_model = recipe
-        elif isinstance(recipe, dict):
-            self.logger.debug("Loading recipe from dict.")
+        compiled = self._load(recipe)
+
+        # Log recipe summary (dumping the full recipe is only worth it when debug is enabled)
+        step_count = len(compiled.steps)
+        if self.logger.isEnabledFor(logging.DEBUG):
             try:
-                recipe_model = Recipe.model_validate(recipe)
-            except Exception as e:
-                raise ValueError(f"Invalid recipe structure: {e}") from e
-        elif isinstance(recipe, (str, Path)):
-            recipe_str = str(recipe)
-            if os.path.isfile(recipe_str):
-                # File path case
-                self.logger.debug(f"Loading recipe from file path: {recipe_str}")
-                try:
-                    with open(recipe_str, encoding="utf-8") as f:
-                        data = json.load(f)
-                except Exception as e:
-                    raise ValueError(f"Failed to read or parse recipe file '{recipe_str}': {e}") from e
-                try:
-                    recipe_model = Recipe.model_validate(data)
-                except Exception as e:
-                    raise ValueError(f"Invalid recipe structure from file '{recipe_str}': {e}") from e
-            else:
-                # Raw JSON string case
-                self.logger.debug("Loading recipe from JSON string.")
-                try:
-                    recipe_model = Recipe.model_validate_json(recipe_str)
-                except Exception as primary_err:
-                    # Fallback: parse then validate
-                    try:
-                        parsed = json.loads(recipe_str)
-                        recipe_model = Recipe.model_validate(parsed)
-                    except Exception as e:
-                        raise ValueError(f"Failed to parse or validate recipe JSON string: {primary_err}") from e
-        else:
-            raise TypeError(f"Unsupported recipe type: {type(recipe)}")
-
-        # Log recipe summary
+                summary = compiled.recipe.model_dump()
+            except Exception:
+                summary = {}
+            self.logger.debug("Recipe loaded: {'steps': %d}. Full recipe: %s", step_count, summary)
+
+        execution_mode = context.get_config().get("execution_mode") or "sequential"
+        # Recipe files (top level and execute_recipe) get their own span in the trace
+        recipe_span = (
+            trace_span(f"recipe {compiled.source}", "recipe", path=compiled.source, steps=step_count)
+            if compiled.source is not None
+            else nullcontext()
+        )
+        # Buffered file appends are flushed and released when the top-level recipe ends
+        top_level = not current_step_path()
         try:
-            summary = recipe_model.model_dump()
-        except Exception:
-            summary = {}
-        step_count = len(recipe_model.steps or [])  # type: ignore
-        self.logger.debug(f"Recipe loaded: {{'steps': {step_count}}}. Full recipe: {summary}")
-
-        # Execute steps sequentially
-        for idx, step in enumerate(recipe_model.steps or []):  # type: ignore
-            step_type = step.type
-            config: Dict[str, Any] = step.config or {}
-            self.logger.debug(f"Executing step {idx} of type '{step_type}' with config: {config}")
-
-            if step_type not in STEP_REGISTRY:
+            with recipe_span:
+                if execution_mode == "dag":
+                    await self._execute_dag(compiled, context)
+                elif execution_mode == "sequential":
+                    # Execute steps sequentially
+                    resuming = replaying()
+                    for idx, step in enumerate(compiled.steps):
+                        skipped = await self._run_step(idx, step, context, resuming)
+                        # Once a step runs again, later steps may see different inputs and must run too
+                        resuming = resuming and skipped
+                else:
+                    raise ValueError(f"Unknown execution mode '{execution_mode}'. Expected 'sequential' or 'dag'.")
+        finally:
+            if top_level:
+                close_appends()
+
+        self.logger.debug("All recipe steps completed successfully.")
+
+    async def _run_step(self, idx: int, step: CompiledStep, context: ContextProtocol, resuming: bool = False) -> bool:
+        """
+        Instantiate and execute a single step, wrapping failures with the step index and type.
+        Transient failures are retried according to the step's retry policy.
+
+        When a run is resumed from a checkpoint and `resuming` is True, a step that
+        completed in the previous attempt is skipped. Returns True if the step was skipped.
+        """
+        step_type = step.type
+        config: Dict[str, Any] = step.config
+        checkpointer = current_checkpointer()
+
+        with (
+            step_scope(str(idx)) as path,
+            replay_scope(resuming),
+            trace_span(f"step {idx}: {step_type}", "step", index=idx, type=step_type) as span,
+        ):
+            if checkpointer is not None:
+                if checkpointer.is_complete(path, context):
+                    self.logger.info(
+                        "Skipping step %s ('%s'): completed in a previous attempt", format_step_path(path), step_type
+                    )
+                    if span is not None:
+                        span.attrs["skipped"] = True
+                    return True
+                checkpointer.mark_started(path, context)
+
+            self.logger.debug("Executing step %d of type '%s' with config: %s", idx, step_type, config)
+
+            # Fall back to the registry for steps registered after the recipe was compiled
+            if step.resolve_class() is None:
                 raise ValueError(f"Unknown step type '{step_type}' at index {idx}")
 
-            step_cls = STEP_REGISTRY[step_type]
-            step_instance = step_cls(self.logger, config)
+            # Steps other than write_files may read files that earlier steps appended to
+            if step_type != "write_files":
+                flush_appends(sync=False)
 
-            try:
+            # The config is validated when the step object is first built, then reused
+            step_instance = step.instantiate(self.logger)
+
+            async def attempt() -> None:
                 result = step_instance.execute(context)
                 if inspect.isawaitable(result):  # type: ignore
                     await result
+
+            try:
+                # Transient failures are retried per the step's `retry` block or the `step_retry` default
+                policy = resolve_retry_policy(step_type, step.retry, context.get_config())
+                await run_with_retry(attempt, policy, self.logger, f"Step {idx} ('{step_type}')")
             except Exception as e:
+                if checkpointer is not None:
+                    checkpointer.mark_failed(path, context, e)
                 msg = f"Error executing step {idx} ('{step_type}'): {e}"
                 raise ValueError(msg) from e
 
-            self.logger.debug(f"Step {idx} ('{step_type}') completed successfully.")
+            if checkpointer is not None:
+                checkpointer.mark_complete(path, context)
 
-        self.logger.debug("All recipe steps completed successfully.")
+        self.logger.debug("Step %d ('%s') completed successfully.", idx, step_type)
+        return False
+
+    async def _execute_dag(self, compiled: CompiledRecipe, context: ContextProtocol) -> None:
+        """
+        Execute steps as soon as every earlier step they conflict with has finished.
+
+        The dependency graph comes from the static read/write analysis in the planner, so
+        the visible results match sequential execution. If steps fail, pending steps are
+        cancelled and the error of the lowest failing step index is raised, as in
+        sequential mode.
+        """
+        plan = build_plan(compiled.steps, context)
+        self.logger.debug("Execution plan:\n%s", plan.explain())
+
+        tasks: Dict[int, "asyncio.Task[bool]"] = {}
+        resuming = replaying()
+
+        async def run_node(node: PlanNode) -> bool:
+            deps_skipped = True
+            if node.depends_on:
+                deps_skipped = all(await asyncio.gather(*(tasks[dep] for dep in node.depends_on)))
+            # A step whose dependencies ran again must run again as well
+            return await self._run_step(node.index, node.step, context, resuming and deps_skipped)
+
+        for node in plan.nodes:
+            tasks[node.index] = asyncio.create_task(run_node(node))
+
+        try:
+            await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+
+            # Report the first failure in recipe order; dependents of a failed step
+            # only re-raise its error, so walk the steps in index order.
+            for idx in sorted(tasks):
+                task = tasks[idx]
+                if task.cancelled():
+                    continue
+                error = task.exception()
+                if error is not None:
+                    raise error
+            raise
+
+    def _load(self, recipe: Union[str, Path, Dict[str, Any], Recipe, CompiledRecipe]) -> CompiledRecipe:
+        """
+        Load or validate the recipe into a compiled Recipe model.
+        Recipe files are served from the process-wide recipe cache.
+        """
+        if isinstance(recipe, CompiledRecipe):
+            return recipe
+
+        if isinstance(recipe, Recipe):
+            self.logger.debug("Using provided Recipe model instance.")
+            return compile_recipe(recipe)
+
+        if isinstance(recipe, dict):
+            self.logger.debug("Loading recipe from dict.")
+            try:
+                recipe_model = Recipe.model_validate(recipe)
+            except Exception as e:
+                raise ValueError(f"Invalid recipe structure: {e}") from e
+            return compile_recipe(recipe_model)
+
+        if isinstance(recipe, (str, Path)):
+            recipe_str = str(recipe)
+            if os.path.isfile(recipe_str):
+                # File path case
+                self.logger.debug("Loading recipe from file path: %s", recipe_str)
+                record_file_read(recipe_str)
+                return load_recipe_file(recipe_str)
+
+            # Raw JSON string case
+            self.logger.debug("Loading recipe from JSON string.")
+            try:
+                recipe_model = Recipe.model_validate_json(recipe_str)
+            except Exception as primary_err:
+                # Fallback: parse then validate
+                try:
+                    parsed = json.loads(recipe_str)
+                    recipe_model = Recipe.model_validate(parsed)
+                except Exception as e:
+                    raise ValueError(f"Failed to parse or validate recipe JSON string: {primary_err}") from e
+            return compile_recipe(recipe_model)
+
+        raise TypeError(f"Unsupported recipe type: {type(recipe)}")
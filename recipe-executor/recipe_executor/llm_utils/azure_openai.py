@@ -2,11 +2,10 @@
 import logging
 from typing import Optional
 
-from azure.identity import DefaultAzureCredential, ManagedIdentityCredential, get_bearer_token_provider
-from openai import AsyncAzureOpenAI
 from pydantic_ai.providers.openai import OpenAIProvider
 from pydantic_ai.models.openai import OpenAIModel
 
+from recipe_executor.llm_utils.clients import PoolSettings, get_azure_openai_client, get_azure_token_provider
 from recipe_executor.protocols import ContextProtocol
 
 
@@ -26,6 +25,7 @@ def get_azure_openai_model(
     model_name: str,
     deployment_name: Optional[str],
     context: ContextProtocol,
+    pool_settings: Optional[PoolSettings] = None,
 ) -> OpenAIModel:
     """
     Create a PydanticAI OpenAIModel instance configured for Azure OpenAI.
@@ -35,6 +35,7 @@ def get_azure_openai_model(
         model_name (str): The model name (e.g., "gpt-4o").
         deployment_name (Optional[str]): Deployment name; defaults to config or model_name.
         context (ContextProtocol): Context providing configuration values.
+        pool_settings (Optional[PoolSettings]): Connection pool limits; defaults to the context config.
 
     Returns:
         OpenAIModel: Configured PydanticAI OpenAIModel.
@@ -49,6 +50,8 @@ def get_azure_openai_model(
     use_managed_identity = config.get("azure_use_managed_identity", False)
     client_id = config.get("azure_client_id")
 
+    pool_settings = pool_settings or PoolSettings.from_config(config)
+
     # Determine deployment name
     deployment = deployment_name or config.get("azure_openai_deployment_name") or model_name
 
@@ -73,17 +76,17 @@ def get_azure_openai_model(
         # Choose authentication method
         if use_managed_identity:
             logger.info("Using Azure Managed Identity for authentication")
+            # Credential and bearer token are cached process-wide until the token nears expiry
             if client_id:
-                credential = ManagedIdentityCredential(client_id=client_id)
+                token_provider = get_azure_token_provider("managed", client_id)
             else:
-                credential = DefaultAzureCredential()
-            scope = "https://cognitiveservices.azure.com/.default"
-            token_provider = get_bearer_token_provider(credential, scope)
-            azure_client = AsyncAzureOpenAI(
-                azure_ad_token_provider=token_provider,
-                azure_endpoint=base_url,
+                token_provider = get_azure_token_provider("default")
+            azure_client = get_azure_openai_client(
+                endpoint=base_url,
                 api_version=api_version,
-                azure_deployment=deployment,
+                token_provider=token_provider,
+                deployment=deployment,
+                settings=pool_settings,
             )
             auth_method = "Azure Managed Identity"
         else:
@@ -91,11 +94,12 @@ def get_azure_openai_model(
                 logger.error("Configuration 'azure_openai_api_key' is required for API key authentication")
                 raise Exception("Missing azure_openai_api_key in configuration")
             logger.info("Using API Key authentication for Azure OpenAI")
-            azure_client = AsyncAzureOpenAI(
-                api_key=api_key,
-                azure_endpoint=base_url,
+            azure_client = get_azure_openai_client(
+                endpoint=base_url,
                 api_version=api_version,
-                azure_deployment=deployment,
+                api_key=api_key,
+                deployment=deployment,
+                settings=pool_settings,
             )
             auth_method = "API Key"
     except Exception as err:
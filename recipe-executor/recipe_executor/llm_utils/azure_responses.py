@@ -6,13 +6,13 @@ Provides Azure OpenAI Responses API integration for PydanticAI Agents.
 
 import logging
 import os
-from typing import Optional, Dict
+from typing import Optional
 
-from azure.identity import DefaultAzureCredential, get_bearer_token_provider
-from openai import AsyncAzureOpenAI
 from pydantic_ai.models.openai import OpenAIResponsesModel
 from pydantic_ai.providers.openai import OpenAIProvider
 
+from recipe_executor.llm_utils.clients import PoolSettings, get_azure_openai_client, get_azure_token_provider
+
 __all__ = ["get_azure_responses_model"]
 
 
@@ -27,6 +27,7 @@ def get_azure_responses_model(
     logger: logging.Logger,
     model_name: str,
     deployment_name: Optional[str] = None,
+    pool_settings: Optional[PoolSettings] = None,
 ) -> OpenAIResponsesModel:
     """
     Create a PydanticAI OpenAIResponsesModel for Azure OpenAI.
@@ -35,6 +36,7 @@ def get_azure_responses_model(
         logger: Logger for logging messages.
         model_name: Name of the model (e.g., "gpt-4o").
         deployment_name: Azure deployment name. Defaults to model_name or AZURE_OPENAI_DEPLOYMENT_NAME.
+        pool_settings: Connection pool limits for the shared client. Defaults to PoolSettings().
 
     Returns:
         Configured OpenAIResponsesModel for Azure.
@@ -73,16 +75,12 @@ def get_azure_responses_model(
         # Initialize Azure OpenAI client
         if use_managed:
             logger.info("Authenticating to Azure OpenAI with Managed Identity.")
-            cred_kwargs: Dict[str, str] = {}
-            if client_id:
-                cred_kwargs["managed_identity_client_id"] = client_id
-            credential = DefaultAzureCredential(**cred_kwargs)
-            scope = "https://cognitiveservices.azure.com/.default"
-            token_provider = get_bearer_token_provider(credential, scope)
-            azure_client = AsyncAzureOpenAI(
-                azure_endpoint=azure_endpoint,
+            token_provider = get_azure_token_provider("default", client_id or None)
+            azure_client = get_azure_openai_client(
+                endpoint=azure_endpoint,
                 api_version=azure_api_version,
-                azure_ad_token_provider=token_provider,
+                token_provider=token_provider,
+                settings=pool_settings,
             )
             auth_method = "ManagedIdentity"
         else:
@@ -91,10 +89,11 @@ def get_azure_responses_model(
                     "Environment variable AZURE_OPENAI_API_KEY must be set when not using managed identity."
                 )
             logger.info("Authenticating to Azure OpenAI with API Key.")
-            azure_client = AsyncAzureOpenAI(
-                azure_endpoint=azure_endpoint,
+            azure_client = get_azure_openai_client(
+                endpoint=azure_endpoint,
                 api_version=azure_api_version,
                 api_key=azure_api_key,
+                settings=pool_settings,
             )
             auth_method = "ApiKey"
 
@@ -0,0 +1,211 @@
+# This file was generated by Codebase-Generator, do not edit directly
+"""
+Per-provider circuit breaker for LLM calls.
+
+After `threshold` consecutive transient failures (timeouts, connection errors,
+5xx responses) of one provider/deployment the circuit opens and calls fail fast
+with `CircuitOpenError` instead of queueing behind a provider that is down.
+After `cooldown` seconds a single trial call is let through: success closes the
+circuit, failure opens it again.
+
+Throttling (429) is not an outage: the provider answered, and the rate limiter
+paces the calls. It neither counts towards opening the circuit nor fails a trial.
+`CircuitOpenError` is retryable, with `retry_after` set to the rest of the cooldown,
+so a step retry policy waits for the trial instead of failing the step.
+"""
+
+import threading
+import time
+from typing import Any, Dict, List, Mapping, Optional
+
+from recipe_executor.llm_utils.rate_limiter import limiter_key
+from recipe_executor.retry import error_status_code, is_transient_error
+
+__all__ = [
+    "CircuitOpenError",
+    "CallTicket",
+    "CircuitBreaker",
+    "get_circuit_breaker",
+    "circuit_breaker_stats",
+]
+
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_COOLDOWN = 30.0
+
+# Seconds a call rejected while the trial call is in flight waits before retrying
+_TRIAL_WAIT = 1.0
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """
+    Raised when a call is rejected because the provider's circuit is open.
+    Step retry policies retry it no sooner than `retry_after` seconds.
+    """
+
+    retryable = True
+
+    def __init__(self, message: str, retry_after: float) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class CallTicket:
+    """Admission of one call; `trial` is True for the trial call of a half-open circuit."""
+
+    __slots__ = ("trial",)
+
+    def __init__(self, trial: bool = False) -> None:
+        self.trial = trial
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker of one provider/deployment.
+
+    Args:
+        key: The provider/deployment key.
+        threshold: Consecutive transient failures that open the circuit (0 disables it).
+        cooldown: Seconds the circuit stays open before a trial call.
+    """
+
+    def __init__(self, key: str, threshold: int = DEFAULT_FAILURE_THRESHOLD, cooldown: float = DEFAULT_COOLDOWN):
+        self.key = key
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.state: str = CLOSED
+        self.consecutive_failures: int = 0
+        self.opened_at: float = 0.0
+        # Ticket of the trial call in flight while half-open
+        self._trial: Optional[CallTicket] = None
+        self._lock = threading.Lock()
+        # Metrics
+        self.times_opened: int = 0
+        self.rejected: int = 0
+
+    def before_call(self) -> CallTicket:
+        """
+        Admit or reject a call. The returned ticket is passed to `record_success`,
+        `record_failure` or `abandon` when the call ends.
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with a trial in flight.
+        """
+        if self.threshold <= 0:
+            return CallTicket()
+        with self._lock:
+            if self.state == OPEN:
+                remaining = self.opened_at + self.cooldown - time.monotonic()
+                if remaining > 0:
+                    self.rejected += 1
+                    raise CircuitOpenError(
+                        f"Circuit for '{self.key}' is open after {self.consecutive_failures} consecutive failures; "
+                        f"retry in {remaining:.1f} sec",
+                        retry_after=remaining,
+                    )
+                self.state = HALF_OPEN
+            if self.state == HALF_OPEN:
+                if self._trial is not None:
+                    self.rejected += 1
+                    raise CircuitOpenError(
+                        f"Circuit for '{self.key}' is half-open; a trial call is in flight",
+                        retry_after=min(_TRIAL_WAIT, self.cooldown),
+                    )
+                self._trial = CallTicket(trial=True)
+                return self._trial
+            return CallTicket()
+
+    def _end(self, ticket: CallTicket) -> bool:
+        """Release the trial slot if the ticket holds it (lock held); return whether it did."""
+        if ticket.trial and self._trial is ticket:
+            self._trial = None
+            return True
+        return False
+
+    def record_success(self, ticket: CallTicket) -> None:
+        with self._lock:
+            self._end(ticket)
+            self.state = CLOSED
+            self.consecutive_failures = 0
+
+    def abandon(self, ticket: CallTicket) -> None:
+        """End a call that was cancelled without counting it either way."""
+        with self._lock:
+            self._end(ticket)
+
+    def record_failure(self, error: BaseException, ticket: CallTicket) -> None:
+        """
+        Count a failed call. Only transient provider-side errors count towards opening
+        the circuit; throttling (429) and other errors end a trial by closing it, since
+        the provider answered. A failed trial opens the circuit again; while half-open,
+        failures of calls admitted before the circuit opened do not decide the state.
+        """
+        with self._lock:
+            trial = self._end(ticket)
+            if error_status_code(error) == 429 or not is_transient_error(error):
+                if trial:
+                    self.state = CLOSED
+                    self.consecutive_failures = 0
+                return
+            self.consecutive_failures += 1
+            if self.threshold <= 0:
+                return
+            if trial or (self.state == CLOSED and self.consecutive_failures >= self.threshold):
+                if self.state != OPEN:
+                    self.times_opened += 1
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "key": self.key,
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+        }
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def _setting(config: Mapping[str, Any], name: str, default: Any, cast: Any) -> Any:
+    raw = config.get(name)
+    if raw is None or raw == "":
+        return default
+    try:
+        return cast(raw)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid {name} value: {raw!r}")
+
+
+def get_circuit_breaker(model_id: str, config: Mapping[str, Any]) -> CircuitBreaker:
+    """
+    Return the shared circuit breaker of a model's provider/deployment, configured from
+    `llm_circuit_breaker_threshold` and `llm_circuit_breaker_cooldown`.
+    """
+    key = limiter_key(model_id)
+    threshold = _setting(config, "llm_circuit_breaker_threshold", DEFAULT_FAILURE_THRESHOLD, int)
+    cooldown = _setting(config, "llm_circuit_breaker_cooldown", DEFAULT_COOLDOWN, float)
+    with _breakers_lock:
+        breaker: Optional[CircuitBreaker] = _breakers.get(key)
+        if breaker is None:
+            breaker = CircuitBreaker(key, threshold, cooldown)
+            _breakers[key] = breaker
+        else:
+            breaker.threshold = threshold
+            breaker.cooldown = cooldown
+        return breaker
+
+
+def circuit_breaker_stats() -> List[Dict[str, Any]]:
+    """
+    Return the state and metrics of every circuit breaker used in this process.
+    """
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return [breaker.stats() for breaker in breakers]
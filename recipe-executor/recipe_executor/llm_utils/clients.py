@@ -0,0 +1,319 @@
+# This file was generated by Codebase-Generator, do not edit directly
+"""
+Process-level registry of LLM provider clients.
+
+Creating an SDK client per LLM call means a fresh HTTP connection pool (and TLS
+handshake) per call, and for Azure managed identity a fresh credential and token
+fetch. The registry hands out one client per (provider, endpoint, credentials hash,
+api_version, deployment) and event loop, each with its own keep-alive connection pool
+sized from configuration, and caches Azure bearer tokens until shortly before they
+expire. `close_clients()` closes every pool at shutdown.
+
+Clients are bound to the running event loop (httpx connection pools cannot be
+shared across loops), so each loop has its own clients, registered under the loop
+object itself (weakly). Applications calling `asyncio.run` per request get a new
+loop each time: the clients of loops that have been closed are dropped on the next
+registry access, and never handed out again.
+
+The SDKs (openai, anthropic, httpx) are imported by the factories, the first time a
+client of their provider is needed, so importing this module stays cheap.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Tuple
+
+if TYPE_CHECKING:
+    import httpx
+    from anthropic import AsyncAnthropic
+    from openai import AsyncAzureOpenAI, AsyncOpenAI
+
+__all__ = [
+    "PoolSettings",
+    "CachedTokenProvider",
+    "get_openai_client",
+    "get_azure_openai_client",
+    "get_anthropic_client",
+    "get_azure_token_provider",
+    "close_clients",
+    "client_registry_stats",
+]
+
+AZURE_COGNITIVE_SCOPE = "https://cognitiveservices.azure.com/.default"
+
+# (provider, endpoint, credentials hash, api_version, deployment), per event loop
+ClientKey = Tuple[str, str, str, str, str]
+
+
+@dataclass(frozen=True)
+class PoolSettings:
+    """
+    HTTP connection pool limits shared by the clients of one provider endpoint.
+
+    Fields:
+        max_connections: Maximum number of concurrent connections per client.
+        max_keepalive_connections: Maximum number of idle connections kept open.
+        keepalive_expiry: Seconds an idle connection is kept open.
+        timeout: Request timeout in seconds.
+        connect_timeout: Connection timeout in seconds.
+    """
+
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    timeout: float = 600.0
+    connect_timeout: float = 5.0
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "PoolSettings":
+        """
+        Build pool settings from context configuration values (`llm_max_connections`,
+        `llm_max_keepalive_connections`, `llm_keepalive_expiry`, `llm_request_timeout`).
+
+        Raises:
+            ValueError: If a value is not a number.
+        """
+        defaults = cls()
+        values: Dict[str, Any] = {}
+        for field_name, config_key, cast in (
+            ("max_connections", "llm_max_connections", int),
+            ("max_keepalive_connections", "llm_max_keepalive_connections", int),
+            ("keepalive_expiry", "llm_keepalive_expiry", float),
+            ("timeout", "llm_request_timeout", float),
+        ):
+            raw = config.get(config_key)
+            if raw is None or raw == "":
+                values[field_name] = getattr(defaults, field_name)
+                continue
+            try:
+                values[field_name] = cast(raw)
+            except (TypeError, ValueError):
+                raise ValueError(f"Invalid {config_key} value: {raw!r}")
+        return cls(**values)
+
+
+class CachedTokenProvider:
+    """
+    Bearer token provider that reuses a token until shortly before it expires.
+
+    Args:
+        credential: An azure.identity credential.
+        scope: The token scope.
+        refresh_margin: Seconds before expiry at which the token is refreshed.
+    """
+
+    def __init__(self, credential: Any, scope: str = AZURE_COGNITIVE_SCOPE, refresh_margin: float = 300.0) -> None:
+        self.credential = credential
+        self.scope = scope
+        self.refresh_margin = refresh_margin
+        self._token: Optional[str] = None
+        self._expires_on: float = 0.0
+        self._lock = threading.Lock()
+        self.fetches: int = 0
+
+    def __call__(self) -> str:
+        with self._lock:
+            if self._token is None or time.time() >= self._expires_on - self.refresh_margin:
+                access_token = self.credential.get_token(self.scope)
+                self._token = access_token.token
+                self._expires_on = float(access_token.expires_on)
+                self.fetches += 1
+            return self._token
+
+
+# Clients per event loop; None holds clients created outside a running loop
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[ClientKey, Any]]" = weakref.WeakKeyDictionary()
+_loopless_clients: Dict[ClientKey, Any] = {}
+_token_providers: Dict[Tuple[str, Optional[str]], CachedTokenProvider] = {}
+_lock = threading.Lock()
+_stats: Dict[str, int] = {"created": 0, "reused": 0, "closed": 0, "dropped": 0}
+
+
+def _credentials_hash(*parts: Optional[str]) -> str:
+    """Hash credentials so they can be part of a key without being stored in it."""
+    joined = "\0".join(part or "" for part in parts)
+    return hashlib.sha256(joined.encode("utf-8")).hexdigest()[:16]
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def _drop_closed_loops() -> None:
+    """
+    Forget the clients of event loops that have been closed (lock held). Their pools
+    cannot be closed cleanly any more; dropping them lets their sockets be released.
+    """
+    for loop in [loop for loop in _clients.keys() if loop.is_closed()]:
+        _stats["dropped"] += len(_clients.pop(loop, {}))
+
+
+def _http_client(settings: PoolSettings) -> httpx.AsyncClient:
+    import httpx
+
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=settings.max_connections,
+            max_keepalive_connections=settings.max_keepalive_connections,
+            keepalive_expiry=settings.keepalive_expiry,
+        ),
+        timeout=httpx.Timeout(settings.timeout, connect=settings.connect_timeout),
+    )
+
+
+def _get_or_create(key: ClientKey, factory: Callable[[], Any]) -> Any:
+    loop = _running_loop()
+    with _lock:
+        _drop_closed_loops()
+        if loop is None:
+            clients = _loopless_clients
+        else:
+            clients = _clients.get(loop)
+            if clients is None:
+                clients = _clients[loop] = {}
+        client = clients.get(key)
+        if client is not None and not client.is_closed():
+            _stats["reused"] += 1
+            return client
+        client = factory()
+        clients[key] = client
+        _stats["created"] += 1
+        return client
+
+
+def get_openai_client(
+    api_key: Optional[str],
+    base_url: Optional[str] = None,
+    settings: Optional[PoolSettings] = None,
+) -> AsyncOpenAI:
+    """
+    Return the shared AsyncOpenAI client for an endpoint and API key (OpenAI, Ollama
+    and other OpenAI-compatible endpoints).
+    """
+    from openai import AsyncOpenAI
+
+    settings = settings or PoolSettings()
+    key: ClientKey = ("openai", base_url or "", _credentials_hash(api_key), "", repr(settings))
+    return _get_or_create(
+        key,
+        lambda: AsyncOpenAI(api_key=api_key, base_url=base_url, http_client=_http_client(settings)),
+    )
+
+
+def get_azure_token_provider(kind: str = "default", client_id: Optional[str] = None) -> CachedTokenProvider:
+    """
+    Return the shared token provider for an Azure identity.
+
+    Args:
+        kind: "managed" for ManagedIdentityCredential, "default" for DefaultAzureCredential.
+        client_id: Optional user-assigned managed identity client id.
+    """
+    with _lock:
+        provider = _token_providers.get((kind, client_id))
+        if provider is not None:
+            return provider
+
+    from azure.identity import DefaultAzureCredential, ManagedIdentityCredential
+
+    if kind == "managed":
+        credential: Any = ManagedIdentityCredential(client_id=client_id)
+    elif client_id:
+        credential = DefaultAzureCredential(managed_identity_client_id=client_id)
+    else:
+        credential = DefaultAzureCredential()
+    provider = CachedTokenProvider(credential)
+    with _lock:
+        return _token_providers.setdefault((kind, client_id), provider)
+
+
+def get_azure_openai_client(
+    endpoint: str,
+    api_version: str,
+    api_key: Optional[str] = None,
+    token_provider: Optional[CachedTokenProvider] = None,
+    deployment: Optional[str] = None,
+    settings: Optional[PoolSettings] = None,
+) -> AsyncAzureOpenAI:
+    """
+    Return the shared AsyncAzureOpenAI client for an endpoint, API version, deployment
+    and credential (API key or token provider).
+    """
+    settings = settings or PoolSettings()
+    credentials = _credentials_hash(api_key, str(id(token_provider)) if token_provider else None)
+    key: ClientKey = (
+        "azure",
+        endpoint,
+        credentials,
+        api_version,
+        f"{deployment or ''}|{settings!r}",
+    )
+
+    def create() -> AsyncAzureOpenAI:
+        from openai import AsyncAzureOpenAI
+
+        kwargs: Dict[str, Any] = {
+            "azure_endpoint": endpoint,
+            "api_version": api_version,
+            "http_client": _http_client(settings),
+        }
+        if deployment:
+            kwargs["azure_deployment"] = deployment
+        if token_provider is not None:
+            kwargs["azure_ad_token_provider"] = token_provider
+        else:
+            kwargs["api_key"] = api_key
+        return AsyncAzureOpenAI(**kwargs)
+
+    return _get_or_create(key, create)
+
+
+def get_anthropic_client(api_key: Optional[str], settings: Optional[PoolSettings] = None) -> AsyncAnthropic:
+    """
+    Return the shared AsyncAnthropic client for an API key.
+    """
+    from anthropic import AsyncAnthropic
+
+    settings = settings or PoolSettings()
+    key: ClientKey = ("anthropic", "", _credentials_hash(api_key), "", repr(settings))
+    return _get_or_create(key, lambda: AsyncAnthropic(api_key=api_key, http_client=_http_client(settings)))
+
+
+async def close_clients() -> None:
+    """
+    Close every registered client and its connection pool. Safe to call repeatedly.
+    """
+    with _lock:
+        clients = [client for loop_clients in _clients.values() for client in loop_clients.values()]
+        clients.extend(_loopless_clients.values())
+        _clients.clear()
+        _loopless_clients.clear()
+    for client in clients:
+        try:
+            await client.close()
+        except Exception:
+            # Clients bound to an already closed event loop cannot be closed cleanly
+            pass
+        _stats["closed"] += 1
+
+
+def client_registry_stats() -> Dict[str, int]:
+    """
+    Return counters of created, reused, closed and dropped (left behind by a closed
+    event loop) clients, open clients and token fetches.
+    """
+    with _lock:
+        _drop_closed_loops()
+        return {
+            **_stats,
+            "open": sum(len(clients) for clients in _clients.values()) + len(_loopless_clients),
+            "token_fetches": sum(provider.fetches for provider in _token_providers.values()),
+        }
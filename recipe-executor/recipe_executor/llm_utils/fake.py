@@ -0,0 +1,317 @@
+# This file was generated by Codebase-Generator, do not edit directly
+"""
+Fake LLM provider for offline benchmarks and tests.
+
+`fake/<profile>` models answer without a network, so the orchestration cost of a
+recipe (templates, steps, concurrency controllers, retries, rate limits) can be
+measured without API keys or network noise. Answers are deterministic: the same
+prompt under the same profile always gets the same output. Plain text requests get
+`response_tokens` words; structured requests (`files`, object and list
+`output_format`s) get a value generated from the output schema, so it validates.
+
+A profile sets the latency distribution, token counts and the share of calls that
+fail (a 5xx response) or are throttled (429). Failures are drawn per attempt, so a
+retried call can succeed; they are raised as `ModelHTTPError`, like provider errors,
+and go through the same retry, circuit breaker and rate limiter handling.
+
+Built-in profiles are listed in BUILTIN_PROFILES; `llm_fake_profiles` in the
+configuration (`LLM_FAKE_PROFILES`, JSON) overrides their fields or
+defines new profiles, e.g. {"slow": {"base": "realistic", "latency_mean": 5}}.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import math
+import random
+import threading
+from typing import TYPE_CHECKING, Any, Dict, List, Literal, Mapping, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+if TYPE_CHECKING:
+    from pydantic_ai.messages import ModelMessage, ModelResponse
+    from pydantic_ai.models.function import AgentInfo, FunctionModel
+
+__all__ = ["BUILTIN_PROFILES", "FakeProfile", "fake_value", "get_fake_model", "get_fake_profile"]
+
+
+class FakeProfile(BaseModel):
+    """
+    Behavior of a fake model.
+
+    Attributes:
+        latency: Distribution of the base latency ("fixed", "uniform", "normal",
+            "lognormal" or "exponential").
+        latency_mean: Mean base latency in seconds.
+        latency_stddev: Standard deviation of the base latency in seconds.
+        latency_per_token: Seconds added per response token (generation speed).
+        response_tokens: Tokens (words) of a response, capped by `max_tokens`.
+        request_tokens: Tokens reported for the request (default: estimated from the prompt).
+        list_items: Number of items generated for arrays in structured output.
+        failure_rate: Share of calls failing with `failure_status`.
+        failure_status: HTTP status of injected failures.
+        throttle_rate: Share of calls rejected with 429.
+        seed: Seed mixed into every draw; change it to get other outputs and failures.
+    """
+
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
+    latency: Literal["fixed", "uniform", "normal", "lognormal", "exponential"] = "fixed"
+    latency_mean: float = Field(0.0, ge=0)
+    latency_stddev: float = Field(0.0, ge=0)
+    latency_per_token: float = Field(0.0, ge=0)
+    response_tokens: int = Field(200, ge=1)
+    request_tokens: Optional[int] = Field(None, ge=0)
+    list_items: int = Field(3, ge=0)
+    failure_rate: float = Field(0.0, ge=0, le=1)
+    failure_status: int = Field(503, ge=400, le=599)
+    throttle_rate: float = Field(0.0, ge=0, le=1)
+    seed: int = 0
+
+    def sample_latency(self, rng: random.Random) -> float:
+        """Draw a base latency in seconds (never negative)."""
+        mean, stddev = self.latency_mean, self.latency_stddev
+        if mean <= 0 or self.latency == "fixed":
+            return mean
+        if self.latency == "uniform":
+            # Same mean and standard deviation as the other distributions
+            half_width = stddev * math.sqrt(3)
+            value = rng.uniform(mean - half_width, mean + half_width)
+        elif self.latency == "normal":
+            value = rng.gauss(mean, stddev)
+        elif self.latency == "lognormal":
+            sigma = math.sqrt(math.log(1 + (stddev / mean) ** 2))
+            value = rng.lognormvariate(math.log(mean) - sigma**2 / 2, sigma)
+        else:
+            value = rng.expovariate(1 / mean)
+        return max(value, 0.0)
+
+
+# Profiles available as fake/<name>
+BUILTIN_PROFILES: Dict[str, FakeProfile] = {
+    # No latency and no failures: measures pure orchestration overhead
+    "instant": FakeProfile(),
+    "fast": FakeProfile(latency="lognormal", latency_mean=0.05, latency_stddev=0.02),
+    # Latency of a hosted model generating about 100 tokens per second
+    "realistic": FakeProfile(latency="lognormal", latency_mean=0.8, latency_stddev=0.4, latency_per_token=0.01),
+    # Realistic latencies with transient failures and rate limiting, for retries and controllers
+    "flaky": FakeProfile(
+        latency="lognormal",
+        latency_mean=0.8,
+        latency_stddev=0.4,
+        latency_per_token=0.01,
+        failure_rate=0.05,
+        throttle_rate=0.1,
+    ),
+}
+
+
+def get_fake_profile(name: str, config: Mapping[str, Any]) -> FakeProfile:
+    """
+    Return the profile `name`: a built-in profile, with the fields set for it in
+    `llm_fake_profiles` applied on top ("base" names the built-in profile a new one
+    starts from, "instant" by default).
+
+    Raises:
+        ValueError: If the profile is unknown or its settings are invalid.
+    """
+    overrides = config.get("llm_fake_profiles") or {}
+    if isinstance(overrides, str):
+        try:
+            overrides = json.loads(overrides)
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"Invalid llm_fake_profiles JSON: {exc}")
+    if not isinstance(overrides, Mapping):
+        raise ValueError("llm_fake_profiles must be a mapping of profile names to settings")
+
+    override = overrides.get(name)
+    if override is None:
+        profile = BUILTIN_PROFILES.get(name)
+        if profile is None:
+            available = ", ".join(sorted(set(BUILTIN_PROFILES) | set(overrides)))
+            raise ValueError(f"Unknown fake LLM profile '{name}'. Available profiles: {available}")
+        return profile
+    if not isinstance(override, Mapping):
+        raise ValueError(f"Settings of fake LLM profile '{name}' must be a mapping")
+
+    fields = dict(override)
+    base_name = fields.pop("base", name if name in BUILTIN_PROFILES else "instant")
+    base = BUILTIN_PROFILES.get(base_name)
+    if base is None:
+        raise ValueError(f"Unknown base profile '{base_name}' for fake LLM profile '{name}'")
+    try:
+        return FakeProfile.model_validate({**base.model_dump(), **fields})
+    except Exception as exc:
+        raise ValueError(f"Invalid settings for fake LLM profile '{name}': {exc}")
+
+
+# Calls seen per (profile, prompt), so each retry draws its failures anew
+_attempts: Dict[str, int] = {}
+_attempts_lock = threading.Lock()
+
+_WORDS = (
+    "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor incididunt ut labore et "
+    "dolore magna aliqua enim ad minim veniam quis nostrud exercitation ullamco laboris nisi aliquip ex ea "
+    "commodo consequat duis aute irure in reprehenderit voluptate velit esse cillum fugiat nulla pariatur"
+).split()
+
+# Property names whose strings get the response's token budget
+_LONG_TEXT_FIELDS = ("content", "text", "body", "markdown", "document", "summary", "description", "answer")
+
+
+def _next_attempt(key: str) -> int:
+    with _attempts_lock:
+        attempt = _attempts.get(key, 0)
+        _attempts[key] = attempt + 1
+        return attempt
+
+
+def _words(rng: random.Random, count: int) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(max(count, 1)))
+
+
+def _prompt_text(messages: List[ModelMessage]) -> str:
+    """Return the text of the requests sent to the model."""
+    from pydantic_ai.messages import ModelRequest
+
+    texts: List[str] = []
+    for message in messages:
+        if isinstance(message, ModelRequest):
+            for part in message.parts:
+                content = getattr(part, "content", None)
+                if isinstance(content, str):
+                    texts.append(content)
+    return "\n".join(texts)
+
+
+def fake_value(
+    schema: Mapping[str, Any],
+    rng: random.Random,
+    text_tokens: int = 200,
+    list_items: int = 3,
+    name: str = "",
+    defs: Optional[Mapping[str, Any]] = None,
+) -> Any:
+    """
+    Generate a value valid against a JSON schema (the subset pydantic produces):
+    objects get every property, arrays `list_items` items (within minItems/maxItems),
+    strings a few words, or `text_tokens` words for content-like properties and a
+    file path for path-like ones.
+    """
+    defs = defs if defs is not None else schema.get("$defs", {})
+    ref = schema.get("$ref")
+    if isinstance(ref, str):
+        return fake_value(defs.get(ref.rsplit("/", 1)[-1], {}), rng, text_tokens, list_items, name, defs)
+    if "const" in schema:
+        return schema["const"]
+    if schema.get("enum"):
+        return rng.choice(schema["enum"])
+    for combinator in ("anyOf", "oneOf", "allOf"):
+        options = schema.get(combinator)
+        if options:
+            # Prefer a non-null option (Optional fields)
+            chosen = next((o for o in options if o.get("type") != "null"), options[0])
+            return fake_value(chosen, rng, text_tokens, list_items, name, defs)
+    if "default" in schema and not schema.get("type"):
+        return schema["default"]
+
+    kind = schema.get("type")
+    if isinstance(kind, list):
+        kind = next((k for k in kind if k != "null"), "null")
+    if kind == "object" or (kind is None and "properties" in schema):
+        properties: Mapping[str, Any] = schema.get("properties", {})
+        return {
+            prop: fake_value(prop_schema, rng, text_tokens, list_items, prop, defs)
+            for prop, prop_schema in properties.items()
+        }
+    if kind == "array":
+        count = max(schema.get("minItems", 0), min(list_items, schema.get("maxItems", list_items)))
+        item_schema = schema.get("items", {})
+        item_name = name[:-1] if name.endswith("s") else name
+        return [fake_value(item_schema, rng, text_tokens, list_items, item_name, defs) for _ in range(count)]
+    if kind == "integer":
+        return rng.randint(int(schema.get("minimum", 0)), int(schema.get("maximum", 100)))
+    if kind == "number":
+        return round(rng.uniform(float(schema.get("minimum", 0)), float(schema.get("maximum", 100))), 3)
+    if kind == "boolean":
+        return rng.random() < 0.5
+    if kind == "null":
+        return None
+
+    # Strings (and schemas without a type)
+    lowered = name.lower()
+    if "path" in lowered or "file" in lowered:
+        text = f"generated/{rng.choice(_WORDS)}_{rng.randrange(1000)}.md"
+    elif any(field in lowered for field in _LONG_TEXT_FIELDS):
+        text = _words(rng, text_tokens)
+    else:
+        text = _words(rng, rng.randint(1, 4))
+    min_length = int(schema.get("minLength", 0))
+    if len(text) < min_length:
+        text = text + "x" * (min_length - len(text))
+    max_length = schema.get("maxLength")
+    if max_length is not None:
+        text = text[: int(max_length)]
+    return text
+
+
+def get_fake_model(profile_name: str, config: Mapping[str, Any]) -> FunctionModel:
+    """
+    Create a fake model for `fake/<profile_name>`.
+
+    Raises:
+        ValueError: If the profile is unknown or invalid.
+    """
+    from pydantic_ai.models.function import FunctionModel
+
+    profile = get_fake_profile(profile_name, config)
+    model_name = f"fake/{profile_name}"
+
+    async def respond(messages: List[ModelMessage], info: AgentInfo) -> ModelResponse:
+        from pydantic_ai.exceptions import ModelHTTPError
+        from pydantic_ai.messages import ModelResponse, TextPart, ToolCallPart
+        from pydantic_ai.usage import Usage
+
+        prompt = _prompt_text(messages)
+        output_tool = info.output_tools[0] if info.output_tools else None
+        schema = output_tool.parameters_json_schema if output_tool is not None else None
+        key = hashlib.sha256(
+            json.dumps([model_name, profile.seed, prompt, schema], sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()
+        attempt = _next_attempt(key)
+
+        settings = info.model_settings or {}
+        max_tokens = settings.get("max_tokens")
+        response_tokens = min(profile.response_tokens, max_tokens) if max_tokens else profile.response_tokens
+        request_tokens = profile.request_tokens if profile.request_tokens is not None else len(prompt) // 4
+
+        # Latency and failures vary per attempt; the output only depends on the request
+        rng = random.Random(f"{key}:{attempt}")
+        latency = profile.sample_latency(rng) + profile.latency_per_token * response_tokens
+        draw = rng.random()
+        if draw < profile.throttle_rate:
+            # Rate limited requests are rejected before any generation
+            await asyncio.sleep(min(latency, profile.latency_mean))
+            raise ModelHTTPError(429, model_name, {"error": "rate limit exceeded (injected)"})
+        await asyncio.sleep(latency)
+        if draw < profile.throttle_rate + profile.failure_rate:
+            raise ModelHTTPError(profile.failure_status, model_name, {"error": "server error (injected)"})
+
+        content_rng = random.Random(key)
+        if output_tool is not None:
+            args = fake_value(schema or {}, content_rng, response_tokens, profile.list_items)
+            parts: List[Any] = [ToolCallPart(tool_name=output_tool.name, args=args)]
+        else:
+            parts = [TextPart(content=_words(content_rng, response_tokens))]
+        usage = Usage(
+            requests=1,
+            request_tokens=request_tokens,
+            response_tokens=response_tokens,
+            total_tokens=request_tokens + response_tokens,
+        )
+        return ModelResponse(parts=parts, usage=usage)
+
+    return FunctionModel(respond, model_name=model_name)
@@ -1,34 +1,43 @@
 # This file was generated by Codebase-Generator, do not edit directly
+"""
+LLM calls through PydanticAI.
+
+The provider SDKs are heavy to import, so pydantic_ai, openai and anthropic are
+imported where a model is created (in the `get_model` branch of its provider) or
+an agent is run: steps that never call a model, and calls served from the result
+cache, do not pay for them.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
 import time
 import logging
-from typing import Optional, List, Type, Union, Dict, Any
+from typing import TYPE_CHECKING, Optional, List, Tuple, Type, Union, Dict, Any
 
 from pydantic import BaseModel
-from pydantic_ai import Agent
-from pydantic_ai.settings import ModelSettings
-from pydantic_ai.models.openai import (
-    OpenAIModel,
-    OpenAIResponsesModel,
-    OpenAIResponsesModelSettings,
-)
-from pydantic_ai.models.anthropic import AnthropicModel
-from pydantic_ai.providers.openai import OpenAIProvider
-from pydantic_ai.providers.anthropic import AnthropicProvider
-from pydantic_ai.mcp import MCPServer
-
-from openai.types.responses import WebSearchToolParam, FileSearchToolParam
-
-from recipe_executor.llm_utils.azure_openai import get_azure_openai_model
-from recipe_executor.llm_utils.responses import get_openai_responses_model
-from recipe_executor.llm_utils.azure_responses import get_azure_responses_model
+
+from recipe_executor.build_manifest import record_llm_call
+from recipe_executor.llm_utils.circuit_breaker import get_circuit_breaker
+from recipe_executor.llm_utils.clients import PoolSettings, get_anthropic_client, get_openai_client
+from recipe_executor.llm_utils.llm_cache import CACHE_MODES, LLMCache, get_llm_cache
+from recipe_executor.llm_utils.rate_limiter import estimate_tokens, get_rate_limiter
 from recipe_executor.protocols import ContextProtocol
+from recipe_executor.tracing import add_counter, trace_span
+
+if TYPE_CHECKING:
+    from pydantic_ai.mcp import MCPServer
+    from pydantic_ai.models.anthropic import AnthropicModel
+    from pydantic_ai.models.function import FunctionModel
+    from pydantic_ai.models.openai import OpenAIModel, OpenAIResponsesModel
 
 
 def get_model(
     model_id: str,
     context: ContextProtocol,
     logger: logging.Logger,
-) -> Union[OpenAIModel, AnthropicModel, OpenAIResponsesModel]:
+) -> Union[OpenAIModel, AnthropicModel, OpenAIResponsesModel, FunctionModel]:
     """
     Initialize an LLM model based on a standardized model_id string.
     Expected format: 'provider/model_name' or 'provider/model_name/deployment_name'.
@@ -40,6 +49,7 @@ def get_model(
     - ollama
     - openai_responses
     - azure_responses
+    - fake (offline, deterministic: 'fake/<profile>', see llm_utils.fake)
 
     Args:
         model_id (str): Model identifier in format 'provider/model_name'
@@ -59,14 +69,19 @@ def get_model(
 
     provider = parts[0].lower()
     config = context.get_config()
+    # Provider clients (and their connection pools) are shared across calls
+    pool_settings = PoolSettings.from_config(config)
 
     # OpenAI provider
     if provider == "openai":
         if len(parts) != 2:
             raise ValueError(f"Invalid OpenAI model_id: '{model_id}'")
+        from pydantic_ai.models.openai import OpenAIModel
+        from pydantic_ai.providers.openai import OpenAIProvider
+
         model_name = parts[1]
         api_key = config.get("openai_api_key")
-        provider_obj = OpenAIProvider(api_key=api_key)
+        provider_obj = OpenAIProvider(openai_client=get_openai_client(api_key, settings=pool_settings))
         return OpenAIModel(model_name=model_name, provider=provider_obj)
 
     # Azure OpenAI
@@ -77,11 +92,14 @@ def get_model(
             model_name, deployment = parts[1], parts[2]
         else:
             raise ValueError(f"Invalid Azure model_id: '{model_id}'")
+        from recipe_executor.llm_utils.azure_openai import get_azure_openai_model
+
         return get_azure_openai_model(
             logger=logger,
             model_name=model_name,
             deployment_name=deployment,
             context=context,
+            pool_settings=pool_settings,
         )
 
     # Anthropic provider
@@ -90,24 +108,37 @@ def get_model(
             raise ValueError(f"Invalid Anthropic model_id: '{model_id}'")
         model_name = parts[1]
         api_key = config.get("anthropic_api_key")
-        provider_obj = AnthropicProvider(api_key=api_key)
+        if not api_key:
+            raise ValueError("Missing anthropic_api_key in configuration")
+        from pydantic_ai.models.anthropic import AnthropicModel
+        from pydantic_ai.providers.anthropic import AnthropicProvider
+
+        provider_obj = AnthropicProvider(anthropic_client=get_anthropic_client(api_key, settings=pool_settings))
         return AnthropicModel(model_name=model_name, provider=provider_obj)
 
     # Ollama (OpenAI-compatible) provider
     if provider == "ollama":
         if len(parts) != 2:
             raise ValueError(f"Invalid Ollama model_id: '{model_id}'")
+        from pydantic_ai.models.openai import OpenAIModel
+        from pydantic_ai.providers.openai import OpenAIProvider
+
         model_name = parts[1]
         base_url = config.get("ollama_base_url") or "http://localhost:11434"
-        provider_obj = OpenAIProvider(base_url=f"{base_url}/v1")
+        # Ollama ignores the API key, but the OpenAI client requires one
+        api_key = os.environ.get("OPENAI_API_KEY") or "api-key-not-set"
+        openai_client = get_openai_client(api_key, base_url=f"{base_url}/v1", settings=pool_settings)
+        provider_obj = OpenAIProvider(openai_client=openai_client)
         return OpenAIModel(model_name=model_name, provider=provider_obj)
 
     # OpenAI Responses API
     if provider == "openai_responses":
         if len(parts) != 2:
             raise ValueError(f"Invalid OpenAI Responses model_id: '{model_id}'")
+        from recipe_executor.llm_utils.responses import get_openai_responses_model
+
         model_name = parts[1]
-        return get_openai_responses_model(logger, model_name)
+        return get_openai_responses_model(logger, model_name, pool_settings=pool_settings)
 
     # Azure Responses API
     if provider == "azure_responses":
@@ -117,7 +148,17 @@ def get_model(
             model_name, deployment = parts[1], parts[2]
         else:
             raise ValueError(f"Invalid Azure Responses model_id: '{model_id}'")
-        return get_azure_responses_model(logger, model_name, deployment)
+        from recipe_executor.llm_utils.azure_responses import get_azure_responses_model
+
+        return get_azure_responses_model(logger, model_name, deployment, pool_settings=pool_settings)
+
+    # Fake provider (no network, for benchmarks and tests)
+    if provider == "fake":
+        if len(parts) != 2:
+            raise ValueError(f"Invalid fake model_id: '{model_id}'")
+        from recipe_executor.llm_utils.fake import get_fake_model
+
+        return get_fake_model(parts[1], config)
 
     raise ValueError(f"Unsupported LLM provider: '{provider}' in model_id '{model_id}'")
 
@@ -150,6 +191,7 @@ class LLM:
         output_type: Type[Union[str, BaseModel]] = str,
         mcp_servers: Optional[List[MCPServer]] = None,
         openai_builtin_tools: Optional[List[Dict[str, Any]]] = None,
+        cache: Optional[str] = None,
     ) -> Union[str, BaseModel]:
         """
         Generate an output from the LLM based on the provided prompt.
@@ -161,18 +203,38 @@ class LLM:
             output_type: Desired return type (str or BaseModel).
             mcp_servers: Optional MCP servers override.
             openai_builtin_tools: Optional built-in tools for Responses API.
+            cache: Result cache mode when `llm_cache_dir` is configured: "read" (default)
+                serves cached results and stores new ones, "write" always calls the model
+                and refreshes the entry, "off" bypasses the cache.
 
         Returns:
             The model output as plain text or structured data.
 
         Raises:
-            ValueError: Invalid model identifier.
+            ValueError: Invalid model identifier or cache mode.
             Exception: On network, API, or MCP errors.
         """
         model_id = model or self.default_model_id
         tokens = max_tokens if max_tokens is not None else self.default_max_tokens
         servers = mcp_servers if mcp_servers is not None else self.default_mcp_servers
+        record_llm_call(model_id, prompt)
 
+        with trace_span(f"llm {model_id}", "llm", model=model_id):
+            return await self._generate(prompt, model_id, tokens, output_type, servers, openai_builtin_tools, cache)
+
+    async def _generate(
+        self,
+        prompt: str,
+        model_id: str,
+        tokens: Optional[int],
+        output_type: Type[Union[str, BaseModel]],
+        servers: List[MCPServer],
+        openai_builtin_tools: Optional[List[Dict[str, Any]]],
+        cache: Optional[str],
+    ) -> Union[str, BaseModel]:
+        """
+        Serve the call from the result cache or run it against the model.
+        """
         provider_name = model_id.split("/", 1)[0]
         self.logger.info(
             "LLM generate using provider=%s model_id=%s",
@@ -190,12 +252,32 @@ class LLM:
             [type(s).__name__ for s in servers],
         )
 
+        llm_cache, cache_key = self._get_cache(
+            cache, model_id, prompt, output_type, tokens, servers, openai_builtin_tools
+        )
+        if llm_cache is not None and cache_key is not None and (cache or "read") == "read":
+            # Cache reads and writes do file I/O: keep it off the event loop
+            cached = await asyncio.to_thread(llm_cache.get, cache_key, output_type)
+            if cached is not None:
+                self.logger.info(
+                    "LLM cache hit model_id=%s key=%s saved_tokens=%d saved_time=%.3f sec",
+                    model_id,
+                    cache_key[:12],
+                    cached.total_tokens,
+                    cached.duration,
+                )
+                add_counter("cached_tokens", cached.total_tokens)
+                return cached.output
+
         try:
             model_instance = get_model(model_id, self.context, self.logger)
         except ValueError as err:
             self.logger.error("Invalid model_id '%s': %s", model_id, err)
             raise
 
+        from pydantic_ai import Agent
+        from pydantic_ai.settings import ModelSettings
+
         agent_kwargs: Dict[str, Any] = {
             "model": model_instance,
             "output_type": output_type,
@@ -204,6 +286,9 @@ class LLM:
 
         # Configure built-in tools for Responses API
         if provider_name in ("openai_responses", "azure_responses") and openai_builtin_tools:
+            from openai.types.responses import FileSearchToolParam, WebSearchToolParam
+            from pydantic_ai.models.openai import OpenAIResponsesModelSettings
+
             typed_tools: List[Union[WebSearchToolParam, FileSearchToolParam]] = []
             for tool in openai_builtin_tools:
                 try:
@@ -218,18 +303,41 @@ class LLM:
 
         agent: Agent = Agent(**agent_kwargs)  # type: ignore
 
-        start = time.time()
+        # Every call passes through the process-wide circuit breaker and limiter of its
+        # provider/deployment; an open circuit fails fast while the provider is down
+        config = self.context.get_config()
+        breaker = get_circuit_breaker(model_id, config)
+        ticket = breaker.before_call()
+        limiter = get_rate_limiter(model_id, config)
         try:
-            async with agent.run_mcp_servers():
-                result = await agent.run(prompt)
+            async with limiter.acquire(estimate_tokens(prompt, tokens)) as permit:
+                if permit.waited >= 1.0:
+                    self.logger.info("LLM call for %s waited %.3f sec for rate limits", limiter.key, permit.waited)
+                start = time.time()
+                try:
+                    async with agent.run_mcp_servers():
+                        result = await agent.run(prompt)
+                except Exception as err:
+                    permit.observe_error(err)
+                    self.logger.error(
+                        "LLM call failed model_id=%s error=%s",
+                        model_id,
+                        err,
+                    )
+                    raise
+                end = time.time()
+                try:
+                    permit.record_usage(result.usage().total_tokens)
+                except Exception:
+                    pass
         except Exception as err:
-            self.logger.error(
-                "LLM call failed model_id=%s error=%s",
-                model_id,
-                err,
-            )
+            breaker.record_failure(err, ticket)
             raise
-        end = time.time()
+        except BaseException:
+            # Cancelled: the call says nothing about the provider's health
+            breaker.abandon(ticket)
+            raise
+        breaker.record_success(ticket)
 
         duration = end - start
         try:
@@ -238,6 +346,9 @@ class LLM:
             usage = None
 
         if usage:
+            add_counter("tokens", usage.total_tokens or 0)
+            add_counter("request_tokens", usage.request_tokens or 0)
+            add_counter("response_tokens", usage.response_tokens or 0)
             self.logger.info(
                 "LLM result time=%.3f sec requests=%d tokens_total=%d (req=%d res=%d)",
                 duration,
@@ -254,4 +365,57 @@ class LLM:
 
         self.logger.debug("LLM raw result data=%r", result.data)
 
+        if llm_cache is not None and cache_key is not None:
+            usage_data: Dict[str, int] = {}
+            if usage:
+                usage_data = {
+                    "requests": usage.requests,
+                    "request_tokens": usage.request_tokens or 0,
+                    "response_tokens": usage.response_tokens or 0,
+                    "total_tokens": usage.total_tokens or 0,
+                }
+            try:
+                await asyncio.to_thread(
+                    llm_cache.put, cache_key, model_id, result.output, usage=usage_data, duration=duration
+                )
+            except OSError as err:
+                self.logger.warning("Failed to store LLM result in cache %s: %s", llm_cache.directory, err)
+
         return result.output
+
+    def _get_cache(
+        self,
+        mode: Optional[str],
+        model_id: str,
+        prompt: str,
+        output_type: Type[Union[str, BaseModel]],
+        max_tokens: Optional[int],
+        servers: List[MCPServer],
+        openai_builtin_tools: Optional[List[Dict[str, Any]]],
+    ) -> Tuple[Optional[LLMCache], Optional[str]]:
+        """
+        Return the result cache and entry key for this call, or (None, None) when
+        caching is not configured, turned off, or not safe for the call.
+        """
+        mode = mode or "read"
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Invalid cache mode '{mode}'. Expected one of: {', '.join(CACHE_MODES)}")
+
+        config = self.context.get_config()
+        cache_dir = config.get("llm_cache_dir")
+        if not cache_dir or mode == "off":
+            return None, None
+        if servers:
+            # MCP tools can have side effects and return changing data
+            self.logger.debug("LLM cache bypassed for model_id=%s: MCP servers in use", model_id)
+            return None, None
+
+        raw_max_bytes = config.get("llm_cache_max_bytes")
+        try:
+            max_bytes = int(raw_max_bytes) if raw_max_bytes else None
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid llm_cache_max_bytes value: {raw_max_bytes!r}")
+
+        llm_cache = get_llm_cache(str(cache_dir), max_bytes)
+        key = LLMCache.make_key(model_id, prompt, output_type, max_tokens, openai_builtin_tools)
+        return llm_cache, key
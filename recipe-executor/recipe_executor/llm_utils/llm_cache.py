@@ -0,0 +1,304 @@
+# This file was generated by Codebase-Generator, do not edit directly
+"""
+Persistent, content-addressed cache for LLM results.
+
+Entries are keyed by a SHA-256 hash of everything that determines the model output
+(model id, rendered prompt, output schema, tools and max_tokens) and stored as one
+JSON file per entry under the cache directory. The directory is bounded by a byte
+budget: the least recently used entries (by file modification time, refreshed on
+every hit) are evicted first. Text and structured (Pydantic) outputs round-trip
+through JSON and are re-validated against the requested output type on read.
+
+The directory is scanned once per process; an index of entry sizes and access times
+is then kept up to date by reads, writes and evictions. `get` and `put` do blocking
+file I/O: async callers run them in a worker thread (`asyncio.to_thread`).
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple, Type, Union
+
+from pydantic import BaseModel
+
+__all__ = [
+    "CACHE_MODES",
+    "DEFAULT_LLM_CACHE_MAX_BYTES",
+    "CachedResult",
+    "LLMCache",
+    "get_llm_cache",
+    "llm_cache_stats",
+]
+
+# Per-call cache modes:
+# - "read": return cached results when present, store new results (read-through)
+# - "write": always call the model and refresh the stored result
+# - "off": bypass the cache entirely
+CACHE_MODES = ("read", "write", "off")
+
+DEFAULT_LLM_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+# Bump when the entry format changes so stale entries are ignored
+_FORMAT_VERSION = 1
+
+
+@dataclass
+class CachedResult:
+    """A result served from the cache, with the cost of the original call."""
+
+    output: Union[str, BaseModel]
+    total_tokens: int
+    duration: float
+
+
+def _schema_of(output_type: Type[Union[str, BaseModel]]) -> Any:
+    if isinstance(output_type, type) and issubclass(output_type, BaseModel):
+        return output_type.model_json_schema()
+    return getattr(output_type, "__name__", str(output_type))
+
+
+class LLMCache:
+    """
+    On-disk LLM result cache bounded by a byte budget.
+
+    Args:
+        directory: Directory holding the cache entries (created on demand).
+        max_bytes: Maximum total size of the entries on disk.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_LLM_CACHE_MAX_BYTES) -> None:
+        self.directory: str = os.path.abspath(directory)
+        self.max_bytes: int = max_bytes
+        self._lock = threading.Lock()
+        # path -> (last access time, size) of every entry, loaded on first use
+        self._index: Optional[Dict[str, Tuple[float, int]]] = None
+        self._total_bytes: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self.writes: int = 0
+        self.evictions: int = 0
+        self.saved_tokens: int = 0
+        self.saved_seconds: float = 0.0
+
+    @staticmethod
+    def make_key(
+        model_id: str,
+        prompt: str,
+        output_type: Type[Union[str, BaseModel]],
+        max_tokens: Optional[int] = None,
+        tools: Optional[List[Dict[str, Any]]] = None,
+    ) -> str:
+        """
+        Return the content hash identifying a model call.
+        """
+        payload = {
+            "version": _FORMAT_VERSION,
+            "model": model_id,
+            "prompt": prompt,
+            "schema": _schema_of(output_type),
+            "max_tokens": max_tokens,
+            "tools": tools or [],
+        }
+        encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def get(self, key: str, output_type: Type[Union[str, BaseModel]]) -> Optional[CachedResult]:
+        """
+        Return the cached result for key, or None on a miss. Entries that no longer
+        validate against output_type are treated as misses.
+        """
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+            raw = entry["output"]
+            if isinstance(output_type, type) and issubclass(output_type, BaseModel):
+                output: Union[str, BaseModel] = output_type.model_validate(raw)
+            elif isinstance(raw, str):
+                output = raw
+            else:
+                raise ValueError("Cached output is not text")
+        except Exception:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        try:
+            # Refresh the modification time: eviction is least recently used first
+            os.utime(path)
+        except OSError:
+            pass
+
+        total_tokens = int(entry.get("usage", {}).get("total_tokens") or 0)
+        duration = float(entry.get("duration") or 0.0)
+        with self._lock:
+            if self._index is not None and path in self._index:
+                self._index[path] = (time.time(), self._index[path][1])
+            self.hits += 1
+            self.saved_tokens += total_tokens
+            self.saved_seconds += duration
+        return CachedResult(output=output, total_tokens=total_tokens, duration=duration)
+
+    def put(
+        self,
+        key: str,
+        model_id: str,
+        output: Union[str, BaseModel],
+        usage: Optional[Dict[str, int]] = None,
+        duration: float = 0.0,
+    ) -> None:
+        """
+        Store a result atomically and evict old entries if the cache is over budget.
+        """
+        entry = {
+            "version": _FORMAT_VERSION,
+            "model": model_id,
+            "output": output.model_dump(mode="json") if isinstance(output, BaseModel) else output,
+            "usage": usage or {},
+            "duration": duration,
+            "created": time.time(),
+        }
+        data = json.dumps(entry, ensure_ascii=False).encode("utf-8")
+        if len(data) > self.max_bytes:
+            return
+
+        with self._lock:
+            # Index the existing entries before adding a new one
+            self._load_index()
+
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-", suffix=".json")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+        with self._lock:
+            self.writes += 1
+            index = self._load_index()
+            previous = index.get(path)
+            index[path] = (time.time(), len(data))
+            self._total_bytes += len(data) - (previous[1] if previous is not None else 0)
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _entries(self) -> List[Tuple[float, int, str]]:
+        """
+        Return (mtime, size, path) for every entry on disk.
+        """
+        entries: List[Tuple[float, int, str]] = []
+        if not os.path.isdir(self.directory):
+            return entries
+        for root, _dirs, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith(".json") or name.startswith(".tmp-"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _load_index(self) -> Dict[str, Tuple[float, int]]:
+        """
+        Return the entry index, scanning the directory the first time (lock held).
+        """
+        if self._index is None:
+            self._index = {path: (mtime, size) for mtime, size, path in self._entries()}
+            self._total_bytes = sum(size for _mtime, size in self._index.values())
+        return self._index
+
+    def _evict(self) -> None:
+        """
+        Delete the least recently used entries down to 90% of the budget, so that
+        eviction does not run on every write (lock held).
+        """
+        target = int(self.max_bytes * 0.9)
+        index = self._load_index()
+        for path, (_atime, size) in sorted(index.items(), key=lambda item: item[1][0]):
+            if self._total_bytes <= target:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            except OSError:
+                continue
+            del index[path]
+            self._total_bytes -= size
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """
+        Delete every entry in the cache directory. Counters are preserved.
+        """
+        with self._lock:
+            for _mtime, _size, path in self._entries():
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+            self._index = {}
+            self._total_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return a snapshot of the cache counters and occupancy.
+        """
+        with self._lock:
+            self._load_index()
+            return {
+                "directory": self.directory,
+                "bytes": self._total_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "writes": self.writes,
+                "evictions": self.evictions,
+                "saved_tokens": self.saved_tokens,
+                "saved_seconds": round(self.saved_seconds, 3),
+            }
+
+
+# Process-wide caches, one per directory, so statistics accumulate across steps
+_caches: Dict[str, LLMCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_llm_cache(directory: str, max_bytes: Optional[int] = None) -> LLMCache:
+    """
+    Return the shared cache for a directory, creating it on first use.
+    """
+    real_dir = os.path.abspath(directory)
+    with _caches_lock:
+        cache = _caches.get(real_dir)
+        if cache is None:
+            cache = LLMCache(real_dir, max_bytes or DEFAULT_LLM_CACHE_MAX_BYTES)
+            _caches[real_dir] = cache
+        elif max_bytes:
+            cache.max_bytes = max_bytes
+        return cache
+
+
+def llm_cache_stats() -> List[Dict[str, Any]]:
+    """
+    Return the statistics of every LLM cache used in this process.
+    """
+    with _caches_lock:
+        caches = list(_caches.values())
+    return [cache.stats() for cache in caches]
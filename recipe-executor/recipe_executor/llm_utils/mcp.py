@@ -3,11 +3,14 @@
 Utilities for creating MCP server clients based on configuration.
 """
 
+from __future__ import annotations
+
 import os
 import logging
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
-from pydantic_ai.mcp import MCPServer, MCPServerHTTP, MCPServerStdio
+if TYPE_CHECKING:
+    from pydantic_ai.mcp import MCPServer
 
 # Optional .env support
 try:
@@ -49,6 +52,9 @@ def get_mcp_server(logger: logging.Logger, config: Dict[str, Any]) -> MCPServer:
             masked[key] = value
     logger.debug("MCP server configuration: %s", masked)
 
+    # Imported on first use: pydantic_ai is only needed once a server is configured
+    from pydantic_ai.mcp import MCPServerHTTP, MCPServerStdio
+
     # HTTP transport
     if "url" in config:
         url = config.get("url")
@@ -0,0 +1,438 @@
+# This file was generated by Codebase-Generator, do not edit directly
+"""
+Process-wide rate limiter and concurrency governor for LLM calls.
+
+Step-level `max_concurrency` settings multiply across nested loops and parallel
+steps, so nothing bounds the total load on one provider deployment. Every
+`LLM.generate` call passes through the limiter of its provider/deployment, which
+enforces requests-per-minute and tokens-per-minute token buckets and an optional
+cap on in-flight requests. Waiters are served first-come first-served, so
+concurrent recipes sharing a deployment queue fairly. Rate-limit responses
+(`retry-after`, `x-ratelimit-*` headers) pause the whole deployment until the
+provider's limit resets. They are also reported to the adaptive concurrency
+controller of the step making the call.
+"""
+
+import asyncio
+import json
+import re
+import threading
+import time
+import weakref
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Mapping, Optional, Tuple
+
+from recipe_executor.concurrency import record_throttled
+
+__all__ = [
+    "TokenBucket",
+    "RateLimit",
+    "ProviderLimiter",
+    "limiter_key",
+    "get_rate_limiter",
+    "rate_limiter_stats",
+    "estimate_tokens",
+]
+
+# Rough characters-per-token ratio used to estimate prompt tokens before a call
+_CHARS_PER_TOKEN = 4
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+
+
+class TokenBucket:
+    """
+    Continuously refilling token bucket holding at most one minute of budget.
+
+    Args:
+        per_minute: Budget replenished every minute.
+    """
+
+    def __init__(self, per_minute: float) -> None:
+        self.capacity: float = float(per_minute)
+        self.rate: float = self.capacity / 60.0
+        self.available: float = self.capacity
+        self.updated: float = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.available = min(self.capacity, self.available + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self, amount: float) -> float:
+        """
+        Return the seconds to wait until `amount` can be taken (0 if available now).
+        Requests larger than the bucket only wait for a full bucket.
+        """
+        now = time.monotonic()
+        self._refill(now)
+        needed = min(amount, self.capacity)
+        if self.available >= needed:
+            return 0.0
+        return (needed - self.available) / self.rate
+
+    def take(self, amount: float) -> None:
+        self._refill(time.monotonic())
+        self.available -= min(amount, self.capacity)
+
+    def give_back(self, amount: float) -> None:
+        """Return unused budget (or take more when amount is negative)."""
+        self._refill(time.monotonic())
+        self.available = min(self.capacity, self.available + amount)
+
+    def drain(self) -> None:
+        """Empty the bucket, e.g. when the provider reports the limit is exhausted."""
+        self._refill(time.monotonic())
+        self.available = min(self.available, 0.0)
+
+
+class RateLimit:
+    """
+    Limits of one provider/deployment. None means unlimited.
+
+    Args:
+        requests_per_minute: Maximum requests started per minute.
+        tokens_per_minute: Maximum (estimated) tokens per minute.
+        max_concurrent: Maximum requests in flight.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        max_concurrent: Optional[int] = None,
+    ) -> None:
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.max_concurrent = max_concurrent
+
+    @classmethod
+    def from_config(cls, config: Mapping[str, Any], key: str) -> "RateLimit":
+        """
+        Build the limits for `key` from context configuration.
+
+        Defaults come from `llm_requests_per_minute`, `llm_tokens_per_minute` and
+        `llm_max_concurrent_requests`; `llm_rate_limits` maps provider/deployment keys
+        (or bare providers) to overrides with `rpm`, `tpm` and `concurrency` fields.
+
+        Raises:
+            ValueError: If a limit is not a positive number.
+        """
+        values: Dict[str, Any] = {
+            "rpm": config.get("llm_requests_per_minute"),
+            "tpm": config.get("llm_tokens_per_minute"),
+            "concurrency": config.get("llm_max_concurrent_requests"),
+        }
+        overrides = config.get("llm_rate_limits") or {}
+        if isinstance(overrides, str):
+            try:
+                overrides = json.loads(overrides)
+            except json.JSONDecodeError as exc:
+                raise ValueError(f"Invalid llm_rate_limits JSON: {exc}")
+        if not isinstance(overrides, Mapping):
+            raise ValueError("llm_rate_limits must be a mapping of provider/deployment to limits")
+        provider = key.split("/", 1)[0]
+        for override_key in (provider, key):
+            override = overrides.get(override_key)
+            if isinstance(override, Mapping):
+                values.update({name: override[name] for name in ("rpm", "tpm", "concurrency") if name in override})
+
+        def positive(name: str, cast: Any) -> Any:
+            raw = values[name]
+            if raw is None or raw == "" or raw == 0 or raw == "0":
+                return None
+            try:
+                value = cast(raw)
+            except (TypeError, ValueError):
+                raise ValueError(f"Invalid {name} rate limit for '{key}': {raw!r}")
+            if value <= 0:
+                raise ValueError(f"Invalid {name} rate limit for '{key}': {raw!r}")
+            return value
+
+        return cls(positive("rpm", float), positive("tpm", float), positive("concurrency", int))
+
+    def as_tuple(self) -> Tuple[Optional[float], Optional[float], Optional[int]]:
+        return (self.requests_per_minute, self.tokens_per_minute, self.max_concurrent)
+
+
+class _LoopGate:
+    """Waiting queue and concurrency slots of a limiter in one event loop."""
+
+    def __init__(self, max_concurrent: Optional[int]) -> None:
+        self.queue_lock = asyncio.Lock()  # FIFO: waiters are served in arrival order
+        self.slots = asyncio.Semaphore(max_concurrent) if max_concurrent else None
+
+
+class ProviderLimiter:
+    """
+    Rate limiter and concurrency governor of one provider/deployment.
+
+    The rate budget (token buckets and pauses requested by the provider) and the
+    metrics are process-wide and shared by every event loop; asyncio primitives
+    cannot be, so each loop waits in its own FIFO queue and holds its own
+    concurrency slots. Those are registered per loop object (weakly) and dropped
+    once the loop is closed, so applications running `asyncio.run` per request do
+    not accumulate them.
+
+    Args:
+        key: The provider/deployment key (e.g. "azure/gpt-4o").
+        limit: The limits to enforce.
+    """
+
+    def __init__(self, key: str, limit: RateLimit) -> None:
+        self.key = key
+        self._lock = threading.Lock()
+        self._gates: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopGate]" = weakref.WeakKeyDictionary()
+        self._blocked_until: float = 0.0
+        self.limit = limit
+        self._configure(limit)
+        # Metrics
+        self.requests: int = 0
+        self.queue_depth: int = 0
+        self.max_queue_depth: int = 0
+        self.in_flight: int = 0
+        self.total_wait: float = 0.0
+        self.max_wait: float = 0.0
+        self.throttled: int = 0
+
+    def _configure(self, limit: RateLimit) -> None:
+        self.limit = limit
+        self._requests = TokenBucket(limit.requests_per_minute) if limit.requests_per_minute else None
+        self._tokens = TokenBucket(limit.tokens_per_minute) if limit.tokens_per_minute else None
+        # Gates are recreated with the new concurrency limit
+        self._gates.clear()
+
+    def reconfigure(self, limit: RateLimit) -> None:
+        """
+        Apply new limits. Ignored while requests are queued or in flight.
+        """
+        with self._lock:
+            if limit.as_tuple() == self.limit.as_tuple() or self.queue_depth or self.in_flight:
+                return
+            self._configure(limit)
+
+    def _gate(self) -> _LoopGate:
+        """Return the gate of the running event loop, forgetting the gates of closed loops."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            gate = self._gates.get(loop)
+            if gate is None:
+                for closed in [other for other in self._gates.keys() if other.is_closed()]:
+                    del self._gates[closed]
+                gate = self._gates[loop] = _LoopGate(self.limit.max_concurrent)
+            return gate
+
+    def _reserve(self, estimated_tokens: int) -> float:
+        """
+        Take one request and the estimated tokens from the buckets if they are
+        available and the deployment is not paused; otherwise return the seconds to wait.
+        """
+        with self._lock:
+            delay = self._blocked_until - time.monotonic()
+            if self._requests is not None:
+                delay = max(delay, self._requests.delay(1))
+            if self._tokens is not None:
+                delay = max(delay, self._tokens.delay(estimated_tokens))
+            if delay > 0:
+                return delay
+            if self._requests is not None:
+                self._requests.take(1)
+            if self._tokens is not None:
+                self._tokens.take(estimated_tokens)
+            return 0.0
+
+    @asynccontextmanager
+    async def acquire(self, estimated_tokens: int = 0) -> AsyncIterator["_Permit"]:
+        """
+        Wait for a request slot and rate budget, then hold a concurrency slot for the
+        duration of the block. Report actual usage through the yielded permit.
+        """
+        gate = self._gate()
+        start = time.monotonic()
+        with self._lock:
+            self.queue_depth += 1
+            self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        slots = gate.slots
+        acquired_slot = False
+        try:
+            async with gate.queue_lock:
+                while True:
+                    delay = self._reserve(estimated_tokens)
+                    if delay <= 0:
+                        break
+                    await asyncio.sleep(delay)
+            if slots is not None:
+                await slots.acquire()
+                acquired_slot = True
+        finally:
+            with self._lock:
+                self.queue_depth -= 1
+        waited = time.monotonic() - start
+        with self._lock:
+            self.requests += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+            self.in_flight += 1
+
+        permit = _Permit(self, estimated_tokens, waited)
+        try:
+            yield permit
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+                if permit.actual_tokens is not None and self._tokens is not None:
+                    self._tokens.give_back(estimated_tokens - permit.actual_tokens)
+            if acquired_slot and slots is not None:
+                slots.release()
+
+    def observe(self, headers: Mapping[str, str], status_code: Optional[int] = None) -> None:
+        """
+        Adapt to a provider response: pause on `retry-after` or exhausted
+        `x-ratelimit-remaining-*` headers.
+        """
+        lowered = {str(name).lower(): str(value) for name, value in headers.items()}
+        pause = 0.0
+        if "retry-after-ms" in lowered:
+            pause = max(pause, _parse_seconds(lowered["retry-after-ms"]) / 1000.0)
+        elif "retry-after" in lowered:
+            pause = max(pause, _parse_seconds(lowered["retry-after"]))
+        with self._lock:
+            for kind, bucket in (("requests", self._requests), ("tokens", self._tokens)):
+                remaining = lowered.get(f"x-ratelimit-remaining-{kind}")
+                if remaining is None or _parse_seconds(remaining) > 0:
+                    continue
+                if bucket is not None:
+                    bucket.drain()
+                reset = lowered.get(f"x-ratelimit-reset-{kind}")
+                if reset is not None:
+                    pause = max(pause, _parse_seconds(reset))
+            if status_code == 429:
+                self.throttled += 1
+                if pause <= 0:
+                    # No hint from the provider: back off for a second
+                    pause = 1.0
+            if pause > 0:
+                self._blocked_until = max(self._blocked_until, time.monotonic() + pause)
+        if status_code == 429:
+            record_throttled()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return the limiter metrics.
+        """
+        with self._lock:
+            return {
+                "key": self.key,
+                "requests": self.requests,
+                "queue_depth": self.queue_depth,
+                "max_queue_depth": self.max_queue_depth,
+                "in_flight": self.in_flight,
+                "total_wait_seconds": round(self.total_wait, 3),
+                "max_wait_seconds": round(self.max_wait, 3),
+                "throttled": self.throttled,
+            }
+
+
+class _Permit:
+    """Handle of an admitted request; records the actual token usage."""
+
+    def __init__(self, limiter: ProviderLimiter, estimated_tokens: int, waited: float) -> None:
+        self.limiter = limiter
+        self.estimated_tokens = estimated_tokens
+        self.waited = waited
+        self.actual_tokens: Optional[int] = None
+
+    def record_usage(self, total_tokens: Optional[int]) -> None:
+        if total_tokens:
+            self.actual_tokens = total_tokens
+
+    def observe_error(self, error: BaseException) -> None:
+        """
+        Adapt to the HTTP response behind a failed call, if there is one.
+        """
+        status_code, headers = _error_response(error)
+        if status_code is not None or headers:
+            self.limiter.observe(headers or {}, status_code)
+
+
+def _parse_seconds(value: str) -> float:
+    """
+    Parse a number of seconds or a duration such as "1s", "6m0s" or "250ms".
+    Unparseable values (e.g. HTTP dates) count as zero.
+    """
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return 0.0
+    scale = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+    return sum(float(number) * scale[unit] for number, unit in parts)
+
+
+def _error_response(error: BaseException) -> Tuple[Optional[int], Optional[Mapping[str, str]]]:
+    """
+    Find the status code and headers of the HTTP response behind an error raised by
+    PydanticAI (which chains the SDK error as its cause).
+    """
+    seen: List[BaseException] = []
+    current: Optional[BaseException] = error
+    status_code: Optional[int] = None
+    while current is not None and current not in seen:
+        seen.append(current)
+        status_code = status_code or getattr(current, "status_code", None)
+        response = getattr(current, "response", None)
+        headers = getattr(response, "headers", None)
+        if headers is not None:
+            return status_code or getattr(response, "status_code", None), headers
+        current = current.__cause__ or current.__context__
+    return status_code, None
+
+
+def estimate_tokens(prompt: str, max_tokens: Optional[int] = None) -> int:
+    """
+    Estimate the tokens a call consumes against a tokens-per-minute limit: the prompt
+    (about four characters per token) plus the requested completion budget.
+    """
+    return len(prompt) // _CHARS_PER_TOKEN + (max_tokens or 0)
+
+
+def limiter_key(model_id: str) -> str:
+    """
+    Return the provider/deployment key of a model id ("azure/gpt-4o/my-deployment"
+    becomes "azure/my-deployment").
+    """
+    parts = model_id.split("/")
+    return f"{parts[0].lower()}/{parts[-1]}"
+
+
+# One limiter per provider/deployment for the whole process (see ProviderLimiter)
+_limiters: Dict[str, ProviderLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(model_id: str, config: Mapping[str, Any]) -> ProviderLimiter:
+    """
+    Return the shared limiter for the provider/deployment of a model id, creating it
+    with the limits from config on first use.
+    """
+    key = limiter_key(model_id)
+    limit = RateLimit.from_config(config, key)
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            limiter = ProviderLimiter(key, limit)
+            _limiters[key] = limiter
+        else:
+            limiter.reconfigure(limit)
+        return limiter
+
+
+def rate_limiter_stats() -> List[Dict[str, Any]]:
+    """
+    Return the metrics of every limiter used in this process.
+    """
+    with _limiters_lock:
+        limiters = list(_limiters.values())
+    return [limiter.stats() for limiter in limiters]
@@ -9,11 +9,15 @@ import os
 from typing import Optional
 
 from pydantic_ai.models.openai import OpenAIResponsesModel
+from pydantic_ai.providers.openai import OpenAIProvider
+
+from recipe_executor.llm_utils.clients import PoolSettings, get_openai_client
 
 
 def get_openai_responses_model(
     logger: logging.Logger,
     model_name: Optional[str] = None,
+    pool_settings: Optional[PoolSettings] = None,
 ) -> OpenAIResponsesModel:
     """
     Create and return an OpenAIResponsesModel configured for built-in tool usage.
@@ -22,6 +26,7 @@ def get_openai_responses_model(
         logger (logging.Logger): Logger for debug and info messages.
         model_name (Optional[str]): Specific model name to use (e.g., "gpt-4o").
             If not provided, DEFAULT_MODEL environment variable will be used.
+        pool_settings (Optional[PoolSettings]): Connection pool limits for the shared client.
 
     Returns:
         OpenAIResponsesModel: Configured PydanticAI OpenAIResponsesModel instance.
@@ -64,7 +69,8 @@ def get_openai_responses_model(
 
     # Instantiate the model
     try:
-        return OpenAIResponsesModel(chosen_model)
+        openai_client = get_openai_client(api_key, settings=pool_settings)
+        return OpenAIResponsesModel(chosen_model, provider=OpenAIProvider(openai_client=openai_client))
     except Exception as e:
         logger.error(
             "Failed to create OpenAIResponsesModel for model %s: %s",
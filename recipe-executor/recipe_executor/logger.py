@@ -2,25 +2,323 @@
 """
 Logger component for the Recipe Executor tool.
 Provides a consistent logging interface that writes to stdout and separate log files for DEBUG, INFO, and ERROR levels.
+
+Logging never writes on the caller's thread: the root logger gets a single queue
+handler, and a background thread passes records to the log files and stdout. Each
+`init_logger` call opens a run (its own files and console handler) and binds it to
+the current context, so concurrent runs in one process (e.g. app sessions) log to
+their own directories instead of replacing each other's handlers. Records carry the
+path of the step that logged them.
+
+Messages are formatted by the caller with bounded arguments: strings longer than
+`RECIPE_EXECUTOR_LOG_MAX_VALUE_CHARS` (prompts, file contents, LLM output) are kept
+by reference and written by the background thread to `<log_dir>/payloads/`, leaving a
+preview and the file name in the log line; containers are rendered with a bounded
+repr. Arguments of disabled levels are never formatted.
 """
 
+import atexit
+import contextvars
+import copy
+import itertools
+import logging
 import os
+import queue
+import reprlib
+import shutil
 import sys
-import logging
+import threading
+from contextlib import contextmanager
 from logging import Logger
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Iterator, List, Mapping, Optional
+
+from recipe_executor.checkpoint import current_step_path, format_step_path
+from recipe_executor.utils.text import TEXT_TYPES
+
+__all__ = ["close_run", "flush_logs", "init_logger", "log_run", "logging_stats"]
+
+# Longest argument (in characters) written to a log line as is
+_MAX_VALUE_CHARS = int(os.environ.get("RECIPE_EXECUTOR_LOG_MAX_VALUE_CHARS", "4096"))
+
+# Characters of an offloaded or truncated value kept in the log line
+_PREVIEW_CHARS = 500
+
+_FORMAT = "%(asctime)s.%(msecs)03d [%(levelname)s] (%(filename)s:%(lineno)d) %(step_prefix)s%(message)s"
+_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Run the records logged in the current context belong to
+_current_run: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("log_run", default=None)
+
+
+class _BoundedRepr(reprlib.Repr):
+    """repr() that shortens long strings and large or deeply nested containers."""
+
+    def __init__(self, max_chars: int) -> None:
+        super().__init__()
+        self.maxlevel = 6
+        self.maxdict = self.maxlist = self.maxtuple = self.maxset = self.maxfrozenset = 100
+        self.maxstring = self.maxother = self.maxlong = max(max_chars, 40)
+
+    def repr_dict(self, x: Dict[Any, Any], level: int) -> str:
+        # Keep insertion order (reprlib sorts keys)
+        if not x:
+            return "{}"
+        if level <= 0:
+            return "{...}"
+        pieces = [
+            f"{self.repr1(key, level - 1)}: {self.repr1(value, level - 1)}"
+            for key, value in itertools.islice(x.items(), self.maxdict)
+        ]
+        if len(x) > self.maxdict:
+            pieces.append("...")
+        return "{" + ", ".join(pieces) + "}"
+
+
+class _Rendered:
+    """Argument replaced by its bounded rendering."""
+
+    __slots__ = ("text",)
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+
+    def __str__(self) -> str:
+        return self.text
+
+    __repr__ = __str__
+
+
+class _Payload:
+    """Large argument kept by reference; formats as a placeholder resolved by the writer."""
+
+    __slots__ = ("index",)
 
+    def __init__(self, index: int) -> None:
+        self.index = index
 
-def init_logger(log_dir: str = "logs", stdio_log_level: str = "INFO") -> Logger:
+    def __str__(self) -> str:
+        return f"\x00{self.index}s\x00"
+
+    def __repr__(self) -> str:
+        return f"\x00{self.index}r\x00"
+
+
+class _RunQueueHandler(QueueHandler):
+    """
+    Root handler tagging records with their run and step path and formatting their
+    message with bounded arguments before queueing them for the writer thread.
+    """
+
+    def __init__(self, log_queue: "queue.Queue[Any]", max_chars: int) -> None:
+        super().__init__(log_queue)
+        self.max_chars = max_chars
+        self._repr = _BoundedRepr(max_chars)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Other root handlers still see the original record
+        record = copy.copy(record)
+        record.run_id = _current_run.get()
+        step_path = format_step_path(current_step_path())
+        record.step_prefix = f"[{step_path}] " if step_path else ""
+        payloads: List[Any] = []
+        if record.args:
+            if isinstance(record.args, Mapping):
+                args: Any = {key: self._bound(value, payloads) for key, value in record.args.items()}
+            else:
+                args = tuple(self._bound(value, payloads) for value in record.args)
+            message = str(record.msg) % args
+        else:
+            message = str(record.msg)
+            if len(message) > self.max_chars:
+                payloads.append(message)
+                message = str(_Payload(0))
+        record.msg = message
+        record.args = None
+        record.log_payloads = payloads
+        record.message = message
+        return record
+
+    def _bound(self, value: Any, payloads: List[Any]) -> Any:
+        if isinstance(value, TEXT_TYPES):
+            if len(value) <= self.max_chars:
+                return value
+            payloads.append(value)
+            return _Payload(len(payloads) - 1)
+        if type(value) in (dict, list, tuple, set, frozenset):
+            return _Rendered(self._repr.repr(value))
+        return value
+
+
+class _Run:
+    """Handlers and payload directory of one logging run."""
+
+    def __init__(self, run_id: str, log_dir: str, handlers: List[logging.Handler]) -> None:
+        self.run_id = run_id
+        self.log_dir = log_dir
+        self.handlers = handlers
+        self.payload_dir = os.path.join(log_dir, "payloads")
+        self._payload_seq = 0
+
+    def offload(self, text: str) -> str:
+        """Write a large value to the payload directory; return its preview for the log line."""
+        self._payload_seq += 1
+        name = f"{self._payload_seq:06d}.txt"
+        try:
+            os.makedirs(self.payload_dir, exist_ok=True)
+            with open(os.path.join(self.payload_dir, name), "w", encoding="utf-8") as f:
+                f.write(text)
+        except OSError:
+            _stats["truncated"] += 1
+            return f"{text[:_PREVIEW_CHARS]}... [{len(text) - _PREVIEW_CHARS} more chars]"
+        _stats["offloaded"] += 1
+        _stats["offloaded_chars"] += len(text)
+        return f"{text[:_PREVIEW_CHARS]}... [{len(text)} chars, full value in payloads/{name}]"
+
+    def close(self) -> None:
+        for handler in self.handlers:
+            handler.close()
+
+
+class _RunRouter(logging.Handler):
+    """Writer-side handler passing each record to the handlers of its run."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.runs: Dict[str, _Run] = {}
+        # Run receiving records logged outside of any run
+        self.default_run: Optional[str] = None
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        with self.lock:
+            run_id = getattr(record, "run_id", None)
+            run = self.runs.get(run_id or "") or self.runs.get(self.default_run or "")
+            _stats["records"] += 1
+            if run is None:
+                _stats["dropped"] += 1
+                return False
+            self._resolve_payloads(record, run)
+            for handler in run.handlers:
+                if record.levelno >= handler.level:
+                    handler.handle(record)
+        return True
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.handle(record)
+
+    def _resolve_payloads(self, record: logging.LogRecord, run: _Run) -> None:
+        payloads: List[Any] = getattr(record, "log_payloads", None) or []
+        if not payloads:
+            return
+        message = str(record.msg)
+        for index, value in enumerate(payloads):
+            for conversion, render in (("s", str), ("r", repr)):
+                token = f"\x00{index}{conversion}\x00"
+                if token in message:
+                    message = message.replace(token, run.offload(render(value)))
+        record.msg = record.message = message
+        record.log_payloads = None
+
+    def open_run(self, run: _Run) -> None:
+        with self.lock:
+            previous = self.runs.pop(run.run_id, None)
+            if previous is not None:
+                previous.close()
+            self.runs[run.run_id] = run
+            if self.default_run not in self.runs:
+                self.default_run = run.run_id
+
+    def close_run(self, run_id: str) -> None:
+        with self.lock:
+            run = self.runs.pop(run_id, None)
+            if run is not None:
+                run.close()
+            if self.default_run == run_id:
+                self.default_run = None
+
+
+class _RunFormatter(logging.Formatter):
+    """Formatter tolerating records that did not pass through the queue handler."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        if not hasattr(record, "step_prefix"):
+            record.step_prefix = ""
+        return super().format(record)
+
+
+_stats: Dict[str, int] = {"records": 0, "dropped": 0, "offloaded": 0, "offloaded_chars": 0, "truncated": 0}
+
+_setup_lock = threading.Lock()
+_queue: "Optional[queue.Queue[Any]]" = None
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[_RunQueueHandler] = None
+_router: Optional[_RunRouter] = None
+_run_ids: Dict[str, str] = {}
+_run_levels: Dict[str, int] = {}
+_run_counter = itertools.count(1)
+
+
+def _parse_level(level: str) -> int:
+    level_name = level.upper()
+    if level_name == "WARN":
+        level_name = "WARNING"
+    # Fallback to INFO if invalid
+    if level_name not in ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"):
+        level_name = "INFO"
+    return getattr(logging, level_name, logging.INFO)
+
+
+def _install(root: Logger) -> _RunRouter:
+    """Install the queue handler on the root logger and start the writer thread (once)."""
+    global _queue, _listener, _queue_handler, _router
+    if _router is not None and _queue_handler in root.handlers:
+        return _router
+    # Remove existing handlers to reset configuration
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    if _router is None:
+        _queue = queue.Queue()
+        _router = _RunRouter()
+        _listener = QueueListener(_queue, _router)
+        _listener.start()
+        _queue_handler = _RunQueueHandler(_queue, _MAX_VALUE_CHARS)
+        atexit.register(_shutdown)
+    root.addHandler(_queue_handler)  # type: ignore[arg-type]
+    return _router
+
+
+def _shutdown() -> None:
+    """Write the queued records and close every run (at interpreter exit)."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+    if _router is not None:
+        for run_id in list(_router.runs):
+            _router.close_run(run_id)
+
+
+def _update_root_level(root: Logger) -> None:
+    # Records below every open run's levels are discarded before their arguments are formatted
+    root.setLevel(min(_run_levels.values(), default=logging.WARNING))
+
+
+def init_logger(log_dir: str = "logs", stdio_log_level: str = "INFO", file_log_level: str = "DEBUG") -> Logger:
     """
     Initializes a logger that writes to stdout and to log files (debug/info/error).
     Clears existing logs on each run.
 
+    The run is bound to the current context: records logged from it (and from tasks
+    it creates) go to `log_dir`, even while other runs log to other directories.
+
     Args:
         log_dir (str): Directory to store log files. Default is "logs".
         stdio_log_level (str): Log level for stdout. Default is "INFO".
             Options: "DEBUG", "INFO", "WARN", "ERROR" (case-insensitive).
             If set to "DEBUG", all logs will be printed to stdout.
             If set to "INFO", only INFO and higher level logs will be printed to stdout.
+        file_log_level (str): Lowest level written to the log files. Default is "DEBUG";
+            with "INFO", debug messages are skipped without formatting their arguments.
 
     Returns:
         logging.Logger: Configured logger instance.
@@ -28,30 +326,21 @@ def init_logger(log_dir: str = "logs", stdio_log_level: str = "INFO") -> Logger:
     Raises:
         Exception: If log directory cannot be created or log files cannot be opened.
     """
-    # Acquire root logger and capture all levels
+    # Acquire root logger
     logger = logging.getLogger()
-    logger.setLevel(logging.DEBUG)
-
-    # Remove existing handlers to reset configuration
-    for handler in list(logger.handlers):
-        logger.removeHandler(handler)
-
-    # Log initialization start at DEBUG level
-    logger.debug("Initializing logger with dir='%s', stdio_level='%s'", log_dir, stdio_log_level)
 
     # Ensure log directory exists
     try:
         os.makedirs(log_dir, exist_ok=True)
     except Exception as exc:
         raise Exception(f"Failed to create log directory '{log_dir}': {exc}")
-    logger.debug("Log directory created: %s", log_dir)
 
-    # Define log formatters
-    fmt = "%(asctime)s.%(msecs)03d [%(levelname)s] (%(filename)s:%(lineno)d) %(message)s"
-    datefmt = "%Y-%m-%d %H:%M:%S"
-    formatter = logging.Formatter(fmt=fmt, datefmt=datefmt)
+    console_level = _parse_level(stdio_log_level)
+    file_level = _parse_level(file_log_level)
+    formatter = _RunFormatter(fmt=_FORMAT, datefmt=_DATE_FORMAT)
 
     # Set up file handlers for DEBUG, INFO, and ERROR levels
+    handlers: List[logging.Handler] = []
     level_map = [
         ("debug", logging.DEBUG),
         ("info", logging.INFO),
@@ -61,28 +350,77 @@ def init_logger(log_dir: str = "logs", stdio_log_level: str = "INFO") -> Logger:
         file_path = os.path.join(log_dir, f"{name}.log")
         try:
             fh = logging.FileHandler(file_path, mode="w", encoding="utf-8")
-            fh.setLevel(level)
+            fh.setLevel(max(level, file_level))
             fh.setFormatter(formatter)
-            logger.addHandler(fh)
+            handlers.append(fh)
         except Exception as exc:
+            for handler in handlers:
+                handler.close()
             raise Exception(f"Failed to set up {name} log file '{file_path}': {exc}")
 
     # Configure console (stdout) handler
-    level_name = stdio_log_level.upper()
-    if level_name == "WARN":
-        level_name = "WARNING"
-    # Fallback to INFO if invalid
-    if level_name not in ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"):
-        level_name = "INFO"
-    console_level = getattr(logging, level_name, logging.INFO)
-
     ch = logging.StreamHandler(sys.stdout)
     ch.setLevel(console_level)
     ch.setFormatter(formatter)
-    logger.addHandler(ch)
+    handlers.append(ch)
+
+    with _setup_lock:
+        router = _install(logger)
+        # Re-initializing a directory reopens its files under the same run id
+        key = os.path.realpath(log_dir)
+        run_id = _run_ids.setdefault(key, f"run-{next(_run_counter)}")
+        run = _Run(run_id, log_dir, handlers)
+        shutil.rmtree(run.payload_dir, ignore_errors=True)
+        router.open_run(run)
+        _run_levels[run_id] = min(console_level, file_level)
+        _update_root_level(logger)
+    _current_run.set(run_id)
 
-    # Log completion
-    logger.debug("Logger handlers configured (dir='%s', stdio_level='%s')", log_dir, level_name)
+    logger.debug(
+        "Logger handlers configured (dir='%s', stdio_level='%s', file_level='%s', run=%s)",
+        log_dir,
+        logging.getLevelName(console_level),
+        logging.getLevelName(file_level),
+        run_id,
+    )
     logger.info("Logger initialized successfully")
 
     return logger
+
+
+def close_run(log_dir: str) -> None:
+    """Write the queued records of the run logging to `log_dir` and close its files."""
+    flush_logs()
+    with _setup_lock:
+        run_id = _run_ids.pop(os.path.realpath(log_dir), None)
+        if run_id is None or _router is None:
+            return
+        _router.close_run(run_id)
+        _run_levels.pop(run_id, None)
+        _update_root_level(logging.getLogger())
+
+
+@contextmanager
+def log_run(log_dir: str, stdio_log_level: str = "INFO", file_log_level: str = "DEBUG") -> Iterator[Logger]:
+    """
+    Log the enclosed block (and tasks it creates) to `log_dir`, then close the run's
+    files. Use this for runs sharing a process, e.g. one per app request.
+    """
+    token = _current_run.set(None)
+    try:
+        yield init_logger(log_dir, stdio_log_level, file_log_level)
+    finally:
+        close_run(log_dir)
+        _current_run.reset(token)
+
+
+def flush_logs() -> None:
+    """Block until every record logged so far has been written."""
+    if _queue is not None and _listener is not None:
+        _queue.join()
+
+
+def logging_stats() -> Dict[str, int]:
+    """Return counts of records written, dropped and of large values offloaded or truncated."""
+    with _setup_lock:
+        return {**_stats, "runs": len(_run_levels)}
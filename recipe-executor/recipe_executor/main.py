@@ -9,11 +9,24 @@ import traceback
 from typing import Any, Dict, List, Optional
 
 from dotenv import load_dotenv
+from recipe_executor.artifact_store import artifact_store_stats, configure_artifact_store
+from recipe_executor.build_manifest import build_stats, configure_builds
+from recipe_executor.checkpoint import Checkpointer, activate_checkpointer
+from recipe_executor.concurrency import adaptive_concurrency_stats
 from recipe_executor.config import load_configuration
 from recipe_executor.context import Context
 from recipe_executor.executor import Executor
-from recipe_executor.logger import init_logger
+from recipe_executor.llm_utils.circuit_breaker import circuit_breaker_stats
+from recipe_executor.llm_utils.clients import client_registry_stats, close_clients
+from recipe_executor.llm_utils.llm_cache import llm_cache_stats
+from recipe_executor.llm_utils.rate_limiter import rate_limiter_stats
+from recipe_executor.logger import init_logger, logging_stats
 from recipe_executor.models import Recipe
+from recipe_executor.planner import build_plan
+from recipe_executor.recipe_cache import configure_recipe_cache, load_recipe_file, recipe_cache_stats
+from recipe_executor.retry import retry_stats
+from recipe_executor.steps.read_files import file_cache_stats
+from recipe_executor.tracing import Tracer, activate_tracer
 
 
 def parse_key_value_pairs(pairs: List[str]) -> Dict[str, str]:
@@ -38,12 +51,105 @@ async def main_async() -> None:
 
     # Parse command-line arguments
     parser = argparse.ArgumentParser(description="Recipe Executor CLI")
-    parser.add_argument("recipe_path", type=str, help="Path to the recipe file to execute")
+    parser.add_argument(
+        "recipe_path",
+        type=str,
+        nargs="?",
+        default=None,
+        help="Path to the recipe file to execute (optional with --resume)",
+    )
     parser.add_argument("--log-dir", type=str, default="logs", help="Directory for log files")
+    parser.add_argument(
+        "--log-level",
+        type=str.upper,
+        default="DEBUG",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        help="Lowest level written to the log files (INFO skips formatting debug messages)",
+    )
     parser.add_argument("--context", action="append", default=[], help="Context artifact values as key=value pairs")
     parser.add_argument("--config", action="append", default=[], help="Static configuration values as key=value pairs")
+    parser.add_argument(
+        "--no-recipe-cache",
+        action="store_true",
+        help="Re-read recipe files on every execution instead of caching them (for live editing)",
+    )
+    parser.add_argument(
+        "--llm-cache-dir",
+        type=str,
+        default=None,
+        help="Directory for the persistent LLM result cache (reuses results of identical llm_generate calls)",
+    )
+    parser.add_argument(
+        "--spill-threshold",
+        type=int,
+        default=None,
+        metavar="CHARS",
+        help="Keep context strings of at least CHARS characters in an on-disk blob store instead of in memory",
+    )
+    parser.add_argument(
+        "--spill-dir",
+        type=str,
+        default=None,
+        help="Blob directory for spilled context values (default: a temporary directory; implies spilling)",
+    )
+    parser.add_argument(
+        "--execution-mode",
+        choices=["sequential", "dag"],
+        default=None,
+        help="Run steps in recipe order (default) or concurrently where their context keys do not conflict",
+    )
+    parser.add_argument(
+        "--checkpoint-dir",
+        type=str,
+        default=None,
+        help="Run directory for checkpoints written after each completed step (enables --resume)",
+    )
+    parser.add_argument(
+        "--resume",
+        type=str,
+        default=None,
+        metavar="RUN_DIR",
+        help="Resume a checkpointed run from its run directory, skipping completed steps and loop items",
+    )
+    parser.add_argument(
+        "--explain-plan",
+        action="store_true",
+        help="Print the inferred step dependency graph and exit without executing the recipe",
+    )
+    parser.add_argument(
+        "--trace",
+        metavar="FILE",
+        default=None,
+        help="Write a JSON span tree of the run to FILE and a Chrome trace (speedscope/Perfetto) next to it",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Rebuild every incremental target, even if its inputs are unchanged",
+    )
+    parser.add_argument(
+        "--only",
+        action="append",
+        default=[],
+        metavar="TARGET",
+        help="Rebuild only incremental targets matching TARGET (name or glob, repeatable); skip all others",
+    )
     args = parser.parse_args()
 
+    if args.resume and args.checkpoint_dir:
+        parser.error("--resume and --checkpoint-dir cannot be combined; --resume keeps checkpointing to RUN_DIR")
+    if not args.recipe_path and not args.resume:
+        parser.error("the recipe_path argument is required unless --resume is given")
+
+    if args.no_recipe_cache:
+        configure_recipe_cache(enabled=False)
+    if args.force or args.only:
+        configure_builds(force=args.force, only=args.only)
+    if args.spill_threshold is not None and args.spill_threshold < 0:
+        parser.error("--spill-threshold must not be negative")
+    if args.spill_threshold or args.spill_dir:
+        configure_artifact_store(threshold=args.spill_threshold, directory=args.spill_dir)
+
     # Prepare log directory
     try:
         os.makedirs(args.log_dir, exist_ok=True)
@@ -53,7 +159,7 @@ async def main_async() -> None:
 
     # Initialize logger
     try:
-        logger: logging.Logger = init_logger(args.log_dir)
+        logger: logging.Logger = init_logger(args.log_dir, file_log_level=args.log_level)
     except Exception as exc:
         sys.stderr.write(f"Logger Initialization Error: {exc}\n")
         raise SystemExit(1)
@@ -76,13 +182,24 @@ async def main_async() -> None:
         sys.stderr.write(f"Config Error: {ve}\n")
         raise SystemExit(1)
 
+    # Restore the recipe path and context of a checkpointed run
+    recipe_path: str = args.recipe_path
+    if args.resume:
+        try:
+            run_info: Dict[str, Any] = Checkpointer.read_run_info(args.resume)
+            recipe_path = recipe_path or run_info["recipe_path"]
+            artifacts = {**Checkpointer.load_artifacts(args.resume), **artifacts}
+        except (ValueError, KeyError) as exc:
+            logger.error("Cannot resume run '%s': %s", args.resume, exc)
+            raise SystemExit(1)
+        if Checkpointer.recipe_changed(run_info, recipe_path):
+            logger.warning("Recipe '%s' changed since the checkpointed run started", recipe_path)
+
     # Load and validate recipe
     try:
-        with open(args.recipe_path, "r", encoding="utf-8") as f:
-            content = f.read()
-        recipe: Recipe = Recipe.model_validate_json(content)
+        recipe: Recipe = load_recipe_file(recipe_path).recipe
     except Exception as exc:
-        logger.error("Failed to load recipe '%s': %s", args.recipe_path, exc, exc_info=True)
+        logger.error("Failed to load recipe '%s': %s", recipe_path, exc, exc_info=True)
         raise SystemExit(1)
 
     # Load configuration from environment and recipe-specific variables
@@ -95,22 +212,85 @@ async def main_async() -> None:
 
     # Merge environment config with CLI overrides (CLI takes precedence)
     merged_config: Dict[str, Any] = {**env_config, **cli_config}
+    if args.execution_mode:
+        merged_config["execution_mode"] = args.execution_mode
+    if args.llm_cache_dir:
+        merged_config["llm_cache_dir"] = args.llm_cache_dir
 
     # Create execution context
     context = Context(artifacts=artifacts, config=merged_config)
 
+    if args.explain_plan:
+        print(build_plan(recipe, context).explain())
+        return
+
+    # Checkpoint the run when requested
+    checkpointer: Optional[Checkpointer] = None
+    run_dir: Optional[str] = args.resume or args.checkpoint_dir
+    if run_dir:
+        try:
+            checkpointer = Checkpointer(run_dir, context, logger)
+            if args.resume:
+                checkpointer.resume()
+            else:
+                checkpointer.start(recipe_path)
+        except (OSError, ValueError) as exc:
+            logger.error("Checkpoint error: %s", exc)
+            raise SystemExit(1)
+        activate_checkpointer(checkpointer)
+
+    # Trace the run when requested
+    tracer: Optional[Tracer] = None
+    if args.trace:
+        tracer = Tracer("run", recipe_path=recipe_path)
+        activate_tracer(tracer)
+
     # Execute the recipe
     executor = Executor(logger)
-    logger.info("Executing recipe: %s", args.recipe_path)
+    logger.info("Executing recipe: %s", recipe_path)
     start_time = time.time()
+    run_error: Optional[BaseException] = None
     try:
         await executor.execute(recipe, context)
     except Exception as exec_err:
+        run_error = exec_err
         logger.error("An error occurred during recipe execution: %s", exec_err, exc_info=True)
+        logger.info("Retry stats: %s", retry_stats())
+        if checkpointer is not None:
+            checkpointer.finish(exec_err)
+            logger.info("Resume this run with: recipe-executor --resume %s", run_dir)
         raise SystemExit(1)
+    finally:
+        # Close the shared LLM provider clients while the event loop is still running
+        logger.debug("LLM client stats: %s", client_registry_stats())
+        await close_clients()
+        if tracer is not None:
+            tracer.finish(run_error)
+            try:
+                trace_path, chrome_path = tracer.write(args.trace)
+                logger.info("Trace written to %s (Chrome trace: %s)", trace_path, chrome_path)
+                logger.info("Timing report:\n%s", tracer.report())
+            except OSError as exc:
+                logger.error("Failed to write trace '%s': %s", args.trace, exc)
     duration = time.time() - start_time
+    if checkpointer is not None:
+        checkpointer.finish()
 
     logger.info("Recipe execution completed successfully in %.2f seconds", duration)
+    logger.debug("Recipe cache stats: %s", recipe_cache_stats())
+    logger.debug("File cache stats: %s", file_cache_stats())
+    for stats in llm_cache_stats():
+        logger.info("LLM cache stats: %s", stats)
+    for stats in rate_limiter_stats():
+        logger.info("LLM rate limiter stats: %s", stats)
+    logger.info("Retry stats: %s", retry_stats())
+    logger.info("Incremental build stats: %s", build_stats())
+    for stats in circuit_breaker_stats():
+        logger.info("LLM circuit breaker stats: %s", stats)
+    for stats in adaptive_concurrency_stats():
+        logger.debug("Adaptive concurrency stats: %s", stats)
+    logger.info("Artifact store stats: %s", artifact_store_stats())
+    logger.debug("Logging stats: %s", logging_stats())
 
 
 def main() -> None:
@@ -7,7 +7,9 @@ Defines Pydantic models for file specifications, step configurations, and recipe
 
 from typing import Any, Dict, List, Optional, Union
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+from recipe_executor.retry import RetryPolicy
 
 
 class FileSpec(BaseModel):
@@ -90,8 +92,11 @@ class RecipeStep(BaseModel):
     Attributes:
         type: The type of the recipe step (e.g., 'read_files', 'llm_generate', 'write_files').
         config: Step-specific configuration as a dict or Pydantic model.
+        retry: Optional retry policy for transient failures of the step.
     """
 
+    model_config = ConfigDict(frozen=True)
+
     type: str = Field(..., description="Type of the recipe step to execute")
     config: Dict[str, Any] = Field(
         ...,
@@ -100,6 +105,10 @@ class RecipeStep(BaseModel):
             "unknown types remain a raw dict."
         ),
     )
+    retry: Optional[RetryPolicy] = Field(
+        None,
+        description="Optional retry policy (max_attempts, backoff, jitter, retry_on, retry_on_status)",
+    )
 
 
 class Recipe(BaseModel):
@@ -108,8 +117,12 @@ class Recipe(BaseModel):
     Attributes:
         steps: Ordered list of steps to run.
         env_vars: Optional list of environment variable names required by the recipe.
+
+    Recipes are immutable once validated so they can be shared by the recipe cache.
     """
 
+    model_config = ConfigDict(frozen=True)
+
     steps: List[RecipeStep] = Field(..., description="Ordered list of recipe steps")
     env_vars: Optional[List[str]] = Field(
         None,
@@ -0,0 +1,416 @@
+# This file was generated by Codebase-Generator, do not edit directly
+"""
+Static dependency analysis of recipes for the Recipe Executor.
+
+Each step's configuration is inspected to infer which context keys it reads and
+writes (`content_key`, `output_key`, `result_key`, `key`, Liquid variable
+references in templated fields, sub-recipes and substeps). From these read/write
+sets a dependency graph is built: a step depends on every earlier step it
+conflicts with, so running steps as soon as their dependencies finish produces the
+same visible results as running them in recipe order.
+
+Steps whose effects cannot be inferred (unknown step types, templated output keys,
+sub-recipes whose path cannot be resolved) are treated as barriers that conflict
+with everything.
+"""
+
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+from recipe_executor.models import Recipe
+from recipe_executor.protocols import ContextProtocol
+from recipe_executor.recipe_cache import CompiledStep, compile_recipe, load_recipe_file
+from recipe_executor.utils.templates import get_template, render_template
+
+__all__ = [
+    "ANY_KEY",
+    "FILESYSTEM",
+    "StepAccess",
+    "PlanNode",
+    "ExecutionPlan",
+    "analyze_step",
+    "analyze_steps",
+    "build_plan",
+]
+
+# Wildcard: the step may read or write any key
+ANY_KEY = "*"
+# Pseudo-key for filesystem side effects (files read or written by steps)
+FILESYSTEM = "<filesystem>"
+
+
+@dataclass
+class StepAccess:
+    """Inferred context keys read and written by a step."""
+
+    reads: Set[str] = field(default_factory=set)
+    writes: Set[str] = field(default_factory=set)
+
+    @property
+    def is_barrier(self) -> bool:
+        return ANY_KEY in self.writes
+
+    def conflicts_with(self, other: "StepAccess") -> bool:
+        """
+        True if running the two steps concurrently could change visible results
+        (write/write, read/write or write/read overlap).
+        """
+        return (
+            _overlaps(self.writes, other.writes)
+            or _overlaps(self.writes, other.reads)
+            or _overlaps(self.reads, other.writes)
+        )
+
+    def merge(self, other: "StepAccess") -> None:
+        self.reads |= other.reads
+        self.writes |= other.writes
+
+
+@dataclass
+class PlanNode:
+    """A step in the execution plan together with the earlier steps it must wait for."""
+
+    index: int
+    step: CompiledStep
+    access: StepAccess
+    depends_on: List[int]
+    level: int
+
+
+@dataclass
+class ExecutionPlan:
+    """Dependency graph of a recipe's top-level steps."""
+
+    nodes: List[PlanNode]
+
+    @property
+    def levels(self) -> List[List[int]]:
+        """Step indexes grouped by level: every step of a level can run concurrently."""
+        grouped: Dict[int, List[int]] = {}
+        for node in self.nodes:
+            grouped.setdefault(node.level, []).append(node.index)
+        return [grouped[level] for level in sorted(grouped)]
+
+    def explain(self) -> str:
+        """Return a human-readable description of the inferred graph."""
+        lines: List[str] = [f"Execution plan: {len(self.nodes)} steps in {len(self.levels)} levels"]
+        for level, indexes in enumerate(self.levels):
+            lines.append(f"Level {level}: steps {', '.join(str(i) for i in indexes)}")
+            for idx in indexes:
+                node = self.nodes[idx]
+                deps = ", ".join(str(d) for d in node.depends_on) or "-"
+                lines.append(f"  [{idx}] {node.step.type}{' (barrier)' if node.access.is_barrier else ''}")
+                lines.append(f"      reads:      {_format_keys(node.access.reads)}")
+                lines.append(f"      writes:     {_format_keys(node.access.writes)}")
+                lines.append(f"      depends on: {deps}")
+        return "\n".join(lines)
+
+
+def _overlaps(a: Set[str], b: Set[str]) -> bool:
+    if not a or not b:
+        return False
+    if ANY_KEY in a or ANY_KEY in b:
+        return True
+    return not a.isdisjoint(b)
+
+
+def _format_keys(keys: Set[str]) -> str:
+    return ", ".join(sorted(keys)) or "-"
+
+
+def _template_vars(value: Any) -> Set[str]:
+    """
+    Return the root variable names referenced by Liquid templates in a (nested) value.
+    Unparseable templates may reference anything.
+    """
+    found: Set[str] = set()
+    if isinstance(value, str):
+        if "{{" not in value and "{%" not in value:
+            return found
+        try:
+            found.update(get_template(value).global_variables())
+        except Exception:
+            found.add(ANY_KEY)
+    elif isinstance(value, dict):
+        for item in value.values():
+            found |= _template_vars(item)
+    elif isinstance(value, list):
+        for item in value:
+            found |= _template_vars(item)
+    return found
+
+
+def _output_key(value: Any, access: StepAccess) -> None:
+    """Record a written key; templated keys are only known at runtime and act as barriers."""
+    if not isinstance(value, str) or not value:
+        return
+    variables = _template_vars(value)
+    if variables:
+        access.reads |= variables
+        access.writes.add(ANY_KEY)
+    else:
+        access.writes.add(value)
+
+
+def _input_key(value: Any, access: StepAccess) -> None:
+    """Record a key read directly from the context (not through a template)."""
+    if isinstance(value, str) and value:
+        variables = _template_vars(value)
+        access.reads |= variables or {value}
+
+
+def _sequence_access(
+    steps: Iterable[Tuple[str, Dict[str, Any]]], context: Optional[ContextProtocol], seen: Set[str]
+) -> StepAccess:
+    """
+    Combined access of steps executed in order on one context. Keys read after an
+    earlier step in the sequence wrote them are internal and not reported as reads.
+    """
+    combined = StepAccess()
+    for step_type, config in steps:
+        access = _analyze(step_type, config, _resolution_context(step_type, config, context, combined.writes), seen)
+        combined.reads |= access.reads - (combined.writes - {ANY_KEY})
+        combined.writes |= access.writes
+    return combined
+
+
+def _resolution_context(
+    step_type: str, config: Dict[str, Any], context: Optional[ContextProtocol], written: Set[str]
+) -> Optional[ContextProtocol]:
+    """
+    Return the context to resolve a templated sub-recipe path with, or None when an
+    earlier step may change the keys the path references before the step runs.
+    """
+    if context is None or step_type != "execute_recipe":
+        return context
+    path_vars = _template_vars(config.get("recipe_path"))
+    if ANY_KEY in written or not path_vars.isdisjoint(written):
+        return None
+    return context
+
+
+def _substeps(value: Any) -> List[Tuple[str, Dict[str, Any]]]:
+    result: List[Tuple[str, Dict[str, Any]]] = []
+    if isinstance(value, list):
+        for item in value:
+            if isinstance(item, dict):
+                result.append((str(item.get("type")), item.get("config") or {}))
+    return result
+
+
+def _isolated_access(inner: StepAccess, local_keys: Set[str]) -> StepAccess:
+    """
+    Access of substeps that run on cloned contexts (loop items, parallel substeps):
+    their reads reach the parent context, their writes stay in the clone except for
+    filesystem effects.
+    """
+    access = StepAccess(reads=inner.reads - local_keys)
+    if ANY_KEY in inner.writes:
+        # Unknown writes inside a clone may still touch the filesystem
+        access.writes.add(FILESYSTEM)
+        access.reads.add(FILESYSTEM)
+    if FILESYSTEM in inner.writes:
+        access.writes.add(FILESYSTEM)
+    return access
+
+
+def _analyze(step_type: str, config: Dict[str, Any], context: Optional[ContextProtocol], seen: Set[str]) -> StepAccess:
+    access = StepAccess()
+
+    if step_type == "read_files":
+        access.reads |= _template_vars(config.get("path")) | {FILESYSTEM}
+        _output_key(config.get("content_key"), access)
+
+    elif step_type == "write_files":
+        access.reads |= _template_vars(config.get("root"))
+        _input_key(config.get("files_key"), access)
+        for entry in config.get("files") or []:
+            if not isinstance(entry, dict):
+                continue
+            access.reads |= _template_vars(entry.get("path"))
+            _input_key(entry.get("path_key"), access)
+            _input_key(entry.get("content_key"), access)
+        _output_key(config.get("result_key"), access)
+        access.writes.add(FILESYSTEM)
+
+    elif step_type == "set_context":
+        if config.get("nested_render"):
+            # Rendered output is rendered again and may reference any key
+            access.reads.add(ANY_KEY)
+        access.reads |= _template_vars(config.get("value"))
+        key = config.get("key")
+        if config.get("if_exists") in ("merge", "append") and isinstance(key, str):
+            access.reads.add(key)
+        _output_key(key, access)
+
+    elif step_type == "llm_generate":
+        for name in ("prompt", "model", "max_tokens", "mcp_servers", "cache"):
+            access.reads |= _template_vars(config.get(name))
+        if config.get("mcp_servers"):
+            # Tools may touch the filesystem
+            access.reads.add(FILESYSTEM)
+            access.writes.add(FILESYSTEM)
+        _output_key(config.get("output_key", "llm_output"), access)
+
+    elif step_type == "mcp":
+        for name in ("server", "tool_name", "arguments"):
+            access.reads |= _template_vars(config.get(name))
+        access.reads.add(FILESYSTEM)
+        access.writes.add(FILESYSTEM)
+        _output_key(config.get("result_key", "tool_result"), access)
+
+    elif step_type == "conditional":
+        condition = config.get("condition")
+        access.reads |= _template_vars(condition) | {FILESYSTEM}
+        for branch_name in ("if_true", "if_false"):
+            branch = config.get(branch_name)
+            if isinstance(branch, dict):
+                access.merge(_sequence_access(_substeps(branch.get("steps")), context, seen))
+
+    elif step_type == "loop":
+        items = config.get("items")
+        if isinstance(items, str):
+            variables = _template_vars(items)
+            access.reads |= variables or {items.split(".")[0]}
+        if config.get("source"):
+            # Items streamed from files
+            access.reads |= _template_vars(config.get("source"))
+            access.reads.add(FILESYSTEM)
+        item_key = config.get("item_key")
+        local = {"__index", "__key"}
+        if isinstance(item_key, str):
+            local.add(item_key)
+        inner = _sequence_access(_substeps(config.get("substeps")), None, seen)
+        access.merge(_isolated_access(inner, local))
+        result_key = config.get("result_key")
+        if isinstance(result_key, str):
+            for suffix in ("", "__errors", "__history"):
+                _output_key(f"{result_key}{suffix}", access)
+        if config.get("output_path"):
+            # Results streamed to a file
+            access.reads |= _template_vars(config.get("output_path"))
+            access.writes.add(FILESYSTEM)
+
+    elif step_type == "incremental":
+        for name in ("target", "manifest_path", "force"):
+            access.reads |= _template_vars(config.get(name))
+        access.merge(_sequence_access(_substeps(config.get("substeps")), context, seen))
+        # The build manifest
+        access.reads.add(FILESYSTEM)
+        access.writes.add(FILESYSTEM)
+
+    elif step_type == "parallel":
+        for sub_type, sub_config in _substeps(config.get("substeps")):
+            access.merge(_isolated_access(_analyze(sub_type, sub_config, None, seen), set()))
+
+    elif step_type == "execute_recipe":
+        overrides = config.get("context_overrides") or {}
+        access.reads |= _template_vars(overrides)
+        for key in overrides:
+            access.writes.add(str(key))
+        sub_access = _sub_recipe_access(config.get("recipe_path"), context, seen)
+        # Keys set by the overrides are read by the sub-recipe from the step itself
+        sub_access.reads -= {str(key) for key in overrides}
+        access.merge(sub_access)
+
+    elif step_type == "docpack_create":
+        for name in ("outline_path", "resource_files", "output_path"):
+            access.reads |= _template_vars(config.get(name))
+        access.reads.add(FILESYSTEM)
+        access.writes.add(FILESYSTEM)
+        _output_key(config.get("output_key"), access)
+
+    elif step_type == "docpack_extract":
+        for name in ("docpack_path", "extract_dir"):
+            access.reads |= _template_vars(config.get(name))
+        access.reads.add(FILESYSTEM)
+        access.writes.add(FILESYSTEM)
+        _output_key(config.get("outline_key", "outline_data"), access)
+        _output_key(config.get("resources_key", "resource_files"), access)
+
+    else:
+        # Unknown step types may do anything
+        access.reads.add(ANY_KEY)
+        access.writes.add(ANY_KEY)
+
+    return access
+
+
+def _sub_recipe_access(raw_path: Any, context: Optional[ContextProtocol], seen: Set[str]) -> StepAccess:
+    """
+    Access of a sub-recipe executed on the shared context. The path is rendered at
+    plan time only when a context is available; otherwise the step is a barrier.
+    """
+    barrier = StepAccess(reads={ANY_KEY}, writes={ANY_KEY})
+    if not isinstance(raw_path, str):
+        return barrier
+    path_vars = _template_vars(raw_path)
+    if ANY_KEY in path_vars or (path_vars and context is None):
+        return barrier
+    try:
+        path = render_template(raw_path, context) if path_vars and context is not None else raw_path
+    except ValueError:
+        return barrier
+    if not os.path.isfile(path):
+        return barrier
+    real_path = os.path.realpath(path)
+    if real_path in seen:
+        # Recursive recipes cannot be analyzed statically
+        return barrier
+    try:
+        compiled = load_recipe_file(path)
+    except ValueError:
+        return barrier
+    access = _sequence_access(((s.type, s.config) for s in compiled.steps), context, seen | {real_path})
+    access.reads |= path_vars
+    return access
+
+
+def analyze_step(step_type: str, config: Dict[str, Any], context: Optional[ContextProtocol] = None) -> StepAccess:
+    """
+    Infer the context keys a step reads and writes from its configuration.
+
+    Args:
+        step_type: The registered step type name.
+        config: The raw step configuration.
+        context: Optional context used to resolve templated sub-recipe paths.
+
+    Returns:
+        StepAccess with read and write key sets. `ANY_KEY` marks unknown effects.
+    """
+    return _analyze(step_type, config, context, set())
+
+
+def analyze_steps(steps: Iterable[Tuple[str, Dict[str, Any]]], context: Optional[ContextProtocol] = None) -> StepAccess:
+    """
+    Infer the combined access of steps executed in order on one context. Keys read
+    only after an earlier step wrote them are not reported as reads.
+    """
+    return _sequence_access(steps, context, set())
+
+
+def build_plan(
+    recipe: Union[Sequence[CompiledStep], Recipe],
+    context: Optional[ContextProtocol] = None,
+) -> ExecutionPlan:
+    """
+    Build the dependency graph of a recipe's steps.
+
+    Templated sub-recipe paths are resolved against the context only when none of
+    the keys they reference can be written by the recipe before the step runs, so
+    the plan-time value matches the execution-time value.
+    """
+    steps: Sequence[CompiledStep] = compile_recipe(recipe).steps if isinstance(recipe, Recipe) else recipe
+    nodes: List[PlanNode] = []
+    written_so_far: Set[str] = set()
+    for idx, step in enumerate(steps):
+        access = analyze_step(
+            step.type, step.config, _resolution_context(step.type, step.config, context, written_so_far)
+        )
+
+        depends_on = [prev.index for prev in nodes if access.conflicts_with(prev.access)]
+        level = max((nodes[d].level + 1 for d in depends_on), default=0)
+        nodes.append(PlanNode(index=idx, step=step, access=access, depends_on=depends_on, level=level))
+        written_so_far |= access.writes
+    return ExecutionPlan(nodes=nodes)
@@ -0,0 +1,227 @@
+# This file was generated by Codebase-Generator, do not edit directly
+"""
+Compiled-recipe cache for the Recipe Executor.
+
+Recipe files are read, validated and resolved against the step registry once and
+reused for as long as the file on disk is unchanged (same resolved path, mtime and
+size). Sub-recipes executed inside loops therefore pay the parse cost only once per run.
+
+A compiled step also holds the step object built from it: its config is validated
+once, and every later execution (each loop item, each run of a cached recipe) reuses
+the object and only renders the templated fields. Container steps compile their
+substeps with `compile_step` / `compile_steps` the same way.
+"""
+
+import copy
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Type, Union
+
+from recipe_executor.models import Recipe
+from recipe_executor.retry import RetryPolicy
+from recipe_executor.steps.base import BaseStep
+from recipe_executor.steps.registry import STEP_REGISTRY
+from recipe_executor.utils.lru import LRUCache
+
+__all__ = [
+    "CompiledStep",
+    "CompiledRecipe",
+    "compile_recipe",
+    "compile_step",
+    "compile_steps",
+    "load_recipe_file",
+    "configure_recipe_cache",
+    "recipe_cache_stats",
+]
+
+# Environment variable controlling the cache size; 0 disables caching (useful while editing recipes).
+RECIPE_CACHE_SIZE_ENV = "RECIPE_EXECUTOR_RECIPE_CACHE_SIZE"
+DEFAULT_RECIPE_CACHE_SIZE = 256
+
+
+@dataclass(frozen=True)
+class CompiledStep:
+    """
+    A recipe step with its implementation class resolved from the step registry.
+    `retry` is the validated policy of a recipe step, or the raw block of a substep
+    (validated by `resolve_retry_policy` when the step runs).
+    """
+
+    type: str
+    config: Dict[str, Any]
+    step_class: Optional[Type[BaseStep]]
+    retry: Optional[Union[RetryPolicy, Dict[str, Any]]] = None
+    # The step object built from this step (at most one, see `instantiate`)
+    _instance: List[BaseStep] = field(default_factory=list, compare=False, repr=False)
+
+    def resolve_class(self) -> Optional[Type[BaseStep]]:
+        """Return the step class, falling back to the registry for steps registered after compiling."""
+        return self.step_class or STEP_REGISTRY.get(self.type)
+
+    def instantiate(self, logger: logging.Logger) -> BaseStep:
+        """
+        Return the step object for this step, validating its config on first use.
+
+        Steps keep no per-execution state (templated fields are rendered in `execute`),
+        so one object serves every execution, concurrent ones included. Executions with
+        another logger get a shallow copy of it that logs there; only one object is kept,
+        so cached recipes do not keep the loggers of past executions alive. Step classes
+        with `reusable = False` get a new object each time. Each object gets its own
+        copy of the config: the compiled step is shared by every cached copy of the
+        recipe, and a step changing its config must not change theirs.
+
+        Raises:
+            ValueError: If the step type is unknown.
+        """
+        step_cls = self.resolve_class()
+        if step_cls is None:
+            raise ValueError(f"Unknown step type '{self.type}'")
+        if not getattr(step_cls, "reusable", True):
+            return step_cls(logger, copy.deepcopy(self.config))
+        instance = self._instance[0] if self._instance else None
+        if instance is None or type(instance) is not step_cls:
+            instance = step_cls(logger, copy.deepcopy(self.config))
+            self._instance[:] = [instance]
+            return instance
+        if instance.logger is logger:
+            return instance
+        # The copy shares the validated config
+        other = copy.copy(instance)
+        other.logger = logger
+        return other
+
+
+@dataclass(frozen=True)
+class CompiledRecipe:
+    """A validated recipe plus the resolved steps, shared between executions."""
+
+    recipe: Recipe
+    steps: Tuple[CompiledStep, ...]
+    source: Optional[str] = None
+
+
+def _initial_cache_size() -> int:
+    raw = os.getenv(RECIPE_CACHE_SIZE_ENV)
+    if raw is None:
+        return DEFAULT_RECIPE_CACHE_SIZE
+    try:
+        return max(0, int(raw))
+    except ValueError:
+        return DEFAULT_RECIPE_CACHE_SIZE
+
+
+# Process-wide cache: resolved path -> ((mtime_ns, size), CompiledRecipe)
+_cache: LRUCache[str, Tuple[Tuple[int, int], CompiledRecipe]] = LRUCache(max_entries=_initial_cache_size())
+
+
+def compile_recipe(recipe: Recipe, source: Optional[str] = None) -> CompiledRecipe:
+    """
+    Resolve each step of a validated recipe against STEP_REGISTRY.
+
+    Unknown step types are kept with `step_class=None` so the executor can report
+    them at the index where they occur.
+    """
+    steps = tuple(
+        CompiledStep(
+            type=step.type,
+            config=step.config or {},
+            step_class=STEP_REGISTRY.get(step.type),
+            retry=step.retry,
+        )
+        for step in recipe.steps or []
+    )
+    return CompiledRecipe(recipe=recipe, steps=steps, source=source)
+
+
+def compile_step(step_def: Mapping[str, Any]) -> CompiledStep:
+    """
+    Compile the raw definition (`type`, `config`, `retry`) of a substep of a container
+    step (parallel substeps, conditional branches, incremental targets). Unknown or
+    missing types are kept with `step_class=None` for the caller to report.
+    """
+    step_type = str(step_def.get("type") or "")
+    return CompiledStep(
+        type=step_type,
+        config=step_def.get("config") or {},
+        step_class=STEP_REGISTRY.get(step_type) if step_type else None,
+        retry=step_def.get("retry"),
+    )
+
+
+def compile_steps(steps: List[Dict[str, Any]]) -> CompiledRecipe:
+    """
+    Validate a list of substeps as a recipe and compile it, so a container running
+    them repeatedly (a loop, once per item) validates them only once.
+
+    Raises:
+        ValueError: If a step definition is invalid.
+    """
+    try:
+        recipe = Recipe.model_validate({"steps": steps})
+    except Exception as e:
+        raise ValueError(f"Invalid recipe structure: {e}") from e
+    return compile_recipe(recipe)
+
+
+def _read_recipe_file(path: str) -> Recipe:
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except Exception as e:
+        raise ValueError(f"Failed to read or parse recipe file '{path}': {e}") from e
+    try:
+        return Recipe.model_validate(data)
+    except Exception as e:
+        raise ValueError(f"Invalid recipe structure from file '{path}': {e}") from e
+
+
+def load_recipe_file(path: str) -> CompiledRecipe:
+    """
+    Load a recipe file, returning a cached compiled recipe when the file is unchanged.
+
+    Raises:
+        ValueError: If the file cannot be read, parsed or validated.
+    """
+    try:
+        real_path = os.path.realpath(path)
+        stat = os.stat(real_path)
+    except OSError as e:
+        raise ValueError(f"Failed to read or parse recipe file '{path}': {e}") from e
+    signature = (stat.st_mtime_ns, stat.st_size)
+
+    cached = _cache.get(real_path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    compiled = compile_recipe(_read_recipe_file(path), source=real_path)
+    _cache.put(real_path, (signature, compiled))
+    return compiled
+
+
+def configure_recipe_cache(max_entries: Optional[int] = None, enabled: Optional[bool] = None) -> None:
+    """
+    Adjust the process-wide recipe cache.
+
+    Args:
+        max_entries: New maximum number of cached recipe files.
+        enabled: False clears and disables the cache (recipes are re-read on every
+            execution, e.g. for live editing); True re-enables it with the default size
+            unless max_entries is given.
+    """
+    if enabled is False:
+        _cache.resize(max_entries=0)
+        _cache.clear()
+        return
+    if max_entries is None and enabled and _cache.max_entries <= 0:
+        max_entries = DEFAULT_RECIPE_CACHE_SIZE
+    if max_entries is not None:
+        _cache.resize(max_entries=max(0, max_entries))
+
+
+def recipe_cache_stats() -> Dict[str, Any]:
+    """
+    Return hit/miss/eviction counters and occupancy of the recipe cache.
+    """
+    return _cache.stats()
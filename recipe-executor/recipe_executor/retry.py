@@ -0,0 +1,255 @@
+# This file was generated by Codebase-Generator, do not edit directly
+"""
+Step-level retry policies.
+
+A transient 429/5xx from one LLM call used to abort the whole loop or parallel step
+around it. A `retry` block on any step (or the `step_retry` executor default from
+the context config) re-runs the failing step with exponential backoff and jitter
+when the error is transient: one of the configured exception classes or an HTTP
+status code found anywhere in the exception's cause chain. Errors can also mark
+themselves with a `retryable` attribute (True or False), and ask for a minimum
+delay with a `retry_after` attribute in seconds (e.g. an open circuit breaker
+until its cooldown ends).
+
+The executor default applies only to leaf steps; container steps (loop, parallel,
+conditional, execute_recipe) retry only with an explicit `retry` block, so retries
+do not multiply through nested containers and finished sibling work is kept.
+"""
+
+import asyncio
+import json
+import logging
+import random
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Mapping, Optional, TypeVar, Union
+
+from pydantic import BaseModel, ConfigDict, Field
+
+__all__ = [
+    "CONTAINER_STEP_TYPES",
+    "RetryPolicy",
+    "error_status_code",
+    "is_transient_error",
+    "resolve_retry_policy",
+    "run_with_retry",
+    "retry_stats",
+]
+
+# Steps that run other steps; the executor default retry policy does not apply to them
+CONTAINER_STEP_TYPES = frozenset({"loop", "parallel", "conditional", "execute_recipe"})
+
+DEFAULT_RETRY_ON: List[str] = [
+    "TimeoutError",
+    "ConnectionError",
+    "APIConnectionError",
+    "APITimeoutError",
+    "RateLimitError",
+    "InternalServerError",
+]
+DEFAULT_RETRY_ON_STATUS: List[int] = [408, 429, 500, 502, 503, 504]
+
+T = TypeVar("T")
+
+
+class RetryPolicy(BaseModel):
+    """
+    Declarative retry policy of a step.
+
+    Attributes:
+        max_attempts: Total attempts including the first one (1 disables retries).
+        backoff_base: Delay in seconds before the first retry; doubles on every retry.
+        backoff_cap: Maximum delay in seconds.
+        jitter: Randomize each delay between half and all of its value.
+        retry_on: Exception class names (matched against the class hierarchy of every
+            exception in the cause chain) that are retried.
+        retry_on_status: HTTP status codes (from `status_code` attributes in the cause
+            chain) that are retried.
+    """
+
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
+    max_attempts: int = Field(1, ge=1)
+    backoff_base: float = Field(1.0, ge=0)
+    backoff_cap: float = Field(30.0, ge=0)
+    jitter: bool = True
+    retry_on: List[str] = Field(default_factory=lambda: list(DEFAULT_RETRY_ON))
+    retry_on_status: List[int] = Field(default_factory=lambda: list(DEFAULT_RETRY_ON_STATUS))
+
+    def delay(self, attempt: int) -> float:
+        """
+        Return the delay in seconds before retrying after the given failed attempt (1-based).
+        """
+        raw = min(self.backoff_cap, self.backoff_base * (2 ** (attempt - 1)))
+        if self.jitter:
+            return raw / 2 + random.uniform(0, raw / 2)
+        return raw
+
+    def is_retryable(self, error: BaseException) -> bool:
+        """
+        Return True if the error (or any exception in its cause chain) matches the
+        policy. Errors marked `retryable = True` always are, and errors marked
+        `retryable = False` never are.
+        """
+        retry_on = set(self.retry_on)
+        retry_on_status = set(self.retry_on_status)
+        matched = False
+        for exc in _error_chain(error):
+            retryable = getattr(exc, "retryable", None)
+            if retryable is False:
+                return False
+            if retryable is True:
+                matched = True
+            if any(cls.__name__ in retry_on for cls in type(exc).__mro__):
+                matched = True
+            status_code = getattr(exc, "status_code", None)
+            if isinstance(status_code, int) and status_code in retry_on_status:
+                matched = True
+        return matched
+
+
+def _error_chain(error: BaseException) -> Iterator[BaseException]:
+    seen: List[int] = []
+    current: Optional[BaseException] = error
+    while current is not None and id(current) not in seen:
+        seen.append(id(current))
+        yield current
+        current = current.__cause__ or current.__context__
+
+
+def error_status_code(error: BaseException) -> Optional[int]:
+    """
+    Return the first HTTP status code (`status_code` attribute) in the error's cause chain.
+    """
+    for exc in _error_chain(error):
+        status_code = getattr(exc, "status_code", None)
+        if isinstance(status_code, int):
+            return status_code
+    return None
+
+
+def _retry_after(error: BaseException) -> float:
+    """Return the longest `retry_after` (seconds) requested in the error's cause chain."""
+    delays = [getattr(exc, "retry_after", None) for exc in _error_chain(error)]
+    return max((float(delay) for delay in delays if isinstance(delay, (int, float))), default=0.0)
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """
+    Return True if the error is transient under the default policy (timeouts,
+    connection errors, 408/429/5xx responses).
+    """
+    return _DEFAULT_POLICY.is_retryable(error)
+
+
+_DEFAULT_POLICY = RetryPolicy()
+
+
+def resolve_retry_policy(
+    step_type: str,
+    step_retry: Optional[Union[RetryPolicy, Mapping[str, Any]]],
+    config: Mapping[str, Any],
+) -> Optional[RetryPolicy]:
+    """
+    Combine a step's `retry` block with the `step_retry` default from the context
+    config. Fields set on the step override the default. Returns None when the step
+    is not retried.
+
+    Raises:
+        ValueError: If the policy is invalid.
+    """
+    default = config.get("step_retry")
+    if isinstance(default, str):
+        try:
+            default = json.loads(default)
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"Invalid step_retry JSON: {exc}")
+
+    if step_retry is None and (not default or step_type in CONTAINER_STEP_TYPES):
+        return None
+
+    values: Dict[str, Any] = {}
+    if default:
+        values.update(default.model_dump(exclude_unset=True) if isinstance(default, RetryPolicy) else dict(default))
+    if step_retry is not None:
+        values.update(
+            step_retry.model_dump(exclude_unset=True) if isinstance(step_retry, RetryPolicy) else dict(step_retry)
+        )
+    try:
+        policy = RetryPolicy.model_validate(values)
+    except Exception as exc:
+        raise ValueError(f"Invalid retry policy for step '{step_type}': {exc}") from exc
+    return policy if policy.max_attempts > 1 else None
+
+
+_stats_lock = threading.Lock()
+_stats: Dict[str, float] = {"retries": 0, "recovered": 0, "exhausted": 0, "time_lost_seconds": 0.0}
+
+
+def _record(**increments: float) -> None:
+    with _stats_lock:
+        for name, amount in increments.items():
+            _stats[name] += amount
+
+
+async def run_with_retry(
+    operation: Callable[[], Awaitable[T]],
+    policy: Optional[RetryPolicy],
+    logger: logging.Logger,
+    label: str,
+) -> T:
+    """
+    Run `operation`, retrying it according to `policy`. A retry waits for the backoff
+    delay, or longer if the error asks for it (`retry_after`). Time spent in failed
+    attempts and waiting is recorded as time lost. The last error is re-raised when
+    the error is not retryable or attempts are exhausted.
+    """
+    if policy is None:
+        return await operation()
+
+    attempt = 1
+    while True:
+        start = time.monotonic()
+        try:
+            result = await operation()
+        except Exception as exc:
+            lost = time.monotonic() - start
+            if not policy.is_retryable(exc):
+                if attempt > 1:
+                    _record(time_lost_seconds=lost)
+                raise
+            if attempt >= policy.max_attempts:
+                _record(exhausted=1, time_lost_seconds=lost)
+                logger.error("%s failed after %d attempts: %s", label, attempt, exc)
+                raise
+            delay = max(policy.delay(attempt), _retry_after(exc))
+            logger.warning(
+                "%s failed on attempt %d/%d (%s); retrying in %.2f sec",
+                label,
+                attempt,
+                policy.max_attempts,
+                exc,
+                delay,
+            )
+            _record(retries=1, time_lost_seconds=lost + delay)
+            await asyncio.sleep(delay)
+            attempt += 1
+            continue
+        if attempt > 1:
+            _record(recovered=1)
+            logger.info("%s succeeded on attempt %d", label, attempt)
+        return result
+
+
+def retry_stats() -> Dict[str, Any]:
+    """
+    Return process-wide retry metrics: retries performed, steps that recovered,
+    steps that exhausted their attempts and the seconds lost to failed attempts and backoff.
+    """
+    with _stats_lock:
+        return {
+            "retries": int(_stats["retries"]),
+            "recovered": int(_stats["recovered"]),
+            "exhausted": int(_stats["exhausted"]),
+            "time_lost_seconds": round(_stats["time_lost_seconds"], 3),
+        }
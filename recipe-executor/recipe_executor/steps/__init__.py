@@ -1,17 +1,7 @@
 # This file was generated by Codebase-Generator, do not edit directly
+from typing import Any, Dict
 
 from recipe_executor.steps.registry import STEP_REGISTRY
-from recipe_executor.steps.conditional import ConditionalStep
-from recipe_executor.steps.docpack_create import DocpackCreateStep
-from recipe_executor.steps.docpack_extract import DocpackExtractStep
-from recipe_executor.steps.execute_recipe import ExecuteRecipeStep
-from recipe_executor.steps.llm_generate import LLMGenerateStep
-from recipe_executor.steps.loop import LoopStep
-from recipe_executor.steps.mcp import MCPStep
-from recipe_executor.steps.parallel import ParallelStep
-from recipe_executor.steps.read_files import ReadFilesStep
-from recipe_executor.steps.set_context import SetContextStep
-from recipe_executor.steps.write_files import WriteFilesStep
 
 __all__ = [
     "STEP_REGISTRY",
@@ -19,6 +9,7 @@ __all__ = [
     "DocpackCreateStep",
     "DocpackExtractStep",
     "ExecuteRecipeStep",
+    "IncrementalStep",
     "LLMGenerateStep",
     "LoopStep",
     "MCPStep",
@@ -28,17 +19,34 @@ __all__ = [
     "WriteFilesStep",
 ]
 
-# Register steps by updating the registry
-STEP_REGISTRY.update({
-    "conditional": ConditionalStep,
-    "docpack_create": DocpackCreateStep,
-    "docpack_extract": DocpackExtractStep,
-    "execute_recipe": ExecuteRecipeStep,
-    "llm_generate": LLMGenerateStep,
-    "loop": LoopStep,
-    "mcp": MCPStep,
-    "parallel": ParallelStep,
-    "read_files": ReadFilesStep,
-    "set_context": SetContextStep,
-    "write_files": WriteFilesStep,
-})
+# Step types and the classes implementing them; a step module is imported the
+# first time its type is looked up in the registry
+_STEP_SPECS: Dict[str, str] = {
+    "conditional": "recipe_executor.steps.conditional:ConditionalStep",
+    "docpack_create": "recipe_executor.steps.docpack_create:DocpackCreateStep",
+    "docpack_extract": "recipe_executor.steps.docpack_extract:DocpackExtractStep",
+    "execute_recipe": "recipe_executor.steps.execute_recipe:ExecuteRecipeStep",
+    "incremental": "recipe_executor.steps.incremental:IncrementalStep",
+    "llm_generate": "recipe_executor.steps.llm_generate:LLMGenerateStep",
+    "loop": "recipe_executor.steps.loop:LoopStep",
+    "mcp": "recipe_executor.steps.mcp:MCPStep",
+    "parallel": "recipe_executor.steps.parallel:ParallelStep",
+    "read_files": "recipe_executor.steps.read_files:ReadFilesStep",
+    "set_context": "recipe_executor.steps.set_context:SetContextStep",
+    "write_files": "recipe_executor.steps.write_files:WriteFilesStep",
+}
+
+# Register steps without importing them
+for _name, _spec in _STEP_SPECS.items():
+    STEP_REGISTRY.register_lazy(_name, _spec)
+del _name, _spec
+
+_STEP_TYPES: Dict[str, str] = {spec.partition(":")[2]: name for name, spec in _STEP_SPECS.items()}
+
+
+def __getattr__(name: str) -> Any:
+    # Step classes are re-exported on first access (`from recipe_executor.steps import LoopStep`)
+    step_type = _STEP_TYPES.get(name)
+    if step_type is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return STEP_REGISTRY[step_type]
@@ -7,7 +7,7 @@ Defines a generic BaseStep class and the base Pydantic StepConfig.
 from __future__ import annotations
 
 import logging
-from typing import Generic, TypeVar
+from typing import ClassVar, Generic, TypeVar
 
 from pydantic import BaseModel
 
@@ -36,8 +36,15 @@ class BaseStep(Generic[StepConfigType]):
     Each step must implement the async execute method.
     Subclasses should call super().__init__ in their constructor,
     passing a logger and an instance of a StepConfig subclass.
+
+    A step object is built once per compiled step and reused for every execution
+    (see `recipe_cache`), possibly by concurrent loop items: `execute` renders the
+    templated config fields per call and must not keep per-execution state on the
+    object. Steps that do set `reusable = False`.
     """
 
+    reusable: ClassVar[bool] = True
+
     def __init__(
         self,
         logger: logging.Logger,
@@ -52,8 +59,8 @@ class BaseStep(Generic[StepConfigType]):
         """
         self.logger: logging.Logger = logger
         self.config: StepConfigType = config
-        # Log initialization with debug-level detail
-        self.logger.debug(f"Initialized {self.__class__.__name__} with config: {self.config!r}")
+        # Log initialization with debug-level detail; the config repr is only built when debug is on
+        self.logger.debug("Initialized %s with config: %r", self.__class__.__name__, self.config)
 
     async def execute(self, context: ContextProtocol) -> None:
         """
@@ -1,12 +1,23 @@
 # This file was generated by Codebase-Generator, do not edit directly
+import functools
 import logging
 import os
 import re
 from typing import Any, Dict, Optional, List
 
+from recipe_executor.checkpoint import (
+    current_checkpointer,
+    current_step_path,
+    replay_scope,
+    replaying,
+    step_scope,
+)
 from recipe_executor.protocols import ContextProtocol
+from recipe_executor.recipe_cache import CompiledStep, compile_step
+from recipe_executor.retry import resolve_retry_policy, run_with_retry
 from recipe_executor.steps.base import BaseStep, StepConfig
 from recipe_executor.steps.registry import STEP_REGISTRY
+from recipe_executor.tracing import trace_span
 from recipe_executor.utils.templates import render_template
 
 
@@ -151,6 +162,8 @@ class ConditionalStep(BaseStep[ConditionalConfig]):
     ) -> None:
         config_model = ConditionalConfig.model_validate(config)
         super().__init__(logger, config_model)
+        # Branch steps compiled on first execution of the branch (None for invalid definitions)
+        self._branches: Dict[str, List[Optional[CompiledStep]]] = {}
 
     async def execute(self, context: ContextProtocol) -> None:
         expr = self.config.condition
@@ -160,8 +173,16 @@ class ConditionalStep(BaseStep[ConditionalConfig]):
         except ValueError as err:
             raise RuntimeError(f"Condition evaluation error: {err}")
 
-        branch_conf = self.config.if_true if result else self.config.if_false
         branch_name = "if_true" if result else "if_false"
+        # A resumed run follows the branch taken by the previous attempt
+        checkpointer = current_checkpointer()
+        if checkpointer is not None:
+            recorded = checkpointer.record_branch(current_step_path(), context, branch_name)
+            if recorded != branch_name:
+                self.logger.info("Condition '%s' now selects '%s'; resuming '%s' branch", expr, branch_name, recorded)
+                branch_name = recorded
+                result = branch_name == "if_true"
+        branch_conf = self.config.if_true if result else self.config.if_false
         self.logger.debug(
             "Condition '%s' is %s, executing '%s' branch",
             expr,
@@ -173,7 +194,8 @@ class ConditionalStep(BaseStep[ConditionalConfig]):
         if branch_conf and isinstance(branch_conf, dict):
             steps: Any = branch_conf.get("steps")
             if isinstance(steps, list) and steps:
-                await self._execute_branch(branch_conf, context)
+                with step_scope(branch_name), trace_span(f"branch {branch_name}", "branch", condition=str(expr)):
+                    await self._execute_branch(branch_name, branch_conf, context)
                 return
 
         # Nothing to execute
@@ -185,6 +207,7 @@ class ConditionalStep(BaseStep[ConditionalConfig]):
 
     async def _execute_branch(
         self,
+        branch_name: str,
         branch: Dict[str, Any],
         context: ContextProtocol,
     ) -> None:
@@ -196,24 +219,51 @@ class ConditionalStep(BaseStep[ConditionalConfig]):
             self.logger.debug("Branch 'steps' is not a list, skipping execution")
             return
 
-        for step_def in steps:
-            if not isinstance(step_def, dict):
-                self.logger.debug("Skipping invalid step definition: %s", step_def)
+        compiled = self._branches.get(branch_name)
+        if compiled is None:
+            compiled = [compile_step(step_def) if isinstance(step_def, dict) else None for step_def in steps]
+            self._branches[branch_name] = compiled
+
+        checkpointer = current_checkpointer()
+        resuming = replaying()
+        for idx, step in enumerate(compiled):
+            if step is None:
+                self.logger.debug("Skipping invalid step definition: %s", steps[idx])
                 continue
 
-            step_type = step_def.get("type")
-            step_conf = step_def.get("config") or {}
+            step_type = step.type
             if not step_type:
                 self.logger.debug("Step definition missing 'type', skipping")
                 continue
 
-            step_cls = STEP_REGISTRY.get(step_type)
-            if step_cls is None:
+            if step.resolve_class() is None:
                 raise RuntimeError(f"Unknown step type in conditional branch: {step_type}")
 
-            self.logger.debug("Executing step '%s' in conditional branch", step_type)
-            step_instance = step_cls(self.logger, step_conf)
-            await step_instance.execute(context)
+            with (
+                step_scope(str(idx)) as path,
+                replay_scope(resuming),
+                trace_span(f"step {idx}: {step_type}", "step", index=idx, type=step_type),
+            ):
+                # Steps completed in a previous attempt of a checkpointed run are skipped
+                if checkpointer is not None:
+                    if checkpointer.is_complete(path, context):
+                        self.logger.debug("Skipping step '%s' in conditional branch: already completed", step_type)
+                        continue
+                    checkpointer.mark_started(path, context)
+                resuming = False
+
+                self.logger.debug("Executing step '%s' in conditional branch", step_type)
+                step_instance = step.instantiate(self.logger)
+                policy = resolve_retry_policy(step_type, step.retry, context.get_config())
+                await run_with_retry(
+                    functools.partial(step_instance.execute, context),
+                    policy,
+                    self.logger,
+                    f"Conditional branch step {idx} ('{step_type}')",
+                )
+
+                if checkpointer is not None:
+                    checkpointer.mark_complete(path, context)
 
 
 # Register the conditional step
@@ -8,6 +8,7 @@ import tempfile
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Union
 
+from recipe_executor.context import peek
 from recipe_executor.protocols import ContextProtocol
 from recipe_executor.steps.base import BaseStep, StepConfig
 from recipe_executor.utils.templates import render_template
@@ -83,7 +84,7 @@ class DocpackCreateStep(BaseStep[DocpackCreateConfig]):
             # Detect a pure template for a list
             if resources_str.startswith("{{") and resources_str.endswith("}}"):
                 var = resources_str[2:-2].strip()
-                val = context.get(var)
+                val = peek(context, var)
                 if isinstance(val, list):  # preserve list structure
                     entries = val
                 else:
@@ -62,9 +62,11 @@ class DocpackExtractStep(BaseStep[DocpackExtractConfig]):
         extract_dir = Path(raw_extract)
 
         self.logger.debug(
-            f"DocpackExtractStep config resolved: docpack_path={docpack_path}, "
-            f"extract_dir={extract_dir}, outline_key={outline_key}, "
-            f"resources_key={resources_key}"
+            "DocpackExtractStep config resolved: docpack_path=%s, extract_dir=%s, outline_key=%s, resources_key=%s",
+            docpack_path,
+            extract_dir,
+            outline_key,
+            resources_key,
         )
 
         # Validate .docpack file exists and is a file
@@ -112,10 +114,10 @@ class DocpackExtractStep(BaseStep[DocpackExtractConfig]):
                             item["path"] = str(new_path.resolve())  # type: ignore
         except Exception as e:
             # Non-fatal normalization error
-            self.logger.debug(f"Error normalizing resource paths: {e}")
+            self.logger.debug("Error normalizing resource paths: %s", e)
 
         # Debug log of extracted files
-        self.logger.debug(f"Extracted resource files: {abs_resources}")
+        self.logger.debug("Extracted resource files: %s", abs_resources)
 
         # Store results in context for subsequent steps
         context[outline_key] = outline_data
@@ -5,6 +5,7 @@ import logging
 from typing import Any, Dict
 
 from recipe_executor.steps.base import BaseStep, StepConfig
+from recipe_executor.checkpoint import step_scope
 from recipe_executor.protocols import ContextProtocol
 from recipe_executor.utils.templates import render_template
 
@@ -89,7 +90,8 @@ class ExecuteRecipeStep(BaseStep[ExecuteRecipeConfig]):
 
             self.logger.info(f"Starting sub-recipe execution: {rendered_path}")
             executor = Executor(self.logger)
-            await executor.execute(rendered_path, context)
+            with step_scope(f"recipe:{rendered_path}"):
+                await executor.execute(rendered_path, context)
             self.logger.info(f"Completed sub-recipe execution: {rendered_path}")
         except Exception as exc:
             self.logger.error(f"Error executing sub-recipe '{rendered_path}': {exc}")
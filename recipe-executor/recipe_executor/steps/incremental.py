@@ -0,0 +1,206 @@
+# This file was generated by Codebase-Generator, do not edit directly
+"""
+IncrementalStep runs its substeps as a build target and skips them when nothing
+they consume has changed since the last successful build (see `build_manifest`).
+"""
+
+import asyncio
+import functools
+import logging
+import os
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from recipe_executor.build_manifest import (
+    BuildRecord,
+    build_scope,
+    count_target,
+    current_build,
+    file_digest,
+    get_build_manifest,
+    input_hash,
+    target_override,
+    value_digest,
+)
+from recipe_executor.checkpoint import current_checkpointer, replay_scope, replaying, step_scope
+from recipe_executor.context import peek
+from recipe_executor.protocols import ContextProtocol
+from recipe_executor.recipe_cache import CompiledStep, compile_step
+from recipe_executor.retry import resolve_retry_policy, run_with_retry
+from recipe_executor.steps.base import BaseStep, StepConfig
+from recipe_executor.steps.registry import STEP_REGISTRY
+from recipe_executor.tracing import set_span_attribute, trace_span
+from recipe_executor.utils.appends import flush_appends
+from recipe_executor.utils.templates import render_template
+
+__all__ = ["IncrementalConfig", "IncrementalStep"]
+
+
+class IncrementalConfig(StepConfig):
+    """
+    Config for IncrementalStep.
+
+    Fields:
+        target: Name of the build target in the manifest (templated), e.g. a component id.
+        manifest_path: Path of the JSON build manifest (templated); targets may share one.
+        substeps: Steps producing the target, run in order on the shared context.
+        force: Rebuild even if the target is up to date (bool or templated string).
+    """
+
+    target: str
+    manifest_path: str
+    substeps: List[Dict[str, Any]]
+    force: Union[bool, str] = False
+
+
+class IncrementalStep(BaseStep[IncrementalConfig]):
+    """
+    Step that rebuilds a target only when its inputs changed.
+
+    The context keys the substeps read are inferred by the planner; their values,
+    the substep definitions and the content of every file read while the target was
+    built make up its input hash. When the hash matches the manifest entry and the
+    recorded outputs still exist, the substeps are skipped and the outputs kept.
+    """
+
+    def __init__(self, logger: logging.Logger, config: Dict[str, Any]) -> None:
+        validated = IncrementalConfig.model_validate(config)
+        super().__init__(logger, validated)
+        # Substeps compiled on first build, reused by later builds
+        self._compiled: Optional[Tuple[CompiledStep, ...]] = None
+
+    async def execute(self, context: ContextProtocol) -> None:
+        target = render_template(self.config.target, context)
+        manifest_path = render_template(self.config.manifest_path, context)
+        force = self.config.force
+        if isinstance(force, str):
+            force = render_template(force, context).strip().lower() in ("true", "1", "yes")
+
+        override = target_override(target)
+        if override == "exclude":
+            self.logger.info("Skipping target '%s': not selected by --only", target)
+            set_span_attribute("skipped", True)
+            count_target("excluded")
+            return
+
+        # Import here to avoid circular dependencies
+        from recipe_executor.planner import ANY_KEY, FILESYSTEM, analyze_steps
+
+        # Context values read by the substeps (not written by an earlier substep first)
+        access = analyze_steps(((str(s.get("type")), s.get("config") or {}) for s in self.config.substeps), context)
+        keys = sorted(access.reads - {FILESYSTEM})
+        tracked = ANY_KEY not in access.reads
+        context_digests = {key: value_digest(peek(context, key)) for key in keys} if tracked else {}
+        steps_digest = value_digest(self.config.substeps)
+
+        manifest = get_build_manifest(manifest_path)
+        entry = manifest.get(target)
+        if force or override == "force":
+            reason: Optional[str] = "forced"
+        elif not tracked:
+            reason = "context keys read by its substeps cannot be inferred"
+        else:
+            reason = await asyncio.to_thread(_stale_reason, entry, steps_digest, context_digests)
+
+        parent = current_build()
+        if reason is None and entry is not None:
+            self.logger.info("Target '%s' is up to date; keeping %d output(s)", target, len(entry.get("outputs") or {}))
+            set_span_attribute("skipped", True)
+            count_target("kept")
+            if parent is not None:
+                parent.merge_entry(entry)
+            return
+
+        self.logger.info("Building target '%s' (%s)", target, reason)
+        record = BuildRecord()
+        try:
+            with build_scope(record):
+                await self._execute_substeps(context)
+        except BaseException:
+            # Outputs of a failed build may be partially replaced: never keep them as up to date
+            manifest.put(target, None)
+            raise
+
+        new_entry = await asyncio.to_thread(_entry_for, record, steps_digest, context_digests)
+        if tracked:
+            manifest.put(target, new_entry)
+        count_target("built")
+        if parent is not None:
+            parent.merge_entry(new_entry)
+
+    async def _execute_substeps(self, context: ContextProtocol) -> None:
+        if self._compiled is None:
+            self._compiled = tuple(compile_step(step_def) for step_def in self.config.substeps)
+
+        checkpointer = current_checkpointer()
+        resuming = replaying()
+        for idx, step in enumerate(self._compiled):
+            step_type = step.type
+            if step.resolve_class() is None:
+                raise RuntimeError(f"Unknown step type in incremental target: {step_type}")
+
+            with (
+                step_scope(str(idx)) as path,
+                replay_scope(resuming),
+                trace_span(f"step {idx}: {step_type}", "step", index=idx, type=step_type),
+            ):
+                # Steps completed in a previous attempt of a checkpointed run are skipped
+                if checkpointer is not None:
+                    if checkpointer.is_complete(path, context):
+                        self.logger.debug("Skipping step '%s' in incremental target: already completed", step_type)
+                        continue
+                    checkpointer.mark_started(path, context)
+                resuming = False
+
+                step_instance = step.instantiate(self.logger)
+                policy = resolve_retry_policy(step_type, step.retry, context.get_config())
+                await run_with_retry(
+                    functools.partial(step_instance.execute, context),
+                    policy,
+                    self.logger,
+                    f"Incremental target step {idx} ('{step_type}')",
+                )
+
+                if checkpointer is not None:
+                    checkpointer.mark_complete(path, context)
+
+
+def _stale_reason(entry: Optional[Dict[str, Any]], steps_digest: str, context_digests: Dict[str, str]) -> Optional[str]:
+    """Return why a target must be rebuilt, or None if its manifest entry is up to date."""
+    if entry is None:
+        return "not built before"
+    if entry.get("steps") != steps_digest:
+        return "steps changed"
+    recorded_context: Dict[str, str] = entry.get("context") or {}
+    for key in sorted(set(recorded_context) | set(context_digests)):
+        if recorded_context.get(key) != context_digests.get(key):
+            return f"context value '{key}' changed"
+    for path in entry.get("outputs") or {}:
+        if not os.path.exists(path):
+            return f"output '{path}' missing"
+    files: Dict[str, Optional[str]] = {}
+    for path, digest in (entry.get("files") or {}).items():
+        files[path] = file_digest(path)
+        if files[path] != digest:
+            return f"input '{path}' changed"
+    if entry.get("input_hash") != input_hash(steps_digest, context_digests, files):
+        return "input hash changed"
+    return None
+
+
+def _entry_for(record: BuildRecord, steps_digest: str, context_digests: Dict[str, str]) -> Dict[str, Any]:
+    """Hash the inputs and outputs observed while the target was built."""
+    # Buffered appends must be on disk before their files are hashed
+    flush_appends(sync=False)
+    files = {path: file_digest(path) for path in record.files}
+    return {
+        "steps": steps_digest,
+        "context": context_digests,
+        "files": files,
+        "outputs": {path: file_digest(path) for path in record.outputs},
+        "llm_calls": record.llm_calls,
+        "input_hash": input_hash(steps_digest, context_digests, files),
+    }
+
+
+# Register the incremental step
+STEP_REGISTRY["incremental"] = IncrementalStep
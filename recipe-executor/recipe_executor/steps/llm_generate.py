@@ -25,6 +25,8 @@ class LLMGenerateConfig(StepConfig):
         openai_builtin_tools: Built-in OpenAI tools for Responses API models.
         output_format: The format of the LLM output (text, files, or JSON/list schemas).
         output_key: The name under which to store the LLM output in context.
+        cache: Result cache mode when `llm_cache_dir` is configured: "read" (default),
+            "write" (always call the model and refresh the entry) or "off".
     """
 
     prompt: str
@@ -34,6 +36,7 @@ class LLMGenerateConfig(StepConfig):
     openai_builtin_tools: Optional[List[Dict[str, Any]]] = None
     output_format: Union[str, Dict[str, Any], List[Any]]
     output_key: str = "llm_output"
+    cache: Optional[str] = None
 
 
 class FileSpecCollection(BaseModel):  # used for "files" output
@@ -70,12 +73,15 @@ class LLMGenerateStep(BaseStep[LLMGenerateConfig]):
 
     def __init__(self, logger: logging.Logger, config: Dict[str, Any]) -> None:
         super().__init__(logger, LLMGenerateConfig(**config))
+        # Pydantic model of a JSON object/list output_format, built on first use
+        self._schema_model: Optional[Type[BaseModel]] = None
 
     async def execute(self, context: ContextProtocol) -> None:
         # Render templated fields
         prompt: str = render_template(self.config.prompt, context)
         model_id: str = render_template(self.config.model, context)
         output_key: str = render_template(self.config.output_key, context)
+        cache_mode: Optional[str] = render_template(self.config.cache, context) if self.config.cache else None
 
         # Parse max_tokens
         raw_max = self.config.max_tokens
@@ -143,6 +149,7 @@ class LLMGenerateStep(BaseStep[LLMGenerateConfig]):
                     output_type=str,
                     max_tokens=max_tokens,
                     openai_builtin_tools=validated_tools,
+                    cache=cache_mode,
                 )
                 context[output_key] = result
 
@@ -152,18 +159,22 @@ class LLMGenerateStep(BaseStep[LLMGenerateConfig]):
                     output_type=FileSpecCollection,
                     max_tokens=max_tokens,
                     openai_builtin_tools=validated_tools,
+                    cache=cache_mode,
                 )
                 # Ensure correct type
                 assert isinstance(result, FileSpecCollection), f"Expected FileSpecCollection, got {type(result)}"
                 context[output_key] = result.files
 
             elif isinstance(output_format, dict):  # JSON object schema
-                schema_model: Type[BaseModel] = json_object_to_pydantic_model(output_format, model_name="LLMObject")
+                if self._schema_model is None:
+                    self._schema_model = json_object_to_pydantic_model(output_format, model_name="LLMObject")
+                schema_model: Type[BaseModel] = self._schema_model
                 result = await llm.generate(
                     prompt,
                     output_type=schema_model,
                     max_tokens=max_tokens,
                     openai_builtin_tools=validated_tools,
+                    cache=cache_mode,
                 )
                 if not isinstance(result, BaseModel):
                     raise ValueError(f"Expected BaseModel for object output, got {type(result)}")
@@ -178,12 +189,15 @@ class LLMGenerateStep(BaseStep[LLMGenerateConfig]):
                     "properties": {"items": {"type": "array", "items": item_schema}},
                     "required": ["items"],
                 }
-                schema_model = json_object_to_pydantic_model(wrapper_schema, model_name="LLMListWrapper")
+                if self._schema_model is None:
+                    self._schema_model = json_object_to_pydantic_model(wrapper_schema, model_name="LLMListWrapper")
+                schema_model = self._schema_model
                 result = await llm.generate(
                     prompt,
                     output_type=schema_model,
                     max_tokens=max_tokens,
                     openai_builtin_tools=validated_tools,
+                    cache=cache_mode,
                 )
                 if not isinstance(result, BaseModel):
                     raise ValueError(f"Expected BaseModel for list output, got {type(result)}")
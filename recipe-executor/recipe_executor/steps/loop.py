@@ -2,40 +2,95 @@
 """
 LoopStep: iterate over a collection of items and execute substeps for each item.
 Supports template rendering, context isolation, error handling, and configurable concurrency.
+Items that declare dependencies on each other run in a topological schedule.
+Items can also be streamed from a JSON Lines file, a text file or a glob pattern.
 """
 
 import asyncio
+import glob
+import heapq
+import json
 import logging
-from typing import Any, Dict, List, Optional, Tuple, Union
-
+import os
+import sys
+import time
+from typing import Any, Dict, Iterator, List, Literal, Optional, Set, TextIO, Tuple, Union
+
+from recipe_executor.build_manifest import record_file_read
+from recipe_executor.checkpoint import current_checkpointer, current_step_path, step_scope
+from recipe_executor.concurrency import AdaptiveConcurrency, AdaptiveConcurrencyConfig, adaptive_scope
+from recipe_executor.context import peek
 from recipe_executor.protocols import ContextProtocol
+from recipe_executor.recipe_cache import CompiledRecipe, compile_steps
 from recipe_executor.steps.base import BaseStep, StepConfig
+from recipe_executor.tracing import set_span_attribute, trace_span
 from recipe_executor.utils.templates import render_template
+from recipe_executor.utils.text import json_default
 
 __all__ = ["LoopStep", "LoopStepConfig"]
 
+# Outcome of one item: key, result, error message and duration in seconds
+ItemOutcome = Tuple[Any, Any, Optional[str], float]
+
 
 class LoopStepConfig(StepConfig):
     """
     Configuration for LoopStep.
 
     Fields:
-        items: Union[str, List[Any], Dict[Any, Any]]
+        items: Optional[Union[str, List[Any], Dict[Any, Any]]] = None
+        source: Optional[str] = None
+        source_format: Optional[Literal["jsonl", "lines", "glob"]] = None
         item_key: str
         max_concurrency: int = 1
         delay: float = 0.0
         substeps: List[Dict[str, Any]]
         result_key: str
         fail_fast: bool = True
+        depends_on: Optional[str] = None
+        id_key: Optional[str] = None
+        preserve_order: bool = False
+        output_path: Optional[str] = None
+        history: Literal["full", "compact", "off"] = "full"
+        adaptive_concurrency: Optional[AdaptiveConcurrencyConfig] = None
+
+    Exactly one of `items` and `source` is set. `source` (templated) streams the items
+    instead of resolving an in-memory collection: one JSON value per line of a JSON
+    Lines file ("jsonl"), one string per line of a text file ("lines") or one path per
+    match of a glob pattern ("glob"). Without `source_format` the format is "glob" if the
+    source contains a wildcard, "jsonl" for `.jsonl` / `.ndjson` files and "lines"
+    otherwise. Items are read only when a slot among `max_concurrency` frees up.
+
+    When `depends_on` is set, it is the dot path (within each item) of the ids of the
+    items it depends on; items are identified by `id_key` (a dot path within each item)
+    or by their list index / dict key. Items then start only after their dependencies
+    completed, up to `max_concurrency` at a time, longest remaining dependency chain first.
+
+    `preserve_order` emits results in input order instead of completion order.
+    `output_path` (templated) streams each result as a JSON line to a file instead of
+    keeping it in memory; `result_key` then holds the file path. `history` selects
+    what `<result_key>__history` records: every result ("full"), only the key, status
+    and duration of each item ("compact") or nothing ("off").
+
+    `adaptive_concurrency` replaces the fixed `max_concurrency` with a limit that
+    follows the observed latency, failures and rate-limit responses (see `concurrency`).
     """
 
-    items: Union[str, List[Any], Dict[Any, Any]]
+    items: Optional[Union[str, List[Any], Dict[Any, Any]]] = None
+    source: Optional[str] = None
+    source_format: Optional[Literal["jsonl", "lines", "glob"]] = None
     item_key: str
     max_concurrency: int = 1
     delay: float = 0.0
     substeps: List[Dict[str, Any]]
     result_key: str
     fail_fast: bool = True
+    depends_on: Optional[str] = None
+    id_key: Optional[str] = None
+    preserve_order: bool = False
+    output_path: Optional[str] = None
+    history: Literal["full", "compact", "off"] = "full"
+    adaptive_concurrency: Optional[AdaptiveConcurrencyConfig] = None
 
 
 class LoopStep(BaseStep[LoopStepConfig]):
@@ -47,6 +102,8 @@ class LoopStep(BaseStep[LoopStepConfig]):
     def __init__(self, logger: logging.Logger, config: Dict[str, Any]) -> None:
         validated = LoopStepConfig.model_validate(config)
         super().__init__(logger, validated)
+        # Substeps compiled on first execution, shared by every item of every execution
+        self._plan: Optional[CompiledRecipe] = None
 
     async def execute(self, context: ContextProtocol) -> None:
         """
@@ -58,153 +115,474 @@ class LoopStep(BaseStep[LoopStepConfig]):
 
         cfg: LoopStepConfig = self.config
         raw_items = cfg.items
+        max_conc: int = cfg.max_concurrency
 
-        # Resolve items: template rendering if string, then path lookup
-        if isinstance(raw_items, str):  # type: ignore
-            rendered: str = render_template(raw_items, context)
-            items_obj: Any = _resolve_path(rendered, context)
-        else:
-            items_obj = raw_items  # type: ignore
-
-        # Validate resolved collection
-        if items_obj is None:
-            raise ValueError(f"LoopStep: Items '{raw_items}' not found in context.")
-        if not isinstance(items_obj, (list, dict)):
-            raise ValueError(f"LoopStep: Items must be a list or dict, got {type(items_obj).__name__}.")
-
-        # Prepare iterable list of (key, value)
-        if isinstance(items_obj, list):
-            items_list: List[Tuple[int, Any]] = list(enumerate(items_obj))
+        items_list: List[Tuple[Any, Any]] = []
+        source_iter: Optional[Iterator[Tuple[int, Any]]] = None
+        total: Optional[int] = None
+        if cfg.source:
+            if raw_items is not None:
+                raise ValueError("LoopStep: Set either 'items' or 'source', not both.")
+            if cfg.depends_on:
+                raise ValueError("LoopStep: 'depends_on' requires in-memory 'items', not a 'source'.")
+            source = render_template(cfg.source, context)
+            source_format = cfg.source_format or _source_format(source)
+            if source_format != "glob" and not os.path.isfile(source):
+                raise ValueError(f"LoopStep: Item source '{source}' not found.")
+            if source_format != "glob":
+                record_file_read(source)
+            # Streamed items are pulled one at a time and numbered like a list
+            source_iter = _iter_source(source, source_format)
+            items_iter: Iterator[Tuple[Any, Any]] = source_iter
+            is_list = True
+            self.logger.info(
+                f"LoopStep: Starting processing of items from {source_format} source '{source}' "
+                f"(max_concurrency={max_conc})."
+            )
         else:
-            items_list = list(items_obj.items())  # type: ignore
+            if raw_items is None:
+                raise ValueError("LoopStep: Either 'items' or 'source' is required.")
 
-        total: int = len(items_list)
-        max_conc: int = cfg.max_concurrency
-        self.logger.info(f"LoopStep: Starting processing of {total} items (max_concurrency={max_conc}).")
+            # Resolve items: template rendering if string, then path lookup
+            if isinstance(raw_items, str):  # type: ignore
+                rendered: str = render_template(raw_items, context)
+                items_obj: Any = _resolve_path(rendered, context)
+            else:
+                items_obj = raw_items  # type: ignore
+
+            # Validate resolved collection
+            if items_obj is None:
+                raise ValueError(f"LoopStep: Items '{raw_items}' not found in context.")
+            if not isinstance(items_obj, (list, dict)):
+                raise ValueError(f"LoopStep: Items must be a list or dict, got {type(items_obj).__name__}.")
+
+            # Prepare iterable list of (key, value)
+            is_list = isinstance(items_obj, list)
+            if is_list:
+                items_list = list(enumerate(items_obj))
+            else:
+                items_list = list(items_obj.items())  # type: ignore
+            items_iter = iter(items_list)
+
+            total = len(items_list)
+            self.logger.info(f"LoopStep: Starting processing of {total} items (max_concurrency={max_conc}).")
+
+        # Streamed results go to a JSON Lines file instead of the context
+        output_path: Optional[str] = None
+        sink: Optional[TextIO] = None
+        if cfg.output_path:
+            output_path = render_template(cfg.output_path, context)
+            directory = os.path.dirname(output_path)
+            try:
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                sink = open(output_path, "w", encoding="utf-8")
+            except OSError as err:
+                raise IOError(f"LoopStep: Cannot open output file '{output_path}': {err}")
 
         # Handle empty collection
         if total == 0:
-            empty_res: Union[List[Any], Dict[Any, Any]] = [] if isinstance(items_obj, list) else {}
-            context[cfg.result_key] = empty_res
+            empty_res: Union[List[Any], Dict[Any, Any]] = [] if is_list else {}
+            if sink is not None:
+                sink.close()
+            context[cfg.result_key] = output_path if output_path is not None else empty_res
             context[f"{cfg.result_key}__errors"] = []
             context[f"{cfg.result_key}__history"] = []
             self.logger.info("LoopStep: No items to process.")
             return
 
         # Containers for results
-        results: Union[List[Any], Dict[Any, Any]] = [] if isinstance(items_obj, list) else {}
+        results: Union[List[Any], Dict[Any, Any]] = [] if is_list else {}
         errors: List[Dict[str, Any]] = []
         history: List[Dict[str, Any]] = []
 
-        # Concurrency control: semaphore if max_concurrency > 0
-        semaphore: Optional[asyncio.Semaphore] = asyncio.Semaphore(max_conc) if max_conc > 0 else None
-
         executor = Executor(self.logger)
-        plan: Dict[str, Any] = {"steps": cfg.substeps}
+        if self._plan is None:
+            self._plan = compile_steps(cfg.substeps)
+        plan = self._plan
+
+        # Items completed in a previous attempt of a checkpointed run are not processed again
+        checkpointer = current_checkpointer()
+        loop_path = current_step_path()
+        restored: Dict[str, Any] = checkpointer.completed_items(loop_path, context) if checkpointer else {}
+        if restored:
+            self.logger.info(f"LoopStep: Reusing {len(restored)} items completed in a previous attempt.")
 
         fail_fast: bool = cfg.fail_fast
         fail_fast_triggered: bool = False
         completed: int = 0
-        tasks: List[asyncio.Task] = []
+        pulled: int = 0
 
-        async def process_item(key: Any, value: Any) -> Tuple[Any, Any, Optional[str]]:
+        # Reorder buffer: outcomes of items that finished before an earlier item
+        reorder: Dict[int, ItemOutcome] = {}
+        next_position: int = 0
+
+        def emit(outcome: ItemOutcome) -> None:
+            nonlocal completed
+            k, out, err, duration = outcome
+            if cfg.history == "full":
+                history.append({"key": k, "result": out, "error": err})
+            elif cfg.history == "compact":
+                history.append({"key": k, "status": "error" if err else "ok", "duration": round(duration, 3)})
+            if err:
+                errors.append({"key": k, "error": err})
+                if sink is not None:
+                    sink.write(json.dumps({"key": k, "error": err}, default=json_default) + "\n")
+                return
+            completed += 1
+            if sink is not None:
+                sink.write(json.dumps({"key": k, "result": out}, default=json_default) + "\n")
+            elif isinstance(results, list):
+                results.append(out)
+            else:
+                results[k] = out  # type: ignore
+
+        def record(position: int, outcome: ItemOutcome) -> None:
+            """Emit an item's outcome, holding it back until earlier items are emitted if ordered."""
+            nonlocal next_position
+            if not cfg.preserve_order:
+                emit(outcome)
+                return
+            reorder[position] = outcome
+            while next_position in reorder:
+                emit(reorder.pop(next_position))
+                next_position += 1
+
+        async def process_item(key: Any, value: Any) -> ItemOutcome:
+            item_id = str(key)
+            if item_id in restored:
+                self.logger.debug("LoopStep: Item %s restored from checkpoint.", key)
+                return key, restored[item_id], None, 0.0
+            start = time.perf_counter()
             # Clone context for isolation
             item_ctx = context.clone()
             item_ctx[cfg.item_key] = value
             # Expose index or key
-            if isinstance(items_obj, list):
+            if is_list:
                 item_ctx["__index"] = key  # type: ignore
             else:
                 item_ctx["__key"] = key  # type: ignore
             try:
-                self.logger.debug(f"LoopStep: Processing item {key}.")
-                await executor.execute(plan, item_ctx)
+                self.logger.debug("LoopStep: Processing item %s.", key)
+                with step_scope(f"item:{item_id}"), trace_span(f"item {item_id}", "item", key=item_id):
+                    await executor.execute(plan, item_ctx)
                 out_val = item_ctx.get(cfg.item_key)
-                self.logger.debug(f"LoopStep: Item {key} completed.")
-                return key, out_val, None
+                if checkpointer is not None:
+                    checkpointer.mark_item_complete(loop_path, context, item_id, out_val)
+                self.logger.debug("LoopStep: Item %s completed.", key)
+                return key, out_val, None, time.perf_counter() - start
             except Exception as exc:
                 err_msg = str(exc)
                 self.logger.error(f"LoopStep: Error on item {key}: {err_msg}")
-                return key, None, err_msg
+                return key, None, err_msg, time.perf_counter() - start
 
         async def run_sequential() -> None:
-            nonlocal fail_fast_triggered, completed
-            for key, val in items_list:
-                if fail_fast_triggered:
+            nonlocal fail_fast_triggered, pulled
+            for position, (key, val) in enumerate(items_iter):
+                pulled += 1
+                outcome = await process_item(key, val)
+                record(position, outcome)
+                if outcome[2] and fail_fast:
+                    fail_fast_triggered = True
                     break
-                k, out, err = await process_item(key, val)
-                history.append({"key": k, "result": out, "error": err})
-                if err:
-                    errors.append({"key": k, "error": err})
-                    if fail_fast:
-                        fail_fast_triggered = True
-                        break
-                else:
-                    if isinstance(results, list):
-                        results.append(out)
-                    else:
-                        results[k] = out  # type: ignore
-                    completed += 1
 
         async def run_parallel() -> None:
-            nonlocal fail_fast_triggered, completed
-
-            async def schedule(k: Any, v: Any) -> Tuple[Any, Any, Optional[str]]:
-                if semaphore:
-                    async with semaphore:
-                        return await process_item(k, v)
-                return await process_item(k, v)
+            """
+            Run items concurrently: without dependencies in input order, otherwise in a
+            topological schedule. At most `max_concurrency` items are in flight, so only
+            that many item contexts are alive at once and streamed items are read only
+            when a slot frees up.
+            """
+            nonlocal fail_fast_triggered, pulled
+            if cfg.depends_on:
+                ids, deps_of, dependents, priority, cycles = _dependency_graph(items_list, cfg.id_key, cfg.depends_on)
+                for cycle in cycles:
+                    self.logger.warning(
+                        f"LoopStep: Dependency cycle among items {', '.join(cycle)}; running them unordered."
+                    )
+            else:
+                ids, deps_of, dependents, priority = [], [], [], []
+            remaining: List[int] = [len(deps) for deps in deps_of]
+            ready: List[Tuple[int, int]] = [(-priority[i], i) for i in range(len(remaining)) if not remaining[i]]
+            heapq.heapify(ready)
+            controller: Optional[AdaptiveConcurrency] = None
+            if cfg.adaptive_concurrency is not None:
+                controller = AdaptiveConcurrency(
+                    f"loop {'/'.join(current_step_path()) or '-'}", cfg.adaptive_concurrency, self.logger
+                )
+                limit = cfg.adaptive_concurrency.max_concurrency
+            else:
+                limit = max_conc if max_conc > 0 else sys.maxsize
+            # Ordered output without dependencies: bound the reorder buffer by not running
+            # too far ahead of the earliest unfinished item
+            window = 2 * limit if cfg.preserve_order and not cfg.depends_on and max_conc > 0 else sys.maxsize
+            exhausted = False
+            running: Dict[asyncio.Task, Tuple[int, Any]] = {}
+            busy_time = 0.0
+            peak = 0
+            launched = 0
+            started_at = time.perf_counter()
+
+            def skip_dependents(failed: int) -> None:
+                # Items depending (transitively) on a failed item cannot run
+                pending = list(dependents[failed])
+                while pending:
+                    idx = pending.pop()
+                    if remaining[idx] < 0:
+                        continue
+                    remaining[idx] = -1
+                    record(idx, (items_list[idx][0], None, f"Dependency '{ids[failed]}' failed", 0.0))
+                    pending.extend(dependents[idx])
 
-            # Schedule tasks with optional delay
-            for idx, (k, v) in enumerate(items_list):
-                if fail_fast_triggered:
-                    break
-                task = asyncio.create_task(schedule(k, v))
-                tasks.append(task)
-                if cfg.delay and idx < total - 1:
-                    await asyncio.sleep(cfg.delay)
-
-            # Collect results as they complete
-            for t in asyncio.as_completed(tasks):
-                if fail_fast_triggered:
-                    break
-                try:
-                    k, out, err = await t
-                except Exception as exc:
-                    k, out, err = None, None, str(exc)
-                    self.logger.error(f"LoopStep: Unexpected error: {err}")
-                history.append({"key": k, "result": out, "error": err})
-                if err:
-                    errors.append({"key": k, "error": err})
-                    if fail_fast:
-                        fail_fast_triggered = True
+            try:
+                while True:
+                    while len(running) < (controller.limit if controller else limit) and not fail_fast_triggered:
+                        # Without dependencies items start in input order, pulled on demand
+                        if cfg.depends_on:
+                            if not ready or ready[0][1] >= next_position + window:
+                                break
+                            _, idx = heapq.heappop(ready)
+                            key, value = items_list[idx]
+                        else:
+                            if exhausted or launched >= next_position + window:
+                                break
+                            item = next(items_iter, None)
+                            if item is None:
+                                exhausted = True
+                                break
+                            idx = launched
+                            key, value = item
+                        pulled += 1
+                        if cfg.delay and launched:
+                            await asyncio.sleep(cfg.delay)
+                        # Items restored from a checkpoint say nothing about the current load
+                        if controller is not None and str(key) not in restored:
+                            controller.started()
+                        with adaptive_scope(controller):
+                            task = asyncio.create_task(process_item(key, value))
+                        running[task] = (idx, key)
+                        launched += 1
+                        peak = max(peak, len(running))
+                    if not running:
                         break
-                else:
-                    if isinstance(results, list):
-                        results.append(out)
-                    else:
-                        results[k] = out  # type: ignore
-                    completed += 1
-            # Cancel remaining tasks if aborting
-            if fail_fast_triggered:
-                for t in tasks:
-                    if not t.done():
-                        t.cancel()
-
-        # Choose execution mode
-        if max_conc == 1:
-            await run_sequential()
-        else:
-            await run_parallel()
+                    done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        idx, key = running.pop(task)
+                        try:
+                            outcome = task.result()
+                        except Exception as exc:
+                            self.logger.error(f"LoopStep: Unexpected error: {exc}")
+                            outcome = (key, None, str(exc), 0.0)
+                        busy_time += outcome[3]
+                        if controller is not None and str(key) not in restored:
+                            controller.finished(outcome[3], failed=bool(outcome[2]))
+                        record(idx, outcome)
+                        if outcome[2]:
+                            if fail_fast:
+                                fail_fast_triggered = True
+                            elif cfg.depends_on:
+                                skip_dependents(idx)
+                            continue
+                        if cfg.depends_on:
+                            for dependent in dependents[idx]:
+                                if remaining[dependent] > 0:
+                                    remaining[dependent] -= 1
+                                    if remaining[dependent] == 0:
+                                        heapq.heappush(ready, (-priority[dependent], dependent))
+                    if fail_fast_triggered:
+                        break
+            finally:
+                # Fail fast, or an unreadable item source
+                for task in running:
+                    task.cancel()
+                if controller is not None:
+                    set_span_attribute("concurrency_limit", controller.limit)
+                    controller.close()
+
+            if cfg.depends_on:
+                elapsed_total = time.perf_counter() - started_at
+                parallelism = busy_time / elapsed_total if elapsed_total > 0 else 0.0
+                critical_path = max(priority, default=0)
+                set_span_attribute("critical_path", critical_path)
+                set_span_attribute("parallelism", round(parallelism, 2))
+                self.logger.info(
+                    f"LoopStep: Dependency schedule: critical path {critical_path} items, "
+                    f"peak concurrency {peak}, average parallelism {parallelism:.2f}."
+                )
+
+        try:
+            # Choose execution mode
+            if max_conc == 1 and not cfg.depends_on and cfg.adaptive_concurrency is None:
+                await run_sequential()
+            else:
+                await run_parallel()
+            # Items that never ran (fail fast) leave gaps; emit the rest in order
+            for position in sorted(reorder):
+                emit(reorder.pop(position))
+        finally:
+            if source_iter is not None:
+                source_iter.close()
+            if sink is not None:
+                sink.close()
+
+        if total is None:
+            total = pulled
+
+        # Failed or unprocessed items run again when the run is resumed
+        if checkpointer is not None and completed < total:
+            checkpointer.mark_partial(loop_path, context)
 
         # Store outputs back to parent context
-        context[cfg.result_key] = results
+        context[cfg.result_key] = output_path if output_path is not None else results
         context[f"{cfg.result_key}__errors"] = errors
         context[f"{cfg.result_key}__history"] = history
 
         self.logger.info(f"LoopStep: Completed {completed}/{total} items. Errors: {len(errors)}.")
 
 
+def _dependency_graph(
+    items_list: List[Tuple[Any, Any]], id_key: Optional[str], depends_on: str
+) -> Tuple[List[str], List[Set[int]], List[List[int]], List[int], List[List[str]]]:
+    """
+    Build the dependency graph of loop items.
+
+    Returns item ids, the dependencies and dependents of each item (by position),
+    each item's priority (the number of items on its longest chain of dependents,
+    itself included) and the dependency cycles found. Dependencies on ids that are not
+    loop items are ignored; dependencies between items of one cycle are dropped, so
+    those items run unordered relative to each other but after the cycle's other
+    dependencies.
+
+    Raises:
+        ValueError: On duplicate item ids.
+    """
+    ids: List[str] = []
+    for key, value in items_list:
+        item_id = _resolve_path(id_key, value) if id_key else key
+        ids.append(str(key if item_id is None else item_id))
+    position: Dict[str, int] = {}
+    for idx, item_id in enumerate(ids):
+        if item_id in position:
+            raise ValueError(f"LoopStep: Duplicate item id '{item_id}' in dependency schedule.")
+        position[item_id] = idx
+
+    deps_of: List[Set[int]] = []
+    dependents: List[List[int]] = [[] for _ in items_list]
+    for idx, (_, value) in enumerate(items_list):
+        raw = _resolve_path(depends_on, value)
+        declared = [raw] if isinstance(raw, (str, int)) else list(raw or [])
+        deps = {position[str(dep)] for dep in declared if str(dep) in position and position[str(dep)] != idx}
+        deps_of.append(deps)
+
+    cycles: List[List[str]] = []
+    for component in _strongly_connected(deps_of):
+        if len(component) > 1:
+            members = set(component)
+            for idx in component:
+                deps_of[idx] -= members
+            cycles.append(sorted(ids[idx] for idx in component))
+    for idx, deps in enumerate(deps_of):
+        for dep in deps:
+            dependents[dep].append(idx)
+
+    # Kahn's algorithm; priorities are filled in reverse topological order
+    remaining = [len(deps) for deps in deps_of]
+    order = [idx for idx, count in enumerate(remaining) if count == 0]
+    for idx in order:
+        for dependent in dependents[idx]:
+            remaining[dependent] -= 1
+            if remaining[dependent] == 0:
+                order.append(dependent)
+    priority = [1] * len(items_list)
+    for idx in reversed(order):
+        if dependents[idx]:
+            priority[idx] = 1 + max(priority[dependent] for dependent in dependents[idx])
+    return ids, deps_of, dependents, priority, cycles
+
+
+def _strongly_connected(edges: List[Set[int]]) -> List[List[int]]:
+    """Return the strongly connected components of a graph (Tarjan's algorithm, iterative)."""
+    index: Dict[int, int] = {}
+    lowlink: Dict[int, int] = {}
+    stack: List[int] = []
+    on_stack: Set[int] = set()
+    components: List[List[int]] = []
+    for root in range(len(edges)):
+        if root in index:
+            continue
+        work: List[Tuple[int, List[int]]] = [(root, sorted(edges[root]))]
+        index[root] = lowlink[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        while work:
+            node, pending = work[-1]
+            if pending:
+                nxt = pending.pop()
+                if nxt not in index:
+                    index[nxt] = lowlink[nxt] = len(index)
+                    stack.append(nxt)
+                    on_stack.add(nxt)
+                    work.append((nxt, sorted(edges[nxt])))
+                elif nxt in on_stack:
+                    lowlink[node] = min(lowlink[node], index[nxt])
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                lowlink[parent] = min(lowlink[parent], lowlink[node])
+            if lowlink[node] == index[node]:
+                component: List[int] = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                components.append(component)
+    return components
+
+
+def _source_format(source: str) -> str:
+    """Infer the format of an item source from its path."""
+    if glob.has_magic(source):
+        return "glob"
+    if source.lower().endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    return "lines"
+
+
+def _iter_source(source: str, source_format: str) -> Iterator[Tuple[int, Any]]:
+    """
+    Yield (index, item) pairs from a streamed item source, reading one item at a time.
+    Blank lines are skipped.
+
+    Raises:
+        IOError: If the source file cannot be read.
+        ValueError: If a line of a JSON Lines source is not valid JSON.
+    """
+    if source_format == "glob":
+        yield from enumerate(glob.iglob(source, recursive=True))
+        return
+    try:
+        with open(source, "r", encoding="utf-8") as f:
+            index = 0
+            for line_number, line in enumerate(f, 1):
+                line = line.rstrip("\r\n")
+                if not line.strip():
+                    continue
+                if source_format == "jsonl":
+                    try:
+                        item: Any = json.loads(line)
+                    except ValueError as err:
+                        raise ValueError(f"LoopStep: Invalid JSON on line {line_number} of '{source}': {err}")
+                else:
+                    item = line
+                yield index, item
+                index += 1
+    except (OSError, UnicodeDecodeError) as err:
+        raise IOError(f"LoopStep: Error reading item source '{source}': {err}")
+
+
 def _resolve_path(path: str, context: ContextProtocol) -> Any:
     """
     Resolve a dot-notated path against the context or nested dicts.
@@ -212,7 +590,8 @@ def _resolve_path(path: str, context: ContextProtocol) -> Any:
     current: Any = context
     for part in path.split("."):
         if isinstance(current, ContextProtocol):
-            current = current.get(part)
+            # Items are only read (item values are stored in the item contexts as they are)
+            current = peek(current, part)
         elif isinstance(current, dict):
             current = current.get(part)
         else:
@@ -127,12 +127,12 @@ class MCPStep(BaseStep[MCPConfig]):  # type: ignore
             service_desc = f"SSE server '{url}'"
 
         # Connect and invoke tool
-        self.logger.debug(f"Connecting to MCP server: {service_desc}")
+        self.logger.debug("Connecting to MCP server: %s", service_desc)
         try:
             async with client_cm as (read_stream, write_stream):  # type: ignore
                 async with ClientSession(read_stream, write_stream) as session:
                     await session.initialize()
-                    self.logger.debug(f"Invoking tool '{tool_name}' with arguments {arguments}")
+                    self.logger.debug("Invoking tool '%s' with arguments %s", tool_name, arguments)
                     try:
                         result: CallToolResult = await session.call_tool(name=tool_name, arguments=arguments)
                     except Exception as exc:
@@ -5,11 +5,16 @@ ParallelStep allows concurrent execution of multiple sub-steps (execute_recipe s
 
 import asyncio
 import logging
-from typing import Any, Dict, List, Optional, Awaitable, Set
+import time
+from typing import Any, Dict, List, Optional, Awaitable, Set, Tuple
 
+from recipe_executor.recipe_cache import CompiledStep, compile_step
 from recipe_executor.steps.base import BaseStep, StepConfig
-from recipe_executor.steps.registry import STEP_REGISTRY
 from recipe_executor.protocols import ContextProtocol, StepProtocol
+from recipe_executor.checkpoint import current_checkpointer, current_step_path, step_scope
+from recipe_executor.concurrency import AdaptiveConcurrency, AdaptiveConcurrencyConfig, adaptive_scope
+from recipe_executor.retry import resolve_retry_policy, run_with_retry
+from recipe_executor.tracing import trace_span
 
 
 class ParallelConfig(StepConfig):
@@ -20,12 +25,14 @@ class ParallelConfig(StepConfig):
         max_concurrency: Maximum number of substeps to run concurrently. 0 means unlimited.
         delay: Optional delay (in seconds) between launching each substep.
         timeout: Optional timeout (in seconds) for the entire parallel execution.
+        adaptive_concurrency: Optional adaptive limit replacing max_concurrency (see `concurrency`).
     """
 
     substeps: List[Dict[str, Any]]
     max_concurrency: int = 0
     delay: float = 0.0
     timeout: Optional[float] = None
+    adaptive_concurrency: Optional[AdaptiveConcurrencyConfig] = None
 
 
 class ParallelStep(BaseStep[ParallelConfig]):
@@ -34,6 +41,8 @@ class ParallelStep(BaseStep[ParallelConfig]):
     def __init__(self, logger: logging.Logger, config: Dict[str, Any]) -> None:
         validated: ParallelConfig = ParallelConfig.model_validate(config)
         super().__init__(logger, validated)
+        # Substeps compiled on first execution, reused by later executions
+        self._compiled: Optional[Tuple[CompiledStep, ...]] = None
 
     async def execute(self, context: ContextProtocol) -> None:
         substeps: List[Dict[str, Any]] = self.config.substeps or []
@@ -58,15 +67,37 @@ class ParallelStep(BaseStep[ParallelConfig]):
         # Determine concurrency limit: 0 or negative => unlimited
         concurrency_limit: int = total_steps if max_concurrency <= 0 else min(max_concurrency, total_steps)
         semaphore: asyncio.Semaphore = asyncio.Semaphore(concurrency_limit)
+        controller: Optional[AdaptiveConcurrency] = None
+        if self.config.adaptive_concurrency is not None:
+            controller = AdaptiveConcurrency(
+                f"parallel {'/'.join(current_step_path()) or '-'}", self.config.adaptive_concurrency, self.logger
+            )
 
         # Track failure
         failure_exception: Optional[Exception] = None
         failure_index: Optional[int] = None
         tasks: List[asyncio.Task] = []
 
+        # Substeps completed in a previous attempt of a checkpointed run are skipped
+        checkpointer = current_checkpointer()
+        parallel_path = current_step_path()
+        completed_substeps = checkpointer.completed_items(parallel_path, context) if checkpointer else {}
+        if self._compiled is None:
+            self._compiled = tuple(compile_step(spec) for spec in substeps)
+        compiled = self._compiled
+
         async def run_substep(index: int, spec: Dict[str, Any]) -> None:
             nonlocal failure_exception, failure_index
             sub_logger: logging.Logger = self.logger.getChild(f"substep_{index}")
+            if str(index) in completed_substeps:
+                sub_logger.info("Substep %d completed in a previous attempt; skipping", index)
+                if controller is not None:
+                    controller.release()
+                else:
+                    semaphore.release()
+                return
+            started_at = time.monotonic()
+            failed = False
             try:
                 sub_logger.debug(
                     "Preparing substep %d: cloning context; spec=%s",
@@ -75,21 +106,33 @@ class ParallelStep(BaseStep[ParallelConfig]):
                 )
                 sub_context: ContextProtocol = context.clone()
 
+                step = compiled[index]
                 step_type: Optional[str] = spec.get("type")
-                if not step_type or step_type not in STEP_REGISTRY:
+                if not step_type or step.resolve_class() is None:
                     raise RuntimeError(f"Unknown step type '{step_type}' for substep {index}")
 
-                step_config_dict: Dict[str, Any] = spec.get("config", {}) or {}
-                StepClass: type[StepProtocol] = STEP_REGISTRY[step_type]
-                step_instance: StepProtocol = StepClass(sub_logger, step_config_dict)
+                # The config is validated when the step object is first built, then reused
+                step_instance: StepProtocol = step.instantiate(sub_logger)
 
+                async def attempt() -> None:
+                    result = step_instance.execute(sub_context)
+                    if isinstance(result, Awaitable):  # type: ignore
+                        await result  # type: ignore
+
+                # Retrying a transient failure here keeps the sibling substeps running
+                policy = resolve_retry_policy(step_type, step.retry, context.get_config())
                 sub_logger.info("Launching substep %d of type '%s'", index, step_type)
-                result = step_instance.execute(sub_context)
-                if isinstance(result, Awaitable):  # type: ignore
-                    await result  # type: ignore
+                with (
+                    step_scope(f"substep:{index}"),
+                    trace_span(f"substep {index}: {step_type}", "substep", index=index, type=step_type),
+                ):
+                    await run_with_retry(attempt, policy, sub_logger, f"Substep {index} ('{step_type}')")
+                if checkpointer is not None:
+                    checkpointer.mark_item_complete(parallel_path, context, str(index), None)
                 sub_logger.info("Substep %d completed successfully", index)
 
             except Exception as exc:
+                failed = True
                 if failure_exception is None:
                     failure_exception = exc
                     failure_index = index
@@ -97,74 +140,87 @@ class ParallelStep(BaseStep[ParallelConfig]):
                 raise
 
             finally:
-                semaphore.release()
-
-        # Launch substeps with concurrency control and optional delay
-        for idx, spec in enumerate(substeps):
-            if failure_exception:
-                self.logger.debug("Fail-fast: abort launching remaining substeps at index %d", idx)
-                break
-
-            await semaphore.acquire()
-            if delay_between > 0:
-                await asyncio.sleep(delay_between)
-
-            task = asyncio.create_task(run_substep(idx, spec))
-            tasks.append(task)
-
-        if not tasks:
-            self.logger.info("No substeps launched; nothing to wait for.")
-            return
+                if controller is not None:
+                    controller.finished(time.monotonic() - started_at, failed=failed)
+                else:
+                    semaphore.release()
 
-        done: Set[asyncio.Task]
-        pending: Set[asyncio.Task]
-
-        # Wait for substeps with first-exception or timeout handling
         try:
-            if timeout_seconds is not None:
-                done, pending = await asyncio.wait(
-                    tasks,
-                    timeout=timeout_seconds,
-                    return_when=asyncio.FIRST_EXCEPTION,
+            # Launch substeps with concurrency control and optional delay
+            for idx, spec in enumerate(substeps):
+                if failure_exception:
+                    self.logger.debug("Fail-fast: abort launching remaining substeps at index %d", idx)
+                    break
+
+                if controller is not None:
+                    await controller.acquire()
+                else:
+                    await semaphore.acquire()
+                if delay_between > 0:
+                    await asyncio.sleep(delay_between)
+
+                with adaptive_scope(controller):
+                    task = asyncio.create_task(run_substep(idx, spec))
+                tasks.append(task)
+
+            if not tasks:
+                self.logger.info("No substeps launched; nothing to wait for.")
+                return
+
+            done: Set[asyncio.Task]
+            pending: Set[asyncio.Task]
+
+            # Wait for substeps with first-exception or timeout handling
+            try:
+                if timeout_seconds is not None:
+                    done, pending = await asyncio.wait(
+                        tasks,
+                        timeout=timeout_seconds,
+                        return_when=asyncio.FIRST_EXCEPTION,
+                    )
+                else:
+                    done, pending = await asyncio.wait(
+                        tasks,
+                        return_when=asyncio.FIRST_EXCEPTION,
+                    )
+            except Exception:
+                done, pending = set(tasks), set()
+
+            # Handle failure
+            if failure_exception is not None:
+                pending_count = len(pending)
+                self.logger.error(
+                    "Substep %s failed; cancelling %d pending tasks",
+                    failure_index,
+                    pending_count,
                 )
-            else:
-                done, pending = await asyncio.wait(
-                    tasks,
-                    return_when=asyncio.FIRST_EXCEPTION,
+                for t in pending:
+                    t.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+                raise RuntimeError(
+                    f"ParallelStep aborted due to failure in substep {failure_index}"
+                ) from failure_exception
+
+            # Handle timeout without failure
+            if pending:
+                pending_count = len(pending)
+                self.logger.error(
+                    "ParallelStep timed out after %.3f seconds; cancelling %d pending tasks",
+                    timeout_seconds,
+                    pending_count,
                 )
-        except Exception:
-            done, pending = set(tasks), set()
-
-        # Handle failure
-        if failure_exception is not None:
-            pending_count = len(pending)
-            self.logger.error(
-                "Substep %s failed; cancelling %d pending tasks",
-                failure_index,
-                pending_count,
+                for t in pending:
+                    t.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+                raise asyncio.TimeoutError(f"ParallelStep timed out after {timeout_seconds} seconds")
+
+            # All successful: gather to propagate exceptions
+            await asyncio.gather(*done)
+            self.logger.info(
+                "Completed ParallelStep: %d/%d substeps succeeded",
+                len(done),
+                total_steps,
             )
-            for t in pending:
-                t.cancel()
-            await asyncio.gather(*pending, return_exceptions=True)
-            raise RuntimeError(f"ParallelStep aborted due to failure in substep {failure_index}") from failure_exception
-
-        # Handle timeout without failure
-        if pending:
-            pending_count = len(pending)
-            self.logger.error(
-                "ParallelStep timed out after %.3f seconds; cancelling %d pending tasks",
-                timeout_seconds,
-                pending_count,
-            )
-            for t in pending:
-                t.cancel()
-            await asyncio.gather(*pending, return_exceptions=True)
-            raise asyncio.TimeoutError(f"ParallelStep timed out after {timeout_seconds} seconds")
-
-        # All successful: gather to propagate exceptions
-        await asyncio.gather(*done)
-        self.logger.info(
-            "Completed ParallelStep: %d/%d substeps succeeded",
-            len(done),
-            total_steps,
-        )
+        finally:
+            if controller is not None:
+                controller.close()
@@ -2,15 +2,65 @@
 import os
 import glob
 import json
+import mmap
+import asyncio
 import logging
-from typing import Any, Dict, List, Union
-
-import yaml
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 from recipe_executor.protocols import ContextProtocol
 from recipe_executor.steps.base import BaseStep, StepConfig
+from recipe_executor.build_manifest import record_file_read
+from recipe_executor.tracing import add_counter, current_tracer
+from recipe_executor.utils.appends import flush_appends
+from recipe_executor.utils.lru import LRUCache
 from recipe_executor.utils.templates import render_template
 
+# Files at least this large are decoded from a memory map
+MMAP_THRESHOLD = 1024 * 1024
+
+# Byte budget of the parsed-file cache shared by all read_files steps; 0 disables it.
+FILE_CACHE_MAX_BYTES_ENV = "RECIPE_EXECUTOR_FILE_CACHE_MAX_BYTES"
+DEFAULT_FILE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+
+def _initial_cache_bytes() -> int:
+    raw = os.getenv(FILE_CACHE_MAX_BYTES_ENV)
+    if raw is None:
+        return DEFAULT_FILE_CACHE_MAX_BYTES
+    try:
+        return max(0, int(raw))
+    except ValueError:
+        return DEFAULT_FILE_CACHE_MAX_BYTES
+
+
+def _entry_size(entry: Tuple[Tuple[int, int], Any]) -> int:
+    # The size on disk approximates the size of the parsed value
+    return entry[0][1]
+
+
+# Process-wide cache of parsed files: (real path, parser) -> ((mtime_ns, size), content).
+# Cached values are shared between all readers and must be treated as read-only.
+_max_bytes = _initial_cache_bytes()
+_file_cache: LRUCache[Tuple[str, str], Tuple[Tuple[int, int], Any]] = LRUCache(
+    max_entries=4096 if _max_bytes > 0 else 0, max_bytes=_max_bytes, sizeof=_entry_size
+)
+
+
+def invalidate_file_cache(path: str) -> None:
+    """
+    Drop the cached contents of a file, e.g. after writing it.
+    """
+    real_path = os.path.realpath(path)
+    for parser in ("json", "yaml", "text"):
+        _file_cache.pop((real_path, parser))
+
+
+def file_cache_stats() -> Dict[str, Any]:
+    """
+    Return hit/miss/eviction counters and occupancy of the parsed-file cache.
+    """
+    return _file_cache.stats()
+
 
 class ReadFilesConfig(StepConfig):
     """
@@ -21,12 +71,15 @@ class ReadFilesConfig(StepConfig):
         content_key: Template for the context key under which content will be stored.
         optional: If True, missing files are skipped instead of raising.
         merge_mode: Mode to merge multiple files: "concat" or "dict".
+        max_concurrency: Maximum number of files read and parsed at once in worker
+            threads (0 for no limit).
     """
 
     path: Union[str, List[str]]
     content_key: str
     optional: bool = False
     merge_mode: str = "concat"
+    max_concurrency: int = 8
 
 
 class ReadFilesStep(BaseStep[ReadFilesConfig]):
@@ -71,35 +124,28 @@ class ReadFilesStep(BaseStep[ReadFilesConfig]):
         results: List[Any] = []
         result_map: Dict[str, Any] = {}
 
-        for path in paths:
-            self.logger.debug(f"Reading file at path: {path}")
-            if not os.path.exists(path):
-                msg = f"File not found: {path}"
+        # Read and parse files in worker threads so large reads do not block the event
+        # loop; gather keeps the results in path order.
+        limit = cfg.max_concurrency if cfg.max_concurrency > 0 else len(paths)
+        semaphore = asyncio.Semaphore(max(1, limit))
+
+        async def read(path: str) -> Optional[Tuple[Any, int]]:
+            async with semaphore:
+                return await asyncio.to_thread(self._read_file, path)
+
+        loaded = await asyncio.gather(*(read(path) for path in paths))
+
+        for path, outcome in zip(paths, loaded):
+            # Missing files are inputs too: creating one must rebuild an incremental target
+            record_file_read(path)
+            if outcome is None:
                 if cfg.optional:
                     self.logger.warning(f"Optional file missing, skipping: {path}")
                     continue
-                raise FileNotFoundError(msg)
-
-            try:
-                with open(path, mode="r", encoding="utf-8") as f:
-                    raw_text = f.read()
-            except Exception as exc:
-                raise IOError(f"Error reading file {path}: {exc}")
-
-            # Attempt to parse based on extension
-            content: Any = raw_text
-            ext = os.path.splitext(path)[1].lower()
-            if ext == ".json":
-                try:
-                    content = json.loads(raw_text)
-                except Exception as exc:
-                    self.logger.warning(f"Failed to parse JSON from {path}: {exc}")
-            elif ext in (".yaml", ".yml"):
-                try:
-                    content = yaml.safe_load(raw_text)
-                except Exception as exc:
-                    self.logger.warning(f"Failed to parse YAML from {path}: {exc}")
-
+                raise FileNotFoundError(f"File not found: {path}")
+            content, size = outcome
+            if size and current_tracer() is not None:
+                add_counter("bytes_read", size)
             self.logger.info(f"Successfully read file: {path}")
             results.append(content)
             result_map[path] = content
@@ -126,6 +172,96 @@ class ReadFilesStep(BaseStep[ReadFilesConfig]):
                         segments.append(f"{p}\n{segment}")
                 final_content = "\n".join(segments)
 
-        # Store in context
-        context[rendered_key] = final_content
+        # Store in context. Parsed structures may be shared with the file cache, so
+        # contexts that support it copy them only when a step reads them directly.
+        set_shared = getattr(context, "set_shared", None)
+        if isinstance(final_content, (dict, list)) and callable(set_shared):
+            set_shared(rendered_key, final_content)
+        else:
+            context[rendered_key] = final_content
         self.logger.info(f"Stored file content under key '{rendered_key}'")
+
+    def _read_file(self, path: str) -> Optional[Tuple[Any, int]]:
+        """
+        Read and parse one file (runs in a worker thread). Returns the content and the
+        number of bytes read from disk, or None if the file does not exist.
+
+        Parsed files are served from the process-wide file cache while their mtime and
+        size are unchanged.
+        """
+        self.logger.debug("Reading file at path: %s", path)
+        parser = _parser_for(path)
+
+        # Fragments appended to the file in this run must be on disk before it is read
+        flush_appends(path, sync=False)
+
+        try:
+            real_path = os.path.realpath(path)
+            stat = os.stat(real_path)
+        except FileNotFoundError:
+            return None
+        except OSError as exc:
+            raise IOError(f"Error reading file {path}: {exc}")
+        cache_key = (real_path, parser)
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+        cached = _file_cache.get(cache_key)
+        if cached is not None and cached[0] == signature:
+            return cached[1], 0
+
+        try:
+            raw_text, size = _read_text(real_path)
+        except Exception as exc:
+            raise IOError(f"Error reading file {path}: {exc}")
+        content, parsed = self._parse(path, raw_text, parser)
+        # Failed parses are not cached so the warning is repeated on every read
+        if parsed:
+            _file_cache.put(cache_key, (signature, content))
+        return content, size
+
+    def _parse(self, path: str, raw_text: str, parser: str) -> Tuple[Any, bool]:
+        """Parse text with the given parser; returns the raw text and False on failure."""
+        if parser == "json":
+            try:
+                return json.loads(raw_text), True
+            except Exception as exc:
+                self.logger.warning(f"Failed to parse JSON from {path}: {exc}")
+                return raw_text, False
+        if parser == "yaml":
+            # Imported on first use: most recipes never read YAML
+            import yaml
+
+            try:
+                return yaml.safe_load(raw_text), True
+            except Exception as exc:
+                self.logger.warning(f"Failed to parse YAML from {path}: {exc}")
+                return raw_text, False
+        return raw_text, True
+
+
+def _parser_for(path: str) -> str:
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".json":
+        return "json"
+    if ext in (".yaml", ".yml"):
+        return "yaml"
+    return "text"
+
+
+def _read_text(path: str) -> Tuple[str, int]:
+    """
+    Read a UTF-8 text file with universal newlines. Large files are decoded straight
+    from a memory map instead of being copied into an intermediate bytes buffer.
+    """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < MMAP_THRESHOLD:
+            data = f.read()
+            size = len(data)
+            text = data.decode("utf-8")
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                text = str(mapped, "utf-8")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text, size
@@ -2,13 +2,87 @@
 """
 Registry for mapping step type names to their implementation classes.
 
-This registry is a simple global dictionary. Steps register themselves by
-updating this mapping, allowing dynamic lookup based on the step type name.
+Step types are registered either as classes or as lazy import specs
+("package.module:ClassName"). A spec is imported the first time its step type is
+looked up, so a recipe only pays for the modules of the steps it uses: importing
+`recipe_executor.steps` does not pull in the LLM provider SDKs, MCP or docpack
+unless a recipe runs an `llm_generate`, `mcp` or `docpack_*` step. Membership tests
+(`step_type in STEP_REGISTRY`) never import anything.
 """
 
-from typing import Dict, Type
+from importlib import import_module
+from typing import Dict, Iterator, MutableMapping, Type, Union
 
 from recipe_executor.steps.base import BaseStep
 
+__all__ = ["STEP_REGISTRY", "StepRegistry"]
+
+
+class StepRegistry(MutableMapping[str, Type[BaseStep]]):
+    """
+    Mapping of step type names to step classes, resolving lazy specs on first lookup.
+    Steps register themselves by assigning their class.
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[str, Union[str, Type[BaseStep]]] = {}
+
+    def register_lazy(self, name: str, spec: str) -> None:
+        """
+        Register a step type by import spec ("package.module:ClassName") without
+        importing it.
+
+        Raises:
+            ValueError: If the spec is not of the form "module:ClassName".
+        """
+        module_name, _, class_name = spec.partition(":")
+        if not module_name or not class_name:
+            raise ValueError(f"Invalid step spec for '{name}': '{spec}' (expected 'module:ClassName')")
+        self._entries[name] = spec
+
+    def is_loaded(self, name: str) -> bool:
+        """Return True if the step type is registered and its class has been imported."""
+        return not isinstance(self._entries.get(name, ""), str)
+
+    def __getitem__(self, name: str) -> Type[BaseStep]:
+        entry = self._entries[name]
+        if not isinstance(entry, str):
+            return entry
+        module_name, _, class_name = entry.partition(":")
+        try:
+            module = import_module(module_name)
+        except ImportError as err:
+            raise RuntimeError(f"Cannot load step type '{name}' from '{module_name}': {err}") from err
+        # Importing the module may have registered the class already
+        resolved = self._entries.get(name)
+        if isinstance(resolved, str):
+            try:
+                resolved = getattr(module, class_name)
+            except AttributeError:
+                raise RuntimeError(
+                    f"Cannot load step type '{name}': '{module_name}' has no class '{class_name}'"
+                ) from None
+            self._entries[name] = resolved
+        return resolved  # type: ignore[return-value]
+
+    def __setitem__(self, name: str, step_cls: Type[BaseStep]) -> None:
+        self._entries[name] = step_cls
+
+    def __delitem__(self, name: str) -> None:
+        del self._entries[name]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._entries
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return f"StepRegistry({sorted(self._entries)})"
+
+
 # Global registry mapping step type names to their implementation classes.
-STEP_REGISTRY: Dict[str, Type[BaseStep]] = {}
+STEP_REGISTRY: StepRegistry = StepRegistry()
@@ -6,6 +6,7 @@ from typing import Any, Dict, List, Union, Literal
 from recipe_executor.steps.base import BaseStep, StepConfig
 from recipe_executor.protocols import ContextProtocol
 from recipe_executor.utils.templates import render_template
+from recipe_executor.utils.text import TEXT_TYPES, BlobText, TextRope
 
 # Regex to strip out raw blocks for nested rendering detection
 _RAW_BLOCK_RE = re.compile(r"{% raw %}.*?{% endraw %}", flags=re.DOTALL)
@@ -20,6 +21,17 @@ def _has_unrendered_tags(s: str) -> bool:
     return ("{{" in cleaned) or ("{%" in cleaned)
 
 
+def _stored_value(context: ContextProtocol, key: str) -> Any:
+    """
+    Return the value stored under key, keeping a merged TextRope as a rope (a Context
+    hands values out as plain strings) so merging into it appends a segment.
+    """
+    raw_mapping = getattr(context, "raw_mapping", None)
+    if callable(raw_mapping):
+        return raw_mapping()[key]
+    return context[key]
+
+
 class SetContextConfig(StepConfig):
     """
     Configuration for SetContextStep.
@@ -28,13 +40,13 @@ class SetContextConfig(StepConfig):
         key: Identifier for the artifact in the context.
         value: JSON-serializable literal, list, dict, or Liquid template string.
         nested_render: If True, render templates recursively until no tags remain.
-        if_exists: Strategy when the key already exists: "overwrite" or "merge".
+        if_exists: Strategy when the key already exists: "overwrite", "merge" or "append".
     """
 
     key: str
     value: Union[str, List[Any], Dict[str, Any]]
     nested_render: bool = False
-    if_exists: Literal["overwrite", "merge"] = "overwrite"
+    if_exists: Literal["overwrite", "merge", "append"] = "overwrite"
 
 
 class SetContextStep(BaseStep[SetContextConfig]):
@@ -60,11 +72,13 @@ class SetContextStep(BaseStep[SetContextConfig]):
             context[key] = value
         elif strategy == "merge":
             if existed:
-                old_value: Any = context[key]
+                old_value: Any = _stored_value(context, key)
                 merged: Any = self._merge(old_value, value)
                 context[key] = merged
             else:
                 context[key] = value
+        elif strategy == "append":
+            context[key] = self._append(_stored_value(context, key), value) if existed else value
         else:
             raise ValueError(f"Unknown if_exists strategy: '{strategy}'")
 
@@ -104,17 +118,39 @@ class SetContextStep(BaseStep[SetContextConfig]):
         # Other types are passed through unchanged
         return raw
 
+    def _append(self, old: Any, new: Any) -> Any:
+        """
+        Append helper:
+          - str + str => concatenation (as a TextRope, see _concat)
+          - list + item => the item is added as a single element (lists are not flattened)
+          - other types => ValueError
+        """
+        if isinstance(old, TEXT_TYPES) and isinstance(new, TEXT_TYPES):
+            return self._concat(old, new)
+        if isinstance(old, list):  # type: ignore
+            return old + [new]  # type: ignore
+        raise ValueError(f"Cannot append {type(new).__name__} to existing {type(old).__name__} value")
+
+    def _concat(self, old: Union[str, TextRope, BlobText], new: Union[str, TextRope, BlobText]) -> TextRope:
+        """
+        Concatenate strings as a TextRope so repeated merges into a growing document
+        append a segment instead of copying the accumulated text.
+        """
+        if isinstance(old, TextRope):
+            return old.append(new)
+        return TextRope(old, new)
+
     def _merge(self, old: Any, new: Any) -> Any:
         """
         Shallow merge helper:
-          - str + str => concatenation
+          - str + str => concatenation (as a TextRope, see _concat)
           - list + list or item => append/extend
           - dict + dict => shallow merge (new keys overwrite)
           - mismatched types => [old, new]
         """
         # String concatenation
-        if isinstance(old, str) and isinstance(new, str):  # type: ignore
-            return old + new  # type: ignore
+        if isinstance(old, TEXT_TYPES) and isinstance(new, TEXT_TYPES):
+            return self._concat(old, new)
 
         # List merge or append
         if isinstance(old, list):  # type: ignore
@@ -1,13 +1,24 @@
 # This file was generated by Codebase-Generator, do not edit directly
 import os
 import json
+import stat
+import asyncio
 import logging
-from typing import Any, Dict, List, Optional, Union
+import uuid
+from typing import Any, Dict, List, Literal, Optional, Tuple, Union
 
+from recipe_executor.context import peek
 from recipe_executor.models import FileSpec
 from recipe_executor.protocols import ContextProtocol
 from recipe_executor.steps.base import BaseStep, StepConfig
+from recipe_executor.build_manifest import record_file_written
+from recipe_executor.steps.read_files import invalidate_file_cache
+from recipe_executor.tracing import add_counter
+from recipe_executor.utils.appends import append_to_file, discard_appends
 from recipe_executor.utils.templates import render_template
+from recipe_executor.utils.text import json_default
+
+_COMPARE_CHUNK = 1024 * 1024
 
 
 class WriteFilesConfig(StepConfig):
@@ -18,11 +29,21 @@ class WriteFilesConfig(StepConfig):
         files_key: Optional context key containing FileSpec or list/dict specs.
         files: Optional direct list of dicts with 'path'/'content' or key references.
         root: Base directory for output files.
+        mode: "overwrite" replaces each file; "append" adds the content to the end of
+            the file. Entries in `files` may override it with their own `mode`.
+        max_concurrency: Maximum number of files written at once in worker threads
+            (0 for no limit).
+        result_key: Optional context key (may be templated) under which a report of
+            the written files is stored: a list of {path, status, bytes} with status
+            "written", "skipped" (content unchanged) or "appended".
     """
 
     files_key: Optional[str] = None
     files: Optional[List[Dict[str, Any]]] = None
     root: str = "."
+    mode: Literal["overwrite", "append"] = "overwrite"
+    max_concurrency: int = 8
+    result_key: Optional[str] = None
 
 
 class WriteFilesStep(BaseStep[WriteFilesConfig]):
@@ -54,7 +75,7 @@ class WriteFilesStep(BaseStep[WriteFilesConfig]):
                     key = entry["path_key"]
                     if key not in context:
                         raise KeyError(f"Path key '{key}' not found in context.")
-                    raw_path = context[key]
+                    raw_path = peek(context, key)
                 else:
                     raise ValueError("Each file entry must have 'path' or 'path_key'.")
 
@@ -71,18 +92,22 @@ class WriteFilesStep(BaseStep[WriteFilesConfig]):
                     key = entry["content_key"]
                     if key not in context:
                         raise KeyError(f"Content key '{key}' not found in context.")
-                    raw_content = context[key]
+                    raw_content = peek(context, key)
                 else:
                     raise ValueError("Each file entry must have 'content' or 'content_key'.")
 
-                files_to_write.append({"path": path, "content": raw_content})
+                mode = entry.get("mode", self.config.mode)
+                if mode not in ("overwrite", "append"):
+                    raise ValueError(f"Invalid mode '{mode}' for file '{path}'. Expected 'overwrite' or 'append'.")
+
+                files_to_write.append({"path": path, "content": raw_content, "mode": mode})
 
         # 2. files_key in context
         elif self.config.files_key:
             key = self.config.files_key
             if key not in context:
                 raise KeyError(f"Files key '{key}' not found in context.")
-            raw = context[key]
+            raw = peek(context, key)
 
             # Normalize single or list
             if isinstance(raw, FileSpec):
@@ -117,32 +142,66 @@ class WriteFilesStep(BaseStep[WriteFilesConfig]):
                 except Exception as err:
                     raise ValueError(f"Failed to render file path '{path_str}': {err}")
 
-                files_to_write.append({"path": path, "content": raw_content})
+                files_to_write.append({"path": path, "content": raw_content, "mode": self.config.mode})
 
         else:
             raise ValueError("Either 'files' or 'files_key' must be provided in WriteFilesConfig.")
 
-        # Write files to disk
+        # Group entries by target file: different files are written concurrently in worker
+        # threads, entries for the same file in order.
+        by_path: Dict[str, List[Dict[str, Any]]] = {}
         for entry in files_to_write:
             rel_path: str = entry.get("path", "")
-            content = entry.get("content")
-
-            # Resolve final path
             combined = os.path.join(root, rel_path) if root else rel_path
             final_path = os.path.normpath(combined)
+            by_path.setdefault(final_path, []).append(entry)
 
-            # Ensure directory exists
-            parent = os.path.dirname(final_path)
-            if parent and not os.path.exists(parent):
-                try:
-                    os.makedirs(parent, exist_ok=True)
-                except Exception as err:
-                    raise IOError(f"Failed to create directory '{parent}': {err}")
+        limit = self.config.max_concurrency if self.config.max_concurrency > 0 else len(by_path)
+        semaphore = asyncio.Semaphore(max(1, limit))
+
+        async def write(final_path: str, entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+            async with semaphore:
+                return await asyncio.to_thread(self._write_path, final_path, entries)
+
+        outcomes = await asyncio.gather(*(write(path, entries) for path, entries in by_path.items()))
+
+        report: List[Dict[str, Any]] = [result for results in outcomes for result in results]
+        for final_path in by_path:
+            record_file_written(final_path)
+        written = sum(1 for result in report if result["status"] != "skipped")
+        written_bytes = sum(result["bytes"] for result in report if result["status"] != "skipped")
+        if written_bytes:
+            add_counter("bytes_written", written_bytes)
+        self.logger.info(
+            f"[WriteFilesStep] {written} written, {len(report) - written} unchanged ({written_bytes} bytes written)"
+        )
+
+        if self.config.result_key:
+            result_key = render_template(self.config.result_key, context)
+            context[result_key] = report
+
+    def _write_path(self, final_path: str, entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Write the entries targeting one file, in order (runs in a worker thread).
+        Returns one result per entry: path, status ("written", "skipped" or "appended")
+        and bytes.
+        """
+        # Ensure directory exists
+        parent = os.path.dirname(final_path)
+        if parent and not os.path.exists(parent):
+            try:
+                os.makedirs(parent, exist_ok=True)
+            except Exception as err:
+                raise IOError(f"Failed to create directory '{parent}': {err}")
+
+        results: List[Dict[str, Any]] = []
+        for entry in entries:
+            content = entry.get("content")
 
             # Serialize content
             if isinstance(content, (dict, list)):
                 try:
-                    text = json.dumps(content, ensure_ascii=False, indent=2)
+                    text = json.dumps(content, ensure_ascii=False, indent=2, default=json_default)
                 except Exception as err:
                     raise ValueError(f"Failed to serialize JSON for '{final_path}': {err}")
             else:
@@ -153,17 +212,103 @@ class WriteFilesStep(BaseStep[WriteFilesConfig]):
                 else:
                     text = content
 
+            if os.linesep != "\n":
+                text = text.replace("\n", os.linesep)
+
+            if entry["mode"] == "append":
+                # Buffered: only the new fragment is written, when the appends are flushed
+                self.logger.debug("[WriteFilesStep] Appending to file: %s\nContent:\n%s", final_path, text)
+                size = append_to_file(final_path, text)
+                invalidate_file_cache(final_path)
+                self.logger.info(f"[WriteFilesStep] Appended to file: {final_path} ({size} bytes)")
+                results.append({"path": final_path, "status": "appended", "bytes": size})
+                continue
+
             # Debug log
-            self.logger.debug(f"[WriteFilesStep] Writing file: {final_path}\nContent:\n{text}")
+            self.logger.debug("[WriteFilesStep] Writing file: %s\nContent:\n%s", final_path, text)
+
+            data = text.encode("utf-8")
+
+            # Replacing the file supersedes appends still buffered for it
+            discard_appends(final_path)
+            if _unchanged(final_path, data):
+                self.logger.info(f"[WriteFilesStep] Unchanged, skipped file: {final_path}")
+                results.append({"path": final_path, "status": "skipped", "bytes": len(data)})
+                continue
 
-            # Write to disk
             try:
-                with open(final_path, "w", encoding="utf-8") as f:
-                    f.write(text)
+                _atomic_write(final_path, data)
             except Exception as err:
-                self.logger.error(f"[WriteFilesStep] Error writing file '{rel_path}': {err}")
+                self.logger.error(f"[WriteFilesStep] Error writing file '{entry.get('path', '')}': {err}")
                 raise IOError(f"Error writing file '{final_path}': {err}")
+            invalidate_file_cache(final_path)
 
             # Info log
-            size = len(text.encode("utf-8"))
-            self.logger.info(f"[WriteFilesStep] Wrote file: {final_path} ({size} bytes)")
+            self.logger.info(f"[WriteFilesStep] Wrote file: {final_path} ({len(data)} bytes)")
+            results.append({"path": final_path, "status": "written", "bytes": len(data)})
+        return results
+
+
+def _unchanged(path: str, data: bytes) -> bool:
+    """
+    Return True if the file already holds exactly `data`: compare sizes first and only
+    read the file when they match, stopping at the first differing chunk.
+    """
+    try:
+        if os.path.getsize(path) != len(data):
+            return False
+        with open(path, "rb") as f:
+            view = memoryview(data)
+            offset = 0
+            while True:
+                chunk = f.read(_COMPARE_CHUNK)
+                if not chunk:
+                    return offset == len(data)
+                if view[offset : offset + len(chunk)] != chunk:
+                    return False
+                offset += len(chunk)
+    except OSError:
+        return False
+
+
+def _atomic_write(path: str, data: bytes) -> None:
+    """
+    Write through a temporary file in the same directory and rename it over the target,
+    so readers and crashes never see a partially written file. Keeps the permissions of
+    an existing file; new files get the default permissions, as with `open()`.
+    """
+    try:
+        mode: Optional[int] = stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        mode = None
+    fd, tmp_path = _create_temp_file(path)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        if mode is not None:
+            os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _create_temp_file(path: str) -> Tuple[int, str]:
+    """
+    Create a uniquely named temporary file next to `path` and return its descriptor
+    and path. Like `open()`, it is created with mode 0o666 so the process umask
+    applies (mkstemp would create it 0o600), without reading or changing the umask.
+    """
+    directory = os.path.dirname(path) or "."
+    name = os.path.basename(path)
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+    for _ in range(100):
+        tmp_path = os.path.join(directory, f".{name}.{uuid.uuid4().hex[:12]}.tmp")
+        try:
+            return os.open(tmp_path, flags, 0o666), tmp_path
+        except FileExistsError:
+            continue
+    raise FileExistsError(f"No usable temporary file name for '{path}'")
@@ -0,0 +1,284 @@
+# This file was generated by Codebase-Generator, do not edit directly
+"""
+Hierarchical tracing of recipe execution.
+
+When a `Tracer` is active (CLI `--trace <file>`), the Executor, the container
+steps and the LLM component open nested spans: recipes, steps, loop items,
+parallel substeps, conditional branches and LLM calls. Spans record start and
+end times, attributes (recipe path, step index and type, item key, model) and
+counters such as tokens and bytes read or written.
+
+The finished trace is written as a JSON span tree and as a Chrome trace-event
+file that chrome://tracing, Perfetto and speedscope can open.
+
+Without an active tracer `trace_span` returns a shared no-op context manager
+and `add_counter` returns after a context variable lookup, so tracing costs
+close to nothing when it is off.
+"""
+
+import asyncio
+import contextvars
+import json
+import os
+import threading
+import time
+from contextlib import nullcontext
+from datetime import datetime, timezone
+from typing import Any, ContextManager, Dict, List, Optional, Tuple
+
+__all__ = [
+    "Span",
+    "Tracer",
+    "activate_tracer",
+    "current_tracer",
+    "trace_span",
+    "add_counter",
+    "set_span_attribute",
+]
+
+
+class Span:
+    """
+    A timed unit of work in the trace tree.
+
+    Attributes:
+        name: Display name (e.g. "step 3: llm_generate").
+        kind: Span kind: "run", "recipe", "step", "item", "substep", "branch" or "llm".
+        attrs: Descriptive attributes.
+        counters: Numeric counters recorded directly on this span (tokens, bytes).
+        start: Start time in seconds relative to the trace start.
+        end: End time in seconds relative to the trace start, or None while open.
+        lane: Execution lane (one per asyncio task) for trace viewers.
+    """
+
+    __slots__ = ("name", "kind", "attrs", "counters", "start", "end", "lane", "error", "children")
+
+    def __init__(self, name: str, kind: str, attrs: Dict[str, Any], start: float, lane: int) -> None:
+        self.name = name
+        self.kind = kind
+        self.attrs = attrs
+        self.counters: Dict[str, float] = {}
+        self.start = start
+        self.end: Optional[float] = None
+        self.lane = lane
+        self.error: Optional[str] = None
+        self.children: List["Span"] = []
+
+    @property
+    def duration(self) -> float:
+        return (self.end if self.end is not None else self.start) - self.start
+
+    def totals(self) -> Dict[str, float]:
+        """Return the counters summed over this span and all of its descendants."""
+        totals = dict(self.counters)
+        for child in self.children:
+            for name, value in child.totals().items():
+                totals[name] = totals.get(name, 0) + value
+        return totals
+
+    def to_dict(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {
+            "name": self.name,
+            "kind": self.kind,
+            "start": round(self.start, 6),
+            "duration": round(self.duration, 6),
+        }
+        if self.attrs:
+            data["attrs"] = self.attrs
+        if self.counters:
+            data["counters"] = self.counters
+        if self.children:
+            data["totals"] = self.totals()
+            data["children"] = [child.to_dict() for child in self.children]
+        if self.error is not None:
+            data["error"] = self.error
+        return data
+
+
+_current_tracer: contextvars.ContextVar[Optional["Tracer"]] = contextvars.ContextVar("tracer", default=None)
+_current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("trace_span", default=None)
+
+_NO_SPAN: ContextManager[Optional[Span]] = nullcontext(None)
+
+
+class _SpanScope:
+    """Context manager opening a span as the child of the current span."""
+
+    __slots__ = ("tracer", "name", "kind", "attrs", "span", "token")
+
+    def __init__(self, tracer: "Tracer", name: str, kind: str, attrs: Dict[str, Any]) -> None:
+        self.tracer = tracer
+        self.name = name
+        self.kind = kind
+        self.attrs = attrs
+
+    def __enter__(self) -> Span:
+        parent = _current_span.get() or self.tracer.root
+        self.span = Span(self.name, self.kind, self.attrs, self.tracer.now(), self.tracer.lane())
+        parent.children.append(self.span)
+        self.token = _current_span.set(self.span)
+        return self.span
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        self.span.end = self.tracer.now()
+        if exc is not None:
+            self.span.error = f"{type(exc).__name__}: {exc}"
+        _current_span.reset(self.token)
+
+
+class Tracer:
+    """
+    Collects the span tree of one run.
+
+    Args:
+        name: Name of the root span.
+        attrs: Attributes of the root span.
+    """
+
+    def __init__(self, name: str = "run", **attrs: Any) -> None:
+        self.started_at = datetime.now(timezone.utc)
+        self._origin = time.perf_counter()
+        self.root = Span(name, "run", attrs, 0.0, 0)
+        self._lanes: Dict[Tuple[int, int], int] = {}
+        self._lanes_lock = threading.Lock()
+
+    def now(self) -> float:
+        return time.perf_counter() - self._origin
+
+    def lane(self) -> int:
+        """Return a small integer identifying the current asyncio task (and thread)."""
+        try:
+            task_id = id(asyncio.current_task())
+        except RuntimeError:
+            task_id = 0
+        key = (threading.get_ident(), task_id)
+        with self._lanes_lock:
+            lane = self._lanes.get(key)
+            if lane is None:
+                lane = len(self._lanes)
+                self._lanes[key] = lane
+            return lane
+
+    def span(self, name: str, kind: str = "step", **attrs: Any) -> _SpanScope:
+        return _SpanScope(self, name, kind, attrs)
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        """Close the root span."""
+        self.root.end = self.now()
+        if error is not None:
+            self.root.error = f"{type(error).__name__}: {error}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": 1,
+            "started_at": self.started_at.isoformat(),
+            "root": self.root.to_dict(),
+        }
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """
+        Return the trace in Chrome trace-event format (complete "X" events, one thread
+        per lane), readable by chrome://tracing, Perfetto and speedscope.
+        """
+        events: List[Dict[str, Any]] = []
+        lanes = set()
+        stack: List[Span] = [self.root]
+        while stack:
+            span = stack.pop()
+            lanes.add(span.lane)
+            args: Dict[str, Any] = {**span.attrs, **span.counters}
+            if span.error is not None:
+                args["error"] = span.error
+            events.append({
+                "name": span.name,
+                "cat": span.kind,
+                "ph": "X",
+                "ts": round(span.start * 1e6, 3),
+                "dur": round(span.duration * 1e6, 3),
+                "pid": 1,
+                "tid": span.lane,
+                "args": args,
+            })
+            stack.extend(reversed(span.children))
+        for lane in sorted(lanes):
+            events.append({
+                "name": "thread_name",
+                "ph": "M",
+                "pid": 1,
+                "tid": lane,
+                "args": {"name": "main" if lane == 0 else f"task {lane}"},
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write(self, path: str) -> Tuple[str, str]:
+        """
+        Write the JSON span tree to `path` and the Chrome trace next to it
+        (`<name>.chrome.json`). Returns both paths.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        stem = path[:-5] if path.endswith(".json") else path
+        chrome_path = f"{stem}.chrome.json"
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2, default=str)
+        with open(chrome_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_chrome_trace(), f, default=str)
+        return path, chrome_path
+
+    def report(self, top: int = 10) -> str:
+        """
+        Return a timing report: the slowest spans with their self time (duration not
+        covered by child spans) and counters.
+        """
+        rows: List[Tuple[float, float, str, Dict[str, float]]] = []
+        stack: List[Tuple[Span, str]] = [(child, child.name) for child in self.root.children]
+        while stack:
+            span, path = stack.pop()
+            child_time = sum(child.duration for child in span.children)
+            rows.append((span.duration, max(0.0, span.duration - child_time), path, span.totals()))
+            stack.extend((child, f"{path} > {child.name}") for child in span.children)
+        rows.sort(key=lambda row: row[0], reverse=True)
+
+        lines = [f"Total {self.root.duration:.3f}s; slowest spans:"]
+        for duration, self_time, path, totals in rows[:top]:
+            counters = " ".join(f"{name}={int(value)}" for name, value in sorted(totals.items()))
+            lines.append(f"  {duration:9.3f}s (self {self_time:8.3f}s)  {path}  {counters}".rstrip())
+        return "\n".join(lines)
+
+
+def activate_tracer(tracer: Optional[Tracer]) -> None:
+    """Make `tracer` the tracer of the current context (None disables tracing)."""
+    _current_tracer.set(tracer)
+    _current_span.set(None)
+
+
+def current_tracer() -> Optional[Tracer]:
+    return _current_tracer.get()
+
+
+def trace_span(name: str, kind: str = "step", **attrs: Any) -> ContextManager[Optional[Span]]:
+    """
+    Return a context manager recording a span as the child of the current span.
+    Yields the span, or None when tracing is off.
+    """
+    tracer = _current_tracer.get()
+    if tracer is None:
+        return _NO_SPAN
+    return tracer.span(name, kind, **attrs)
+
+
+def add_counter(name: str, value: float) -> None:
+    """Add `value` to a counter (e.g. "tokens", "bytes_read") of the current span."""
+    tracer = _current_tracer.get()
+    if tracer is None:
+        return
+    span = _current_span.get() or tracer.root
+    span.counters[name] = span.counters.get(name, 0) + value
+
+
+def set_span_attribute(name: str, value: Any) -> None:
+    """Set an attribute of the current span."""
+    span = _current_span.get()
+    if span is not None:
+        span.attrs[name] = value
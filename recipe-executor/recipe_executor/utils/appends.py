@@ -0,0 +1,195 @@
+# This file was generated by Codebase-Generator, do not edit directly
+"""
+Buffered append-only file writes.
+
+`write_files` in append mode hands each new fragment to this buffer instead of
+rewriting the whole file. Only fragments not yet on disk are kept in memory; they
+are written in one append per file when the buffer is flushed, so per-append cost
+depends only on the size of the fragment, not of the file. The buffer is flushed:
+
+- by the executor before every step other than `write_files`, so steps reading
+  files (`read_files`, conditions such as `file_exists`, tools, sub-processes) see
+  every fragment appended by earlier steps;
+- by `read_files` for the files it reads;
+- when more than `MAX_PENDING_BYTES` are buffered;
+- when a checkpoint is saved and when the top-level recipe run ends, with fsync.
+
+Each flush appends to the file as it is on disk at that moment: content written by
+others between flushes is kept. A flush that fails partway removes the bytes it
+wrote itself; sizes are never remembered across flushes for truncation. When the
+top-level run ends, `close_appends` flushes and forgets every file.
+
+Checkpoints record the flushed size of every appended file; resuming truncates the
+files back to those sizes so fragments of steps that run again are not duplicated.
+"""
+
+import os
+import threading
+from typing import Dict, List, Optional
+
+__all__ = [
+    "MAX_PENDING_BYTES",
+    "append_to_file",
+    "appended_file_sizes",
+    "close_appends",
+    "discard_appends",
+    "flush_appends",
+    "truncate_appended_files",
+]
+
+# Unflushed bytes (all files) above which an append flushes the buffer
+MAX_PENDING_BYTES = 4 * 1024 * 1024
+
+
+class _AppendedFile:
+    """Unflushed fragments and flushed size of one appended file."""
+
+    __slots__ = ("pending", "pending_bytes", "flushed_size", "synced")
+
+    def __init__(self, flushed_size: int) -> None:
+        # Fragments not yet written to disk
+        self.pending: List[bytes] = []
+        self.pending_bytes: int = 0
+        self.flushed_size: int = flushed_size
+        # False while written fragments have not been fsynced
+        self.synced: bool = True
+
+
+_files: Dict[str, _AppendedFile] = {}
+_pending_bytes = 0
+_lock = threading.Lock()
+
+
+def _key(path: str) -> str:
+    return os.path.realpath(path)
+
+
+def append_to_file(path: str, text: str) -> int:
+    """
+    Append `text` to the file at `path` (buffered until the next flush).
+    Returns the number of bytes appended.
+
+    Raises:
+        IOError: If the file cannot be written when the buffer is full.
+    """
+    global _pending_bytes
+    key = _key(path)
+    data = text.encode("utf-8")
+    with _lock:
+        entry = _files.get(key)
+        if entry is None:
+            try:
+                size = os.path.getsize(key)
+            except OSError:
+                size = 0
+            entry = _AppendedFile(size)
+            _files[key] = entry
+        entry.pending.append(data)
+        entry.pending_bytes += len(data)
+        _pending_bytes += len(data)
+        if _pending_bytes > MAX_PENDING_BYTES:
+            _flush_locked(list(_files), sync=False)
+    return len(data)
+
+
+def discard_appends(path: str) -> None:
+    """
+    Forget a buffered file and its unflushed fragments, e.g. because the file is
+    about to be overwritten.
+    """
+    global _pending_bytes
+    with _lock:
+        entry = _files.pop(_key(path), None)
+        if entry is not None:
+            _pending_bytes -= entry.pending_bytes
+
+
+def flush_appends(path: Optional[str] = None, sync: bool = True) -> None:
+    """
+    Write unflushed fragments to disk, one append per file: those of `path`, or of
+    every buffered file. With `sync`, written files are also fsynced (checkpoints and
+    the end of a run); read barriers skip it.
+
+    Raises:
+        IOError: If a file cannot be written.
+    """
+    with _lock:
+        if path is None:
+            keys = list(_files)
+        else:
+            key = _key(path)
+            keys = [key] if key in _files else []
+        _flush_locked(keys, sync)
+
+
+def _flush_locked(keys: List[str], sync: bool) -> None:
+    global _pending_bytes
+    for key in keys:
+        entry = _files[key]
+        if not entry.pending and (entry.synced or not sync):
+            continue
+        data = b"".join(entry.pending)
+        parent = os.path.dirname(key)
+        try:
+            if parent:
+                os.makedirs(parent, exist_ok=True)
+            with open(key, "ab") as f:
+                start = f.tell()
+                try:
+                    f.write(data)
+                    f.flush()
+                except OSError:
+                    # Remove the partial fragment this flush wrote, and only that
+                    f.truncate(start)
+                    raise
+                if sync:
+                    os.fsync(f.fileno())
+                size = f.tell()
+        except OSError as err:
+            raise IOError(f"Error appending to file '{key}': {err}")
+        # The fragments are on disk now; only the file's size is kept
+        entry.pending = []
+        _pending_bytes -= entry.pending_bytes
+        entry.pending_bytes = 0
+        entry.flushed_size = size
+        entry.synced = sync
+
+
+def close_appends() -> None:
+    """
+    Flush every buffered file (with fsync) and forget them, e.g. when a top-level run
+    ends. Files whose flush fails stay buffered.
+
+    Raises:
+        IOError: If a file cannot be written.
+    """
+    with _lock:
+        try:
+            _flush_locked(list(_files), sync=True)
+        finally:
+            for key in [key for key, entry in _files.items() if not entry.pending]:
+                del _files[key]
+
+
+def appended_file_sizes() -> Dict[str, int]:
+    """Return the flushed size in bytes of every buffered file."""
+    with _lock:
+        return {key: entry.flushed_size for key, entry in _files.items()}
+
+
+def truncate_appended_files(sizes: Dict[str, int]) -> None:
+    """
+    Truncate files to the sizes recorded by a checkpoint, removing fragments
+    appended after it. Files that are smaller or missing are left alone.
+    """
+    global _pending_bytes
+    with _lock:
+        for key, size in sizes.items():
+            entry = _files.pop(key, None)
+            if entry is not None:
+                _pending_bytes -= entry.pending_bytes
+            try:
+                if os.path.getsize(key) > size:
+                    os.truncate(key, size)
+            except OSError:
+                continue
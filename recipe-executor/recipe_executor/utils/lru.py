@@ -0,0 +1,138 @@
+# This file was generated by Codebase-Generator, do not edit directly
+"""
+Small thread-safe LRU cache used by the in-process caches of the Recipe Executor.
+
+Entries are bounded by count and, optionally, by a byte budget computed with a
+caller-supplied `sizeof` function. Hit, miss and eviction counters are kept so
+callers can report cache effectiveness.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Generic, Hashable, Optional, TypeVar
+
+__all__ = ["LRUCache"]
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class LRUCache(Generic[K, V]):
+    """
+    Least-recently-used cache with entry-count and optional byte-budget limits.
+
+    Args:
+        max_entries: Maximum number of entries to keep. 0 disables caching.
+        max_bytes: Optional total size budget; requires `sizeof`.
+        sizeof: Optional function returning the size in bytes of a value.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 128,
+        max_bytes: Optional[int] = None,
+        sizeof: Optional[Callable[[V], int]] = None,
+    ) -> None:
+        self.max_entries: int = max_entries
+        self.max_bytes: Optional[int] = max_bytes
+        self._sizeof: Optional[Callable[[V], int]] = sizeof
+        self._data: "OrderedDict[K, V]" = OrderedDict()
+        self._sizes: Dict[K, int] = {}
+        self._bytes: int = 0
+        self._lock = threading.Lock()
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+    def get(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        """
+        Return the cached value for key (marking it most recently used), or default.
+        """
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: K, value: V) -> None:
+        """
+        Store a value, evicting least recently used entries to respect the limits.
+        Values larger than the whole byte budget are not cached.
+        """
+        if self.max_entries <= 0:
+            return
+        size = self._sizeof(value) if self._sizeof is not None else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            self._data[key] = value
+            self._sizes[key] = size
+            self._bytes += size
+            while len(self._data) > self.max_entries or (self.max_bytes is not None and self._bytes > self.max_bytes):
+                oldest = next(iter(self._data))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def pop(self, key: K) -> Optional[V]:
+        """
+        Remove and return the value for key, or None if not cached.
+        """
+        with self._lock:
+            if key not in self._data:
+                return None
+            value = self._data[key]
+            self._remove(key)
+            return value
+
+    def clear(self) -> None:
+        """
+        Drop all entries. Counters are preserved.
+        """
+        with self._lock:
+            self._data.clear()
+            self._sizes.clear()
+            self._bytes = 0
+
+    def resize(self, max_entries: Optional[int] = None, max_bytes: Optional[int] = None) -> None:
+        """
+        Change the limits, evicting entries if the cache is now over budget.
+        """
+        with self._lock:
+            if max_entries is not None:
+                self.max_entries = max_entries
+            if max_bytes is not None:
+                self.max_bytes = max_bytes
+            while self._data and (
+                len(self._data) > self.max_entries or (self.max_bytes is not None and self._bytes > self.max_bytes)
+            ):
+                self._remove(next(iter(self._data)))
+                self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return a snapshot of the cache counters and occupancy.
+        """
+        with self._lock:
+            return {
+                "entries": len(self._data),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def _remove(self, key: K) -> None:
+        del self._data[key]
+        self._bytes -= self._sizes.pop(key, 0)
@@ -4,19 +4,25 @@ Utility functions for rendering Liquid templates using context data.
 
 Provides a `render_template` function that renders strings with variables sourced from
 an object implementing ContextProtocol. Includes a custom `snakecase` filter and enables
-extra filters via the environment.
+extra filters via the environment. Parsed templates are kept in an LRU cache keyed by
+their source text, bounded by entries and bytes, and contexts that offer a read-only view
+are rendered without copying.
 """
 
+import io
 import re
-from typing import Any
+from typing import Any, Dict, Mapping, Tuple
 
-from liquid import Environment
+from liquid import BoundTemplate, Environment
 from liquid.exceptions import LiquidError
+from liquid.extra import JSON
 
 # Import ContextProtocol inside the module to avoid circular dependencies
 from recipe_executor.protocols import ContextProtocol
+from recipe_executor.utils.lru import LRUCache
+from recipe_executor.utils.text import json_default
 
-__all__ = ["render_template"]
+__all__ = ["render_template", "get_template", "template_cache_stats"]
 
 # Create a module-level Liquid environment with extra filters enabled
 _env = Environment(autoescape=False, extra=True)
@@ -46,6 +52,65 @@ def _snakecase(value: Any) -> str:
 
 # Register custom filter
 _env.filters["snakecase"] = _snakecase
+# The json filter must serialize TextRope values (merged strings) as strings
+_env.filters["json"] = JSON(default=json_default)
+
+# Parsed templates keyed by source text; loops render the same sources over and over.
+# Entries hold their size (the source key plus the parsed nodes, about twice its length)
+# so the cache stays within a byte budget. Larger sources are usually rendered values
+# passed through nested_render, which are rarely rendered twice: they are not cached.
+_TEMPLATE_CACHE_SIZE = 1024
+_TEMPLATE_CACHE_BYTES = 32 * 1024 * 1024
+_MAX_CACHED_SOURCE = 64 * 1024
+_template_cache: LRUCache[str, Tuple[int, BoundTemplate]] = LRUCache(
+    max_entries=_TEMPLATE_CACHE_SIZE,
+    max_bytes=_TEMPLATE_CACHE_BYTES,
+    sizeof=lambda entry: entry[0],
+)
+
+
+def get_template(text: str) -> BoundTemplate:
+    """
+    Return the parsed template for the given source text, parsing it at most once
+    (sources over _MAX_CACHED_SOURCE characters are parsed every time).
+
+    Raises:
+        LiquidError: If the template cannot be parsed.
+    """
+    if len(text) > _MAX_CACHED_SOURCE:
+        return _env.from_string(text)
+    entry = _template_cache.get(text)
+    if entry is None:
+        entry = (2 * len(text), _env.from_string(text))
+        _template_cache.put(text, entry)
+    return entry[1]
+
+
+def _render_scope(context: ContextProtocol) -> Mapping[str, Any]:
+    """
+    Return the variables available to templates.
+
+    Contexts exposing `as_mapping()` provide a read-only view over their artifacts,
+    which avoids deep-copying every artifact for every render; other implementations
+    fall back to `dict()`. The view hands merged text (TextRope) out as `str`, so
+    templates treat it exactly like a string.
+    """
+    as_mapping = getattr(context, "as_mapping", None)
+    if callable(as_mapping):
+        return as_mapping()
+    return context.dict()
+
+
+def _render(template: BoundTemplate, data: Mapping[str, Any]) -> str:
+    """
+    Render with `data` as the template's globals. Unlike `template.render(data)`, this
+    does not copy the mapping into a dict, so a view only converts the values the
+    template looks up.
+    """
+    render_context = template.context_class(template, globals=template.make_globals(data))
+    buffer = io.StringIO()
+    template.render_with_context(render_context, buffer)
+    return buffer.getvalue()
 
 
 def render_template(text: str, context: ContextProtocol) -> str:
@@ -62,14 +127,21 @@ def render_template(text: str, context: ContextProtocol) -> str:
     Raises:
         ValueError: If there is an error during template parsing or rendering.
     """
-    data = context.dict()
+    data = _render_scope(context)
     try:
-        template = _env.from_string(text)
-        result = template.render(**data)
+        template = get_template(text)
+        result = _render(template, data)
         return result
     except LiquidError as e:
-        message = f"Liquid template rendering error: {e}. Template: {text!r}. Context: {data!r}"
+        message = f"Liquid template rendering error: {e}. Template: {text!r}. Context: {dict(data)!r}"
         raise ValueError(message) from e
     except Exception as e:
-        message = f"Error rendering template: {e}. Template: {text!r}. Context: {data!r}"
+        message = f"Error rendering template: {e}. Template: {text!r}. Context: {dict(data)!r}"
         raise ValueError(message) from e
+
+
+def template_cache_stats() -> Dict[str, Any]:
+    """
+    Return hit/miss counters and occupancy of the parsed-template cache.
+    """
+    return _template_cache.stats()
@@ -0,0 +1,265 @@
+# This file was generated by Codebase-Generator, do not edit directly
+"""
+Text values built incrementally or kept out of memory.
+
+`TextRope` is an immutable string made of a list of segments. Appending returns a
+new rope in O(1) (amortized) instead of copying the accumulated text, and the joined
+string is only materialized, once, when the rope is used as text. It behaves like a
+string for Liquid templates (output, filters, comparisons, `contains`), `str()`,
+`len()`, equality and string methods, so `set_context` can use it for merged and
+appended strings without recipes noticing.
+
+`BlobText` is an immutable string stored in a file of the artifact store's blob
+directory. It behaves like a string in the same ways, reading (mmap) and decoding the
+file each time it is used as text, so large context values only occupy memory while
+a step uses them.
+"""
+
+import mmap
+import threading
+from collections.abc import Collection
+from typing import Any, Iterator, List, Optional, Tuple, Type, Union
+
+__all__ = ["TEXT_TYPES", "BlobText", "TextRope", "json_default"]
+
+# Guards extending a segment list shared by several ropes
+_append_lock = threading.Lock()
+
+
+class TextRope(Collection):
+    """
+    Immutable string built from segments with O(1) appends.
+
+    Ropes derived from one another by appending share their segment list: each
+    rope sees the first `count` segments. Appending to the rope that ends the list
+    extends it in place; appending to an older rope copies its segment references.
+
+    Args:
+        parts: Initial strings or ropes.
+    """
+
+    __slots__ = ("_segments", "_count", "_length", "_text")
+
+    def __init__(self, *parts: Union[str, "TextRope", "BlobText"]) -> None:
+        segments: List[str] = []
+        length = 0
+        for part in parts:
+            added, size = _segments_of(part)
+            segments.extend(added)
+            length += size
+        self._segments: List[str] = segments
+        self._count: int = len(segments)
+        self._length: int = length
+        self._text: Optional[str] = None
+
+    @classmethod
+    def _view(cls, segments: List[str], count: int, length: int) -> "TextRope":
+        rope = cls.__new__(cls)
+        rope._segments = segments
+        rope._count = count
+        rope._length = length
+        rope._text = None
+        return rope
+
+    @property
+    def segment_count(self) -> int:
+        return self._count
+
+    def append(self, other: Union[str, "TextRope", "BlobText"]) -> "TextRope":
+        """Return a new rope with `other` appended; this rope is unchanged."""
+        added, size = _segments_of(other)
+        if not added:
+            return self
+        with _append_lock:
+            segments = self._segments
+            if len(segments) == self._count:
+                segments.extend(added)
+            else:
+                segments = segments[: self._count] + added
+        return TextRope._view(segments, self._count + len(added), self._length + size)
+
+    def __add__(self, other: Any) -> "TextRope":
+        if not isinstance(other, TEXT_TYPES):
+            return NotImplemented
+        return self.append(other)
+
+    def __radd__(self, other: Any) -> "TextRope":
+        if not isinstance(other, str):
+            return NotImplemented
+        return TextRope(other, self)
+
+    def __str__(self) -> str:
+        text = self._text
+        if text is None:
+            if self._count == 1:
+                text = self._segments[0]
+            else:
+                text = "".join(self._segments[: self._count])
+            self._text = text
+        return text
+
+    # Liquid calls __liquid__ before comparing values and testing truthiness
+    __liquid__ = __str__
+
+    def __repr__(self) -> str:
+        return f"TextRope({self._length} chars, {self._count} segments)"
+
+    def __format__(self, format_spec: str) -> str:
+        return format(str(self), format_spec)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __bool__(self) -> bool:
+        return self._length > 0
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(str(self))
+
+    def __contains__(self, item: object) -> bool:
+        return str(item) in str(self)
+
+    def __getitem__(self, index: Union[int, slice]) -> str:
+        return str(self)[index]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, TEXT_TYPES):
+            if len(other) != self._length:
+                return False
+            return str(self) == str(other)
+        return NotImplemented
+
+    def __ne__(self, other: object) -> bool:
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    def __hash__(self) -> int:
+        return hash(str(self))
+
+    def __getattr__(self, name: str) -> Any:
+        # String methods (strip, split, upper, ...) operate on the materialized text
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(str(self), name)
+
+    def __copy__(self) -> "TextRope":
+        return self
+
+    def __deepcopy__(self, memo: Any) -> "TextRope":
+        # Immutable: copies can share the rope
+        return self
+
+    def __reduce__(self) -> Tuple[Any, Tuple[str]]:
+        # Pickle (checkpoints) as a single joined segment
+        return (TextRope, (str(self),))
+
+
+class BlobText(Collection):
+    """
+    Immutable string held in a UTF-8 file (see `artifact_store`), read on use.
+
+    Args:
+        path: File holding the text.
+        length: Length of the text in characters.
+        digest: SHA-256 of the encoded text (blob files are named after it).
+    """
+
+    __slots__ = ("path", "digest", "_length")
+
+    def __init__(self, path: str, length: int, digest: str) -> None:
+        self.path: str = path
+        self.digest: str = digest
+        self._length: int = length
+
+    def __str__(self) -> str:
+        if not self._length:
+            return ""
+        with open(self.path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return str(data, "utf-8")
+
+    # Liquid calls __liquid__ before comparing values and testing truthiness
+    __liquid__ = __str__
+
+    def __repr__(self) -> str:
+        return f"BlobText({self._length} chars, {self.digest[:12]})"
+
+    def __format__(self, format_spec: str) -> str:
+        return format(str(self), format_spec)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __bool__(self) -> bool:
+        return self._length > 0
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(str(self))
+
+    def __contains__(self, item: object) -> bool:
+        return str(item) in str(self)
+
+    def __getitem__(self, index: Union[int, slice]) -> str:
+        return str(self)[index]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, BlobText):
+            return self.digest == other.digest
+        if isinstance(other, (str, TextRope)):
+            if len(other) != self._length:
+                return False
+            return str(self) == str(other)
+        return NotImplemented
+
+    def __ne__(self, other: object) -> bool:
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    def __hash__(self) -> int:
+        return hash(str(self))
+
+    def __add__(self, other: Any) -> TextRope:
+        if not isinstance(other, (str, TextRope, BlobText)):
+            return NotImplemented
+        return TextRope(str(self), other)
+
+    def __radd__(self, other: Any) -> TextRope:
+        if not isinstance(other, str):
+            return NotImplemented
+        return TextRope(other, str(self))
+
+    def __getattr__(self, name: str) -> Any:
+        # String methods (strip, split, upper, ...) operate on the text read from the blob
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(str(self), name)
+
+    def __copy__(self) -> "BlobText":
+        return self
+
+    def __deepcopy__(self, memo: Any) -> "BlobText":
+        # Immutable: copies can share the handle
+        return self
+
+    def __reduce__(self) -> Tuple[Any, Tuple[str]]:
+        # Pickle (checkpoints) as a plain string: the blob directory may not outlive the process
+        return (str, (str(self),))
+
+
+# String-like types of context values
+TEXT_TYPES: Tuple[Type[Any], ...] = (str, TextRope, BlobText)
+
+
+def _segments_of(part: Union[str, TextRope, BlobText]) -> Tuple[List[str], int]:
+    if isinstance(part, TextRope):
+        if part._text is not None:
+            return ([part._text] if part._text else []), part._length
+        return part._segments[: part._count], part._length
+    text = str(part)
+    return ([text] if text else []), len(text)
+
+
+def json_default(value: Any) -> Any:
+    """`default` hook for `json.dumps` that serializes ropes and blobs as strings."""
+    if isinstance(value, (TextRope, BlobText)):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
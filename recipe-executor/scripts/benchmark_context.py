@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark Context.clone() cost as the context grows.
+
+Simulates the loop/parallel fan-out pattern: a context holding a large
+document plus loaded resources is cloned once per item, and each clone
+writes a couple of item-specific keys. Clone cost should stay flat as the
+context size grows, unlike a full deepcopy.
+
+Items usually also read the shared values. `get` deep-copies a shared value on
+its first read (the caller may mutate it), so its cost grows with the value;
+`peek`, for read-only callers, does not copy.
+
+Usage:
+    python scripts/benchmark_context.py
+    make benchmark
+"""
+
+import copy
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+# Add the parent directory to path for importing modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from recipe_executor.context import Context, peek  # noqa: E402
+
+ITERATIONS = 200
+
+
+def build_artifacts(document_kb: int) -> Dict[str, Any]:
+    """Build artifacts resembling a document-generator run."""
+    document = "lorem ipsum dolor sit amet " * (document_kb * 1024 // 27)
+    resources = [{"path": f"resource_{i}.md", "content": document[: 4 * 1024]} for i in range(document_kb // 4 or 1)]
+    outline = {"sections": [{"title": f"Section {i}", "prompt": "Write it.", "refs": ["r"]} for i in range(30)]}
+    return {"document": document, "resources": resources, "outline": outline, "model": "openai/gpt-4o"}
+
+
+def time_per_clone(context: Context) -> float:
+    start = time.perf_counter()
+    for i in range(ITERATIONS):
+        clone = context.clone()
+        clone["section"] = {"title": f"Section {i}"}
+        clone["__index"] = i
+    return (time.perf_counter() - start) / ITERATIONS
+
+
+def time_per_clone_and_read(context: Context, read_only: bool) -> float:
+    start = time.perf_counter()
+    for i in range(ITERATIONS):
+        clone = context.clone()
+        clone["section"] = {"title": f"Section {i}"}
+        for key in ("document", "resources", "outline"):
+            if read_only:
+                peek(clone, key)
+            else:
+                clone.get(key)
+    return (time.perf_counter() - start) / ITERATIONS
+
+
+def time_per_deepcopy(artifacts: Dict[str, Any]) -> float:
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        copy.deepcopy(artifacts)
+    return (time.perf_counter() - start) / ITERATIONS
+
+
+def main() -> None:
+    print(f"{'context size':>14} {'clone (us)':>12} {'+get (us)':>12} {'+peek (us)':>12} {'deepcopy (us)':>15}")
+    for document_kb in (16, 64, 256, 1024, 4096):
+        artifacts = build_artifacts(document_kb)
+        context = Context(artifacts=artifacts)
+        clone_us = time_per_clone(context) * 1e6
+        get_us = time_per_clone_and_read(context, read_only=False) * 1e6
+        peek_us = time_per_clone_and_read(context, read_only=True) * 1e6
+        deepcopy_us = time_per_deepcopy(artifacts) * 1e6
+        print(f"{document_kb:>11} KB {clone_us:>12.1f} {get_us:>12.1f} {peek_us:>12.1f} {deepcopy_us:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark the start-up import cost of the recipe executor.
+
+Runs `python -X importtime` in a fresh interpreter for each entry point and reports
+the cumulative import time and the slowest modules. Step modules are imported when
+a recipe first uses their step type and provider SDKs when a model is created, so
+starting the CLI, or running a recipe that only reads and writes files, must not
+import pydantic_ai, openai, anthropic, azure.identity, mcp, docpack_file or yaml.
+The script exits with status 1 if one of them is imported, or if an entry point
+exceeds `--budget-ms`, so regressions are caught in CI.
+
+Usage:
+    python scripts/benchmark_import.py
+    python scripts/benchmark_import.py --budget-ms 800 --top 15
+    make benchmark
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import List, Tuple
+
+# Entry points measured, as code run by `python -c`
+ENTRY_POINTS: List[Tuple[str, str]] = [
+    ("recipe-executor CLI", "import recipe_executor.main"),
+    (
+        "read_files/write_files recipe",
+        "import recipe_executor.main; from recipe_executor.steps.registry import STEP_REGISTRY; "
+        "STEP_REGISTRY['read_files']; STEP_REGISTRY['write_files']; STEP_REGISTRY['set_context']",
+    ),
+]
+
+# Top-level packages that only the steps and providers needing them may import
+DEFERRED_PACKAGES = ("pydantic_ai", "openai", "anthropic", "azure", "mcp", "docpack_file", "yaml")
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+
+def measure(code: str) -> List[Tuple[str, int, int]]:
+    """
+    Return (module, self us, cumulative us) for every module imported by `code`;
+    module names keep the indentation marking nested imports.
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(PROJECT_ROOT), env.get("PYTHONPATH")]))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        env=env,
+        stdin=subprocess.DEVNULL,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Import failed:\n{proc.stderr}")
+    modules: List[Tuple[str, int, int]] = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        modules.append((name[1:].rstrip(), int(self_us), int(cumulative_us)))
+    return modules
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark recipe executor import time.")
+    parser.add_argument("--budget-ms", type=float, default=None, help="Fail if an entry point imports slower")
+    parser.add_argument("--top", type=int, default=10, help="Number of slowest modules to list")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per entry point (the fastest is reported)")
+    args = parser.parse_args()
+
+    failed = False
+    for label, code in ENTRY_POINTS:
+        runs = [measure(code) for _ in range(max(args.runs, 1))]
+        # Top-level imports of a run (no indentation) add up to its total import time
+        totals = [sum(cum for name, _, cum in run if not name.startswith(" ")) for run in runs]
+        best = min(range(len(runs)), key=lambda i: totals[i])
+        modules = runs[best]
+        total_ms = totals[best] / 1000
+
+        print(f"{label}: {total_ms:.1f} ms ({len(modules)} modules)")
+        # Slowest modules by their own import time
+        for name, self_us, _ in sorted(modules, key=lambda m: m[1], reverse=True)[: args.top]:
+            print(f"  {self_us / 1000:>8.1f} ms  {name.strip()}")
+
+        loaded = sorted({name.strip().split(".")[0] for name, _, _ in modules} & set(DEFERRED_PACKAGES))
+        if loaded:
+            print(f"  FAIL: imports deferred packages: {', '.join(loaded)}")
+            failed = True
+        if args.budget_ms is not None and total_ms > args.budget_ms:
+            print(f"  FAIL: over budget of {args.budget_ms:.0f} ms")
+            failed = True
+        print()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Benchmark end-to-end recipe runs offline, against the fake LLM provider.
+
+Runs the document_generator and codebase_generator recipes with `fake/<profile>`
+models (see recipe_executor/llm_utils/fake.py), so no API keys or network are
+needed and runs are reproducible: the same profile gives the same outputs, latencies
+and injected failures on every run. With the "instant" profile the time measured is
+the executor's own overhead; "fast", "realistic" and "flaky" add model latency,
+which shows how well loops and parallel steps overlap calls and what retries cost.
+
+Each recipe runs in a fresh `recipe-executor` process, `--runs` times per profile,
+with the `--retry` policy as the `step_retry` default so injected failures are
+retried; the median and best wall times are reported with the retry statistics of
+the last run.
+
+Usage:
+    python scripts/benchmark_recipes.py
+    python scripts/benchmark_recipes.py --profiles instant flaky --runs 5
+    make benchmark
+"""
+
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+PROJECT_ROOT = Path(__file__).parent.parent
+# Recipe paths are relative to the repository root
+REPO_ROOT = PROJECT_ROOT.parent
+
+# Recipes measured, with the context values they need besides model and output_root
+RECIPES: List[Tuple[str, str, List[str]]] = [
+    (
+        "document_generator",
+        "recipes/document_generator/document_generator_recipe.json",
+        ["outline_file=recipes/document_generator/examples/readme.json"],
+    ),
+    ("codebase_generator", "recipes/codebase_generator/codebase_generator_recipe.json", []),
+]
+
+DEFAULT_RETRY = '{"max_attempts": 5, "backoff_base": 0.5}'
+
+RETRY_STATS = re.compile(r"Retry stats: (\{.*\})")
+
+
+def run_recipe(
+    recipe_path: str, context: List[str], profile: str, retry: str, work_dir: Path
+) -> Tuple[float, Optional[str]]:
+    """Run a recipe once; return its wall time and retry statistics."""
+    command = [
+        sys.executable,
+        "-m",
+        "recipe_executor.main",
+        recipe_path,
+        "--log-dir",
+        str(work_dir / "logs"),
+        "--log-level",
+        "INFO",
+        "--context",
+        f"model=fake/{profile}",
+        "--context",
+        f"output_root={work_dir / 'output'}",
+        "--config",
+        f"step_retry={retry}",
+    ]
+    for value in context:
+        command += ["--context", value]
+
+    start = time.perf_counter()
+    result = subprocess.run(command, cwd=REPO_ROOT, capture_output=True, text=True, stdin=subprocess.DEVNULL)
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"{recipe_path} failed with fake/{profile}:\n{result.stdout[-2000:]}{result.stderr[-2000:]}")
+    match = RETRY_STATS.search(result.stdout)
+    return elapsed, match.group(1) if match else None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark recipes against the fake LLM provider")
+    parser.add_argument("--profiles", nargs="+", default=["instant", "fast"], help="Fake model profiles to run")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per recipe and profile")
+    parser.add_argument(
+        "--retry", default=DEFAULT_RETRY, help=f"Default step retry policy as JSON (default: {DEFAULT_RETRY})"
+    )
+    args = parser.parse_args()
+
+    print(f"{'recipe':<20} {'profile':<10} {'median (s)':>11} {'best (s)':>9}  retries")
+    for name, recipe_path, context in RECIPES:
+        for profile in args.profiles:
+            times: List[float] = []
+            retries: Optional[str] = None
+            for _ in range(args.runs):
+                with tempfile.TemporaryDirectory(prefix="recipe-bench-") as work_dir:
+                    elapsed, retries = run_recipe(recipe_path, context, profile, args.retry, Path(work_dir))
+                times.append(elapsed)
+            print(f"{name:<20} {profile:<10} {statistics.median(times):>11.2f} {min(times):>9.2f}  {retries or '-'}")
+
+
+if __name__ == "__main__":
+    main()
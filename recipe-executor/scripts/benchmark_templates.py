@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Benchmark render_template cost as the context grows.
+
+Renders a small section prompt (as in write_section.json) against contexts
+holding increasingly large documents and resources. With the template cache
+and the zero-copy render scope the cost should track the rendered output,
+not the size of the context.
+
+Usage:
+    python scripts/benchmark_templates.py
+    make benchmark
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Add the parent directory to path for importing modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from recipe_executor.context import Context  # noqa: E402
+from recipe_executor.utils.templates import render_template, template_cache_stats  # noqa: E402
+
+ITERATIONS = 500
+PROMPT = "Write the section '{{ section.title }}' for {{ document_filename }} using {{ model }}."
+
+
+def main() -> None:
+    print(f"{'context size':>14} {'render (us)':>12}")
+    for document_kb in (16, 64, 256, 1024, 4096):
+        document = "lorem ipsum dolor sit amet " * (document_kb * 1024 // 27)
+        context = Context(
+            artifacts={
+                "document": document,
+                "resources": [{"path": f"r{i}.md", "content": document[:4096]} for i in range(document_kb // 4 or 1)],
+                "section": {"title": "Overview"},
+                "document_filename": "guide",
+                "model": "openai/gpt-4o",
+            }
+        )
+        start = time.perf_counter()
+        for _ in range(ITERATIONS):
+            render_template(PROMPT, context)
+        elapsed_us = (time.perf_counter() - start) / ITERATIONS * 1e6
+        print(f"{document_kb:>11} KB {elapsed_us:>12.1f}")
+    print(f"template cache: {template_cache_stats()}")
+
+
+if __name__ == "__main__":
+    main()
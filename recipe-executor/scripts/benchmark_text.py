@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Benchmark set_context merge cost as the merged document grows.
+
+Appends a section to a document artifact with `if_exists: "merge"`, as the
+document generator recipes do, until the document reaches several megabytes.
+Merged strings are kept as a TextRope, so the cost of a merge should stay
+flat as the document grows, where plain string concatenation copies the
+whole document every time. Rendering `{{ document }}` after each merge shows
+the cost of materializing the text once per change.
+
+Usage:
+    python scripts/benchmark_text.py
+    make benchmark
+"""
+
+import asyncio
+import logging
+import sys
+import time
+from pathlib import Path
+
+# Add the parent directory to path for importing modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from recipe_executor.context import Context  # noqa: E402
+from recipe_executor.steps.set_context import SetContextStep  # noqa: E402
+from recipe_executor.utils.templates import render_template  # noqa: E402
+
+SECTION = "lorem ipsum dolor sit amet " * 160  # ~4 KB per section
+MERGES_PER_SAMPLE = 64
+
+
+async def main() -> None:
+    logger = logging.getLogger("benchmark")
+    logger.disabled = True
+    step = SetContextStep(logger, {"key": "document", "value": "{{ section }}", "if_exists": "merge"})
+    context = Context(artifacts={"document": "", "section": SECTION})
+    plain = ""
+
+    print(f"{'document size':>14} {'rope merge (us)':>16} {'str concat (us)':>16} {'render (ms)':>12}")
+    target_kb = 256
+    while target_kb <= 16384:
+        while len(plain) < target_kb * 1024:
+            plain += SECTION
+            await step.execute(context)
+
+        start = time.perf_counter()
+        for _ in range(MERGES_PER_SAMPLE):
+            await step.execute(context)
+        merge_us = (time.perf_counter() - start) / MERGES_PER_SAMPLE * 1e6
+
+        # Held in a dict like a context artifact, so CPython cannot extend the string in place
+        artifacts = {"document": plain}
+        start = time.perf_counter()
+        for _ in range(MERGES_PER_SAMPLE):
+            artifacts["document"] = artifacts["document"] + SECTION
+        concat_us = (time.perf_counter() - start) / MERGES_PER_SAMPLE * 1e6
+
+        start = time.perf_counter()
+        render_template("{{ document }}", context)
+        render_ms = (time.perf_counter() - start) * 1e3
+
+        print(f"{target_kb:>11} KB {merge_us:>16.1f} {concat_us:>16.1f} {render_ms:>12.2f}")
+        target_kb *= 4
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
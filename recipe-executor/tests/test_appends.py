@@ -0,0 +1,33 @@
+"""Buffered appends keep content written to the file by others between flushes."""
+
+from recipe_executor.utils.appends import append_to_file, appended_file_sizes, close_appends, flush_appends
+
+
+def test_flush_keeps_external_changes_between_flushes(tmp_path):
+    path = str(tmp_path / "log.txt")
+    append_to_file(path, "h")
+    flush_appends(path)
+
+    # Another tool extends the file between two flushes
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("EXTERNAL")
+    append_to_file(path, "B")
+    flush_appends(path)
+
+    with open(path, encoding="utf-8") as f:
+        assert f.read() == "hEXTERNALB"
+
+
+def test_close_appends_releases_files(tmp_path):
+    path = str(tmp_path / "doc.md")
+    append_to_file(path, "a")
+    close_appends()
+    assert str(tmp_path / "doc.md") not in appended_file_sizes()
+
+    # Overwritten by someone else after the run: a new run appends to the new content
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("new")
+    append_to_file(path, "b")
+    close_appends()
+    with open(path, encoding="utf-8") as f:
+        assert f.read() == "newb"
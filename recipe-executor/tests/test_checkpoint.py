@@ -0,0 +1,52 @@
+"""Loop items are logged incrementally; the context is snapshotted only at step boundaries."""
+
+import logging
+import os
+
+from recipe_executor.checkpoint import ITEMS_FILE, STATE_FILE, Checkpointer
+from recipe_executor.context import Context
+
+logger = logging.getLogger("test_checkpoint")
+
+
+def test_items_are_logged_without_snapshotting_the_context(tmp_path):
+    run_dir = str(tmp_path / "run")
+    context = Context(artifacts={"big": "x" * 100_000})
+    checkpointer = Checkpointer(run_dir, context, logger)
+    checkpointer.start("recipe.json")
+    checkpointer.mark_complete(("0",), context)
+    checkpointer.finish()
+    snapshot_mtime = os.stat(os.path.join(run_dir, STATE_FILE)).st_mtime_ns
+
+    for index in range(5):
+        checkpointer.mark_item_complete(("1",), context, str(index), {"n": index})
+    checkpointer.finish(RuntimeError("boom"))
+
+    assert os.stat(os.path.join(run_dir, STATE_FILE)).st_mtime_ns == snapshot_mtime
+    assert os.path.getsize(os.path.join(run_dir, ITEMS_FILE)) < 1000
+
+    resumed = Checkpointer(run_dir, Context(), logger)
+    resumed.resume()
+    assert resumed.completed == {"0"}
+    assert resumed.items == {"1": {str(i): {"n": i} for i in range(5)}}
+
+
+def test_stale_items_are_forgotten_on_resume(tmp_path):
+    run_dir = str(tmp_path / "run")
+    context = Context()
+    checkpointer = Checkpointer(run_dir, context, logger)
+    checkpointer.start("recipe.json")
+    checkpointer.mark_item_complete(("0",), context, "a", 1)
+    checkpointer.finish(RuntimeError("boom"))
+
+    # Not resumed: results of the previous attempt are dropped from the log as well
+    fresh = Checkpointer(run_dir, context, logger)
+    fresh.resume()
+    fresh.resumed = False
+    assert fresh.completed_items(("0",), context) == {}
+    fresh.mark_item_complete(("0",), context, "b", 2)
+    fresh.finish(RuntimeError("boom"))
+
+    again = Checkpointer(run_dir, context, logger)
+    again.resume()
+    assert again.items == {"0": {"b": 2}}
@@ -0,0 +1,37 @@
+"""Values spilled by the artifact store leave the context as plain strings."""
+
+import json
+
+from recipe_executor.artifact_store import SpillingArtifactStore
+from recipe_executor.context import Context
+from recipe_executor.models import FileSpec
+from recipe_executor.utils.text import BlobText
+
+LARGE = "x" * 64
+
+
+def test_nested_spilled_strings_round_trip(tmp_path):
+    store = SpillingArtifactStore(threshold=32, directory=str(tmp_path))
+    files = [{"path": "a.md", "content": LARGE}]
+    context = Context(artifacts={"files": files, "doc": LARGE}, store=store)
+
+    # Stored as blob handles, handed out as strings
+    assert isinstance(context.raw_mapping()["files"][0]["content"], BlobText)
+    assert json.loads(json.dumps(context["files"])) == files
+    assert FileSpec(**context["files"][0]).content == LARGE
+    assert type(context.get("files")[0]["content"]) is str
+    assert type(context.as_mapping()["files"][0]["content"]) is str
+    assert type(context["doc"]) is str
+    assert json.loads(json.dumps(context.dict())) == {"files": files, "doc": LARGE}
+    assert json.loads(json.dumps(context.clone()["files"])) == files
+
+
+def test_spilled_shared_value_is_copied_when_handed_out(tmp_path):
+    store = SpillingArtifactStore(threshold=32, directory=str(tmp_path))
+    cached = {"big": LARGE, "meta": {"tags": ["a"]}}
+    context = Context(store=store)
+    context.set_shared("doc", cached)
+
+    context["doc"]["meta"]["tags"].append("b")
+    context.get("doc")["meta"]["tags"].append("c")
+    assert cached == {"big": LARGE, "meta": {"tags": ["a"]}}
@@ -0,0 +1,39 @@
+"""Merged and appended strings leave the context as plain strings."""
+
+import asyncio
+import json
+import logging
+
+from recipe_executor.context import Context
+from recipe_executor.models import FileSpec
+from recipe_executor.steps.set_context import SetContextStep
+
+
+def _merge_into(context: Context, key: str, values: list, strategy: str = "merge") -> None:
+    for value in values:
+        step = SetContextStep(logging.getLogger("test"), {"key": key, "value": value, "if_exists": strategy})
+        asyncio.run(step.execute(context))
+
+
+def test_merged_context_is_json_serializable():
+    context = Context()
+    _merge_into(context, "doc", ["# Title\n", "a\n", "b\n"])
+    _merge_into(context, "log", ["x", "y"], strategy="append")
+
+    assert json.loads(json.dumps(context.dict())) == {"doc": "# Title\na\nb\n", "log": "xy"}
+    assert type(context["doc"]) is str
+    assert type(context.get("log")) is str
+    assert type(context.as_mapping()["doc"]) is str
+    assert FileSpec(path="out.md", content=context["doc"]).content == "# Title\na\nb\n"
+
+
+def test_merging_keeps_extending_after_reads():
+    context = Context()
+    _merge_into(context, "doc", ["a", "b"])
+    assert context["doc"] == "ab"
+    _merge_into(context, "doc", ["c"])
+    clone = context.clone()
+    _merge_into(clone, "doc", ["d"])
+
+    assert context["doc"] == "abc"
+    assert clone["doc"] == "abcd"
@@ -0,0 +1,26 @@
+"""Merged text (TextRope) renders exactly like a plain string."""
+
+import pytest
+
+from recipe_executor.context import Context
+from recipe_executor.utils.templates import render_template
+from recipe_executor.utils.text import TextRope
+
+
+@pytest.mark.parametrize(
+    "template",
+    [
+        "{% for c in VALUE %}{{ c }},{% endfor %}",
+        "{{ VALUE | first }}",
+        "{{ VALUE | last }}",
+        "{{ VALUE | sort }}",
+        "{{ VALUE | size }}",
+        "{% if VALUE contains 'bc' %}yes{% endif %}",
+    ],
+)
+def test_rope_renders_like_str(template):
+    context = Context(artifacts={"text": "abcd"})
+    context["rope"] = TextRope("ab", "cd")
+
+    expected = render_template(template.replace("VALUE", "text"), context)
+    assert render_template(template.replace("VALUE", "rope"), context) == expected